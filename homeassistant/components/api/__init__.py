@@ -12,6 +12,7 @@ from homeassistant.auth.permissions.const import POLICY_READ
 from homeassistant.bootstrap import DATA_LOGGING
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import (
+    CONTENT_TYPE_JSON,
     EVENT_HOMEASSISTANT_STOP,
     EVENT_TIME_CHANGED,
     HTTP_BAD_REQUEST,
@@ -229,7 +230,12 @@ class APIStatesView(HomeAssistantView):
             for state in request.app["hass"].states.async_all()
             if entity_perm(state.entity_id, "read")
         ]
-        return self.json(states)
+        try:
+            states_json = ", ".join(state.as_json() for state in states)
+        except (ValueError, TypeError):
+            # Serialize again to log the bad data and return an error
+            return self.json(states)
+        return _json_response(f"[{states_json}]")
 
 
 class APIEntityStateView(HomeAssistantView):
@@ -246,9 +252,12 @@ class APIEntityStateView(HomeAssistantView):
             raise Unauthorized(entity_id=entity_id)
 
         state = request.app["hass"].states.get(entity_id)
-        if state:
+        if not state:
+            return self.json_message("Entity not found.", HTTP_NOT_FOUND)
+        try:
+            return _json_response(state.as_json())
+        except (ValueError, TypeError):
             return self.json(state)
-        return self.json_message("Entity not found.", HTTP_NOT_FOUND)
 
     async def post(self, request, entity_id):
         """Update state of entity."""
@@ -430,6 +439,13 @@ class APIErrorLog(HomeAssistantView):
         return web.FileResponse(request.app["hass"].data[DATA_LOGGING])
 
 
+def _json_response(body):
+    """Return a JSON response of an already serialized body."""
+    response = web.Response(body=body.encode("UTF-8"), content_type=CONTENT_TYPE_JSON)
+    response.enable_compression()
+    return response
+
+
 async def async_services_json(hass):
     """Generate services data to JSONify."""
     descriptions = await async_get_all_descriptions(hass)
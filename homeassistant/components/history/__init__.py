@@ -1,13 +1,17 @@
 """Provide pre-made queries on top of the recorder component."""
+import asyncio
 from collections import defaultdict
 from datetime import datetime as dt, timedelta
 from itertools import groupby
 import json
 import logging
+import math
+import threading
 import time
 from typing import Iterable, Optional, cast
 
 from aiohttp import web
+from aiohttp.hdrs import CONTENT_TYPE
 from sqlalchemy import and_, bindparam, func, not_, or_
 from sqlalchemy.ext import baked
 import voluptuous as vol
@@ -15,16 +19,23 @@ import voluptuous as vol
 from homeassistant.components import recorder
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder.models import (
+    STATE_ATTRIBUTES_COLUMN,
+    StateAttributes,
     States,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
 )
+from homeassistant.components.recorder.statistics import (
+    STATISTICS_PERIODS,
+    statistics_during_period,
+)
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.const import (
     CONF_DOMAINS,
     CONF_ENTITIES,
     CONF_EXCLUDE,
     CONF_INCLUDE,
+    CONTENT_TYPE_JSON,
     HTTP_BAD_REQUEST,
 )
 from homeassistant.core import Context, State, split_entity_id
@@ -33,15 +44,23 @@ from homeassistant.helpers.entityfilter import (
     CONF_ENTITY_GLOBS,
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
 )
+from homeassistant.helpers.json import JSONEncoder
 from homeassistant.helpers.typing import HomeAssistantType
 import homeassistant.util.dt as dt_util
 
+from .cache import RecentHistoryCache
+
 # mypy: allow-untyped-defs, no-check-untyped-defs
 
 _LOGGER = logging.getLogger(__name__)
 
 DOMAIN = "history"
 CONF_ORDER = "use_include_order"
+CONF_RECENT_CACHE = "recent_cache"
+CONF_WINDOW = "window"
+CONF_MAX_STATES_PER_ENTITY = "max_states_per_entity"
+
+DATA_RECENT_CACHE = "history_recent_cache"
 
 STATE_KEY = "state"
 LAST_CHANGED_KEY = "last_changed"
@@ -51,10 +70,22 @@ GLOB_TO_SQL_CHARS = {
     46: "_",  # .
 }
 
+RECENT_CACHE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_WINDOW, default=timedelta(hours=24)): vol.All(
+            cv.time_period, cv.positive_timedelta
+        ),
+        vol.Optional(CONF_MAX_STATES_PER_ENTITY, default=1000): cv.positive_int,
+    }
+)
+
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA.extend(
-            {vol.Optional(CONF_ORDER, default=False): cv.boolean}
+            {
+                vol.Optional(CONF_ORDER, default=False): cv.boolean,
+                vol.Optional(CONF_RECENT_CACHE): RECENT_CACHE_SCHEMA,
+            }
         )
     },
     extra=vol.ALLOW_EXTRA,
@@ -79,13 +110,28 @@ QUERY_STATES = [
     States.domain,
     States.entity_id,
     States.state,
-    States.attributes,
+    STATE_ATTRIBUTES_COLUMN,
     States.last_changed,
     States.last_updated,
 ]
 
 HISTORY_BAKERY = "history_bakery"
 
+# Number of rows fetched at once and number of
+# entities buffered when streaming a response
+STREAM_YIELD_PER = 1000
+STREAM_QUEUE_SIZE = 16
+
+# Downsampling buckets can not be narrower than the timestamps
+MIN_BUCKET_WIDTH = timedelta(microseconds=1)
+
+
+def _query_states(session):
+    """Query QUERY_STATES joined with the shared state attributes."""
+    return session.query(*QUERY_STATES).outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
+
 
 def get_significant_states(hass, *args, **kwargs):
     """Wrap _get_significant_states with a sql session."""
@@ -103,6 +149,8 @@ def _get_significant_states(
     include_start_time_state=True,
     significant_changes_only=True,
     minimal_response=False,
+    max_points=None,
+    resolution=None,
 ):
     """
     Return states changes during UTC period start_time - end_time.
@@ -110,12 +158,75 @@ def _get_significant_states(
     Significant states are all states where there is a state change,
     as well as all states from certain domains (for instance
     thermostat so that we get current temperature in our graphs).
+
+    Numeric states can be downsampled to about max_points states per
+    entity, or to two states per resolution seconds.
     """
     timer_start = time.perf_counter()
+    bucket_width = _downsample_bucket_width(
+        start_time, end_time, max_points, resolution
+    )
 
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
+    cached = _get_cached_states(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        _significant_state_matcher(significant_changes_only),
     )
+    if cached is not None:
+        states, initial_states = cached
+        return _states_to_json(
+            states,
+            initial_states,
+            entity_ids,
+            minimal_response,
+            start_time,
+            bucket_width,
+            to_state=_cached_state,
+        )
+
+    states = execute(
+        _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+        )
+    )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs", elapsed)
+
+    return _sorted_states_to_json(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
+        bucket_width,
+    )
+
+
+def _significant_states_query(
+    hass,
+    session,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    significant_changes_only=True,
+):
+    """Return the query of the significant states during a period."""
+    baked_query = hass.data[HISTORY_BAKERY](lambda session: _query_states(session))
 
     if significant_changes_only:
         baked_query += lambda q: q.filter(
@@ -142,34 +253,60 @@ def _get_significant_states(
 
     baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
 
-    states = execute(
-        baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
-        )
+    return baked_query(session).params(
+        start_time=start_time, end_time=end_time, entity_ids=entity_ids
     )
 
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("get_significant_states took %fs", elapsed)
 
-    return _sorted_states_to_json(
-        hass,
-        session,
-        states,
-        start_time,
-        entity_ids,
-        filters,
-        include_start_time_state,
-        minimal_response,
+def _significant_state_matcher(significant_changes_only):
+    """Return a function that tells if a cached state is significant."""
+    if not significant_changes_only:
+        return lambda state: True
+    return lambda state: (
+        state.domain in SIGNIFICANT_DOMAINS or state.last_changed == state.last_updated
     )
 
 
+def _get_cached_states(
+    hass, start_time, end_time, entity_ids, include_start_time_state, is_significant
+):
+    """Return the states and initial states from the recent history cache.
+
+    Returns None when there is no cache or the period is not fully cached.
+    """
+    cache = hass.data.get(DATA_RECENT_CACHE)
+    if cache is None or not entity_ids:
+        return None
+    return cache.states_during_period(
+        start_time, end_time, entity_ids, include_start_time_state, is_significant
+    )
+
+
+def _cached_state(state):
+    """Return a cached state as is."""
+    return state
+
+
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
-    with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
+    if entity_id is not None:
+        entity_ids = [entity_id.lower()]
+        cached = _get_cached_states(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            True,
+            lambda state: state.last_changed == state.last_updated,
         )
+        if cached is not None:
+            states, initial_states = cached
+            return _states_to_json(
+                states, initial_states, entity_ids, False, to_state=_cached_state
+            )
+
+    with session_scope(hass=hass) as session:
+        baked_query = hass.data[HISTORY_BAKERY](lambda session: _query_states(session))
 
         baked_query += lambda q: q.filter(
             (States.last_changed == States.last_updated)
@@ -182,7 +319,9 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
             )
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
@@ -203,13 +342,13 @@ def get_last_state_changes(hass, number_of_states, entity_id):
     start_time = dt_util.utcnow()
 
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query = hass.data[HISTORY_BAKERY](lambda session: _query_states(session))
         baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(
@@ -303,7 +442,7 @@ def _get_states_with_session(
     query = query.join(
         most_recent_state_ids,
         States.state_id == most_recent_state_ids.c.max_state_id,
-    )
+    ).outerjoin(StateAttributes, States.attributes_id == StateAttributes.attributes_id)
 
     if entity_ids is not None:
         query = query.filter(States.entity_id.in_(entity_ids))
@@ -318,9 +457,7 @@ def _get_states_with_session(
 def _get_single_entity_states_with_session(hass, session, utc_point_in_time, entity_id):
     # Use an entirely different (and extremely fast) query if we only
     # have a single entity id
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
-    )
+    baked_query = hass.data[HISTORY_BAKERY](lambda session: _query_states(session))
     baked_query += lambda q: q.filter(
         States.last_updated < bindparam("utc_point_in_time"),
         States.entity_id == bindparam("entity_id"),
@@ -344,6 +481,7 @@ def _sorted_states_to_json(
     filters=None,
     include_start_time_state=True,
     minimal_response=False,
+    bucket_width=None,
 ):
     """Convert SQL results into JSON friendly data structure.
 
@@ -356,12 +494,48 @@ def _sorted_states_to_json(
     each list of states, otherwise our graphs won't start on the Y
     axis correctly.
     """
+    initial_states = _get_initial_states(
+        hass, session, start_time, entity_ids, filters, include_start_time_state
+    )
+    return _states_to_json(
+        states, initial_states, entity_ids, minimal_response, start_time, bucket_width
+    )
+
+
+def _states_to_json(
+    states,
+    initial_states,
+    entity_ids,
+    minimal_response,
+    start_time=None,
+    bucket_width=None,
+    to_state=None,
+):
+    """Group the sorted states and the initial states by entity_id."""
     result = defaultdict(list)
     # Set all entity IDs to empty lists in result set to maintain the order
     if entity_ids is not None:
         for ent_id in entity_ids:
             result[ent_id] = []
 
+    for ent_id in initial_states:
+        result[ent_id] = []
+
+    for ent_id, ent_results in _iter_entity_states(
+        states, initial_states, minimal_response, start_time, bucket_width, to_state
+    ):
+        result[ent_id] = ent_results
+
+    # Filter out the empty lists if some states had 0 results.
+    return {key: val for key, val in result.items() if val}
+
+
+def _get_initial_states(
+    hass, session, start_time, entity_ids, filters, include_start_time_state
+):
+    """Return the states at the start time by entity id."""
+    initial_states = {}
+
     # Get the states at the start time
     timer_start = time.perf_counter()
     if include_start_time_state:
@@ -371,11 +545,34 @@ def _sorted_states_to_json(
         ):
             state.last_changed = start_time
             state.last_updated = start_time
-            result[state.entity_id].append(state)
+            initial_states[state.entity_id] = state
 
     if _LOGGER.isEnabledFor(logging.DEBUG):
         elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("getting %d first datapoints took %fs", len(result), elapsed)
+        _LOGGER.debug(
+            "getting %d first datapoints took %fs", len(initial_states), elapsed
+        )
+
+    return initial_states
+
+
+def _iter_entity_states(
+    states,
+    initial_states,
+    minimal_response,
+    start_time=None,
+    bucket_width=None,
+    to_state=None,
+):
+    """Yield the entity id and the list of states of one entity at a time.
+
+    States must be sorted by entity_id and last_updated. Entities that
+    only have a state at the start time are yielded last. Rows are
+    converted with to_state, which defaults to LazyState.
+    """
+    initial_states = dict(initial_states)
+    if to_state is None:
+        to_state = LazyState
 
     # Called in a tight loop so cache the function
     # here
@@ -384,16 +581,21 @@ def _sorted_states_to_json(
     # Append all changes to it
     for ent_id, group in groupby(states, lambda state: state.entity_id):
         domain = split_entity_id(ent_id)[0]
-        ent_results = result[ent_id]
+        if bucket_width is not None:
+            group = _downsample_states(group, start_time, bucket_width)
+        ent_results = []
+        initial_state = initial_states.pop(ent_id, None)
+        if initial_state is not None:
+            ent_results.append(initial_state)
         if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
-            ent_results.extend(LazyState(db_state) for db_state in group)
+            ent_results.extend(to_state(db_state) for db_state in group)
 
         # With minimal response we only provide a native
         # State for the first and last response. All the states
         # in-between only provide the "state" and the
         # "last_changed".
         if not ent_results:
-            ent_results.append(LazyState(next(group)))
+            ent_results.append(to_state(next(group)))
 
         prev_state = ent_results[-1]
         initial_state_count = len(ent_results)
@@ -418,10 +620,74 @@ def _sorted_states_to_json(
             # There was at least one state change
             # replace the last minimal state with
             # a full state
-            ent_results[-1] = LazyState(prev_state)
+            ent_results[-1] = to_state(prev_state)
 
-    # Filter out the empty lists if some states had 0 results.
-    return {key: val for key, val in result.items() if val}
+        yield ent_id, ent_results
+
+    for ent_id, initial_state in initial_states.items():
+        yield ent_id, [initial_state]
+
+
+def _downsample_bucket_width(start_time, end_time, max_points, resolution):
+    """Return the width of the downsampling buckets, if any."""
+    if resolution is not None:
+        return timedelta(seconds=resolution)
+    if max_points is None:
+        return None
+    if end_time is None:
+        end_time = dt_util.utcnow()
+    # The minimum and maximum of each bucket are kept
+    return (end_time - start_time) / max(1, max_points // 2)
+
+
+def _downsample_states(states, start_time, bucket_width):
+    """Reduce numeric states to the minimum and maximum of each time bucket.
+
+    States are consumed and yielded in order, one bucket at a time.
+    Non-numeric states and the last state are always kept.
+    """
+    bucket = None
+    bucket_end = None
+    minimum = maximum = last = None
+
+    for db_state in states:
+        last = db_state
+        try:
+            value = float(db_state.state)
+        except (TypeError, ValueError):
+            value = None
+
+        last_updated = process_timestamp(db_state.last_updated)
+        if bucket is not None and (value is None or last_updated >= bucket_end):
+            yield from bucket
+            bucket = None
+
+        if value is None:
+            yield db_state
+            last = None
+            continue
+
+        if bucket is None:
+            bucket_end = start_time + bucket_width * (
+                (last_updated - start_time) // bucket_width + 1
+            )
+            minimum = maximum = (value, db_state)
+        elif value < minimum[0]:
+            minimum = (value, db_state)
+        elif value > maximum[0]:
+            maximum = (value, db_state)
+
+        if minimum[1] is maximum[1]:
+            bucket = [minimum[1]]
+        elif maximum[1].last_updated < minimum[1].last_updated:
+            bucket = [maximum[1], minimum[1]]
+        else:
+            bucket = [minimum[1], maximum[1]]
+
+    if bucket is not None:
+        yield from bucket
+        if last is not bucket[-1]:
+            yield last
 
 
 def get_state(hass, utc_point_in_time, entity_id, run=None):
@@ -440,6 +706,15 @@ async def async_setup(hass, config):
 
     use_include_order = conf.get(CONF_ORDER)
 
+    if CONF_RECENT_CACHE in conf:
+        cache_conf = conf[CONF_RECENT_CACHE]
+        cache = hass.data[DATA_RECENT_CACHE] = RecentHistoryCache(
+            cache_conf[CONF_WINDOW],
+            cache_conf[CONF_MAX_STATES_PER_ENTITY],
+            hass.data[recorder.DATA_INSTANCE].entity_filter,
+        )
+        cache.async_start(hass)
+
     hass.http.register_view(HistoryPeriodView(filters, use_include_order))
     hass.components.frontend.async_register_built_in_panel(
         "history", "history", "hass:poll-box"
@@ -495,6 +770,24 @@ class HistoryPeriodView(HomeAssistantView):
         entity_ids = None
         if entity_ids_str:
             entity_ids = entity_ids_str.lower().split(",")
+
+        hass = request.app["hass"]
+
+        period = request.query.get("period")
+        if period is not None:
+            if period not in STATISTICS_PERIODS:
+                return self.json_message("Invalid period", HTTP_BAD_REQUEST)
+            # Serve the aggregated statistics instead of the raw states
+            statistics = await hass.async_add_executor_job(
+                statistics_during_period,
+                hass,
+                start_time,
+                end_time,
+                entity_ids,
+                period,
+            )
+            return self.json(list(statistics.values()))
+
         include_start_time_state = "skip_initial_state" not in request.query
         significant_changes_only = (
             request.query.get("significant_changes_only", "1") != "0"
@@ -502,7 +795,32 @@ class HistoryPeriodView(HomeAssistantView):
 
         minimal_response = "minimal_response" in request.query
 
-        hass = request.app["hass"]
+        try:
+            max_points = request.query.get("max_points")
+            if max_points is not None:
+                max_points = int(max_points)
+                if max_points < 2:
+                    raise ValueError
+        except ValueError:
+            return self.json_message("Invalid max_points", HTTP_BAD_REQUEST)
+        try:
+            resolution = request.query.get("resolution")
+            if resolution is not None:
+                resolution = float(resolution)
+                if not math.isfinite(resolution) or resolution <= 0:
+                    raise ValueError
+        except ValueError:
+            return self.json_message("Invalid resolution", HTTP_BAD_REQUEST)
+        try:
+            bucket_width = _downsample_bucket_width(
+                start_time, end_time, max_points, resolution
+            )
+        except OverflowError:
+            return self.json_message("Invalid resolution", HTTP_BAD_REQUEST)
+        if bucket_width is not None and bucket_width < MIN_BUCKET_WIDTH:
+            if resolution is not None:
+                return self.json_message("Invalid resolution", HTTP_BAD_REQUEST)
+            return self.json_message("Invalid max_points", HTTP_BAD_REQUEST)
 
         if (
             not include_start_time_state
@@ -511,6 +829,20 @@ class HistoryPeriodView(HomeAssistantView):
         ):
             return self.json([])
 
+        if "stream" in request.query:
+            return await self._async_stream_significant_states_json(
+                request,
+                hass,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                max_points,
+                resolution,
+            )
+
         return cast(
             web.Response,
             await hass.async_add_executor_job(
@@ -522,9 +854,147 @@ class HistoryPeriodView(HomeAssistantView):
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
+                max_points,
+                resolution,
             ),
         )
 
+    async def _async_stream_significant_states_json(
+        self, request: web.Request, hass, *args
+    ) -> web.StreamResponse:
+        """Stream the significant states one entity at a time.
+
+        The states are written in entity_id order as they are read from
+        the database, so use_include_order is not applied.
+        """
+        response = web.StreamResponse(headers={CONTENT_TYPE: CONTENT_TYPE_JSON})
+        response.enable_compression()
+        await response.prepare(request)
+
+        chunks: asyncio.Queue = asyncio.Queue(STREAM_QUEUE_SIZE)
+        cancelled = threading.Event()
+
+        def write(chunk: Optional[bytes]) -> None:
+            """Hand a chunk to the event loop, waiting while the queue is full."""
+            asyncio.run_coroutine_threadsafe(chunks.put(chunk), hass.loop).result()
+
+        def stream() -> None:
+            """Read and serialize the states in the executor."""
+            try:
+                self._stream_significant_states_json(hass, write, cancelled, *args)
+            finally:
+                write(None)
+
+        task = hass.async_add_executor_job(stream)
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is None:
+                    break
+                await response.write(chunk)
+        except (asyncio.CancelledError, ConnectionResetError):
+            # Let the executor job stop and drain what it already queued
+            cancelled.set()
+            while await chunks.get() is not None:
+                pass
+            raise
+        finally:
+            await task
+
+        await response.write_eof()
+        return response
+
+    def _stream_significant_states_json(
+        self,
+        hass,
+        write,
+        cancelled,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        max_points,
+        resolution,
+    ):
+        """Write the significant states as json chunks of one entity each."""
+        timer_start = time.perf_counter()
+        bucket_width = _downsample_bucket_width(
+            start_time, end_time, max_points, resolution
+        )
+
+        cached = _get_cached_states(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            _significant_state_matcher(significant_changes_only),
+        )
+        if cached is not None:
+            states, initial_states = cached
+            self._write_entity_states_json(
+                write,
+                cancelled,
+                _iter_entity_states(
+                    states,
+                    initial_states,
+                    minimal_response,
+                    start_time,
+                    bucket_width,
+                    _cached_state,
+                ),
+            )
+            return
+
+        with session_scope(hass=hass) as session:
+            query = _significant_states_query(
+                hass,
+                session,
+                start_time,
+                end_time,
+                entity_ids,
+                self.filters,
+                significant_changes_only,
+            )
+            # Fetch the rows in batches instead of all at once
+            states = query.with_post_criteria(lambda q: q.yield_per(STREAM_YIELD_PER))
+            initial_states = _get_initial_states(
+                hass,
+                session,
+                start_time,
+                entity_ids,
+                self.filters,
+                include_start_time_state,
+            )
+
+            entity_count = self._write_entity_states_json(
+                write,
+                cancelled,
+                _iter_entity_states(
+                    states, initial_states, minimal_response, start_time, bucket_width
+                ),
+            )
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - timer_start
+            _LOGGER.debug("Streamed %d entities in %fs", entity_count, elapsed)
+
+    @staticmethod
+    def _write_entity_states_json(write, cancelled, entity_states):
+        """Write a json array with one chunk per entity and return the count."""
+        entity_count = 0
+        write(b"[")
+        for _, ent_results in entity_states:
+            if cancelled.is_set():
+                return entity_count
+            chunk = json.dumps(ent_results, cls=JSONEncoder).encode("UTF-8")
+            write(b"," + chunk if entity_count else chunk)
+            entity_count += 1
+        write(b"]")
+        return entity_count
+
     def _sorted_significant_states_json(
         self,
         hass,
@@ -534,6 +1004,8 @@ class HistoryPeriodView(HomeAssistantView):
         include_start_time_state,
         significant_changes_only,
         minimal_response,
+        max_points,
+        resolution,
     ):
         """Fetch significant stats from the database as json."""
         timer_start = time.perf_counter()
@@ -549,6 +1021,8 @@ class HistoryPeriodView(HomeAssistantView):
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
+                max_points,
+                resolution,
             )
 
         result = list(result.values())
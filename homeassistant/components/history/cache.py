@@ -0,0 +1,161 @@
+"""In-memory buffer of recent states in front of the recorder."""
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, State, callback
+import homeassistant.util.dt as dt_util
+
+# The time from which a state is known to be valid and the state,
+# None when the entity did not exist
+_Entry = Tuple[datetime, Optional[State]]
+
+
+class RecentHistoryCache:
+    """Keep the recent states of each entity to answer history queries.
+
+    The states of an entity are known from the time of its oldest entry,
+    so a query can be answered when its period starts after that for
+    every requested entity. At most max_states_per_entity states are kept
+    per entity and states older than the window are dropped.
+    """
+
+    def __init__(
+        self,
+        window: timedelta,
+        max_states_per_entity: int,
+        entity_filter: Callable[[str], bool],
+    ) -> None:
+        """Initialize the cache."""
+        self.window = window
+        self.max_states_per_entity = max_states_per_entity
+        self.entity_filter = entity_filter
+        self.hits = 0
+        self.misses = 0
+        self._started: Optional[datetime] = None
+        self._entries: Dict[str, Deque[_Entry]] = {}
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Return the hit and miss counters and the size of the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entities": len(self._entries),
+            "states": sum(len(entries) for entries in list(self._entries.values())),
+        }
+
+    @callback
+    def async_start(self, hass: HomeAssistant) -> None:
+        """Seed the cache with the current states and follow state changes."""
+        self._started = now = dt_util.utcnow()
+        for state in hass.states.async_all():
+            if self.entity_filter(state.entity_id):
+                self._async_add(state.entity_id, now, state, now)
+        hass.bus.async_listen(EVENT_STATE_CHANGED, self._async_state_changed)
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Add a changed state to the cache."""
+        entity_id = event.data["entity_id"]
+        if not self.entity_filter(entity_id):
+            return
+        new_state = event.data.get("new_state")
+        if new_state is None:
+            # Removed states are recorded with an empty state
+            new_state = State(
+                entity_id,
+                "",
+                {},
+                event.time_fired,
+                event.time_fired,
+                event.context,
+                validate_entity_id=False,
+            )
+        self._async_add(entity_id, new_state.last_updated, new_state, event.time_fired)
+
+    @callback
+    def _async_add(
+        self,
+        entity_id: str,
+        valid_from: datetime,
+        state: Optional[State],
+        now: datetime,
+    ) -> None:
+        """Append a state and drop the states that are no longer needed."""
+        entries = self._entries.get(entity_id)
+        if entries is None:
+            entries = self._entries[entity_id] = deque(
+                maxlen=self.max_states_per_entity
+            )
+            if valid_from > self._started:
+                # The entity had no state since the cache started
+                entries.append((self._started, None))
+        entries.append((valid_from, state))
+
+        # Keep the state that was valid at the start of the window
+        window_start = now - self.window
+        while len(entries) > 1 and entries[1][0] <= window_start:
+            entries.popleft()
+
+    def states_during_period(
+        self,
+        start_time: datetime,
+        end_time: Optional[datetime],
+        entity_ids: Iterable[str],
+        include_start_time_state: bool,
+        is_significant: Callable[[State], bool],
+    ) -> Optional[Tuple[List[State], Dict[str, State]]]:
+        """Return the states during a period, or None if they are not cached.
+
+        Returns the states sorted by entity_id and last_updated and the
+        states at the start time by entity_id.
+        """
+        if (
+            self._started is None
+            or start_time < self._started
+            or start_time < dt_util.utcnow() - self.window
+        ):
+            self.misses += 1
+            return None
+
+        snapshots = {}
+        for entity_id in entity_ids:
+            # Copying a deque is atomic while it is appended to in the event loop
+            entries = list(self._entries.get(entity_id, ()))
+            if entries and entries[0][0] > start_time:
+                self.misses += 1
+                return None
+            snapshots[entity_id] = entries
+
+        states = []
+        initial_states = {}
+        for entity_id in sorted(snapshots):
+            initial_state = None
+            for valid_from, state in snapshots[entity_id]:
+                if valid_from < start_time:
+                    initial_state = state
+                    continue
+                if end_time is not None and valid_from >= end_time:
+                    break
+                if (
+                    state is not None
+                    and state.last_updated > start_time
+                    and is_significant(state)
+                ):
+                    states.append(state)
+
+            if include_start_time_state and initial_state is not None:
+                initial_states[entity_id] = State(
+                    entity_id,
+                    initial_state.state,
+                    initial_state.attributes,
+                    start_time,
+                    start_time,
+                    initial_state.context,
+                    validate_entity_id=False,
+                )
+
+        self.hits += 1
+        return states, initial_states
@@ -1,6 +1,7 @@
 """Event parser and human readable log generator."""
 from datetime import timedelta
-from itertools import groupby
+from functools import partial
+from itertools import groupby, islice
 import json
 import re
 
@@ -9,12 +10,18 @@ from sqlalchemy.orm import aliased
 from sqlalchemy.sql.expression import literal
 import voluptuous as vol
 
+from homeassistant.components import websocket_api
 from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
 from homeassistant.components.history import sqlalchemy_filter_from_include_exclude_conf
 from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.recorder.const import DATA_INSTANCE, SIGNAL_PURGE_FINISHED
 from homeassistant.components.recorder.models import (
+    STATE_ATTRIBUTES_COLUMN,
+    STATE_ATTRIBUTES_JSON,
     Events,
+    StateAttributes,
     States,
+    process_timestamp,
     process_timestamp_to_utc_isoformat,
 )
 from homeassistant.components.recorder.util import session_scope
@@ -36,6 +43,7 @@ from homeassistant.const import (
 from homeassistant.core import DOMAIN as HA_DOMAIN, callback, split_entity_id
 from homeassistant.exceptions import InvalidEntityFormatError
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entityfilter import (
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
     convert_include_exclude_filter,
@@ -47,6 +55,8 @@ from homeassistant.helpers.integration_platform import (
 from homeassistant.loader import bind_hass
 import homeassistant.util.dt as dt_util
 
+from .cache import LogbookDayCache
+
 ENTITY_ID_JSON_TEMPLATE = '"entity_id": "{}"'
 ENTITY_ID_JSON_EXTRACT = re.compile('"entity_id": "([^"]+)"')
 DOMAIN_JSON_EXTRACT = re.compile('"domain": "([^"]+)"')
@@ -57,9 +67,14 @@ ATTR_MESSAGE = "message"
 CONTINUOUS_DOMAINS = ["proximity", "sensor"]
 
 DOMAIN = "logbook"
+DATA_DAY_CACHE = "logbook_day_cache"
+DATA_FILTERS = "logbook_filters"
 
 GROUP_BY_MINUTES = 15
 
+DEFAULT_PAGE_SIZE = 100
+CURSOR_EPOCH = dt_util.utc_from_timestamp(0)
+
 EMPTY_JSON_OBJECT = "{}"
 UNIT_OF_MEASUREMENT_JSON = '"unit_of_measurement":'
 
@@ -159,7 +174,16 @@ async def async_setup(hass, config):
         filters = None
         entities_filter = None
 
-    hass.http.register_view(LogbookView(conf, filters, entities_filter))
+    day_cache = hass.data[DATA_DAY_CACHE] = LogbookDayCache(
+        timedelta(minutes=GROUP_BY_MINUTES),
+        partial(EntityAttributeCache, hass),
+        lambda: hass.data[DATA_INSTANCE].committed_until,
+    )
+    async_dispatcher_connect(hass, SIGNAL_PURGE_FINISHED, day_cache.async_clear)
+
+    hass.http.register_view(LogbookView(conf, filters, entities_filter, day_cache))
+    hass.data[DATA_FILTERS] = (filters, entities_filter)
+    hass.components.websocket_api.async_register_command(websocket_get_events)
 
     hass.services.async_register(DOMAIN, "log", log_message, schema=LOG_MESSAGE_SCHEMA)
 
@@ -175,6 +199,8 @@ async def _process_logbook_platform(hass, domain, platform):
     def _async_describe_event(domain, event_name, describe_callback):
         """Teach logbook how to describe a new event."""
         hass.data[DOMAIN][event_name] = (domain, describe_callback)
+        # Cached entries were humanified without this description
+        hass.data[DATA_DAY_CACHE].async_clear()
 
     platform.async_describe_events(hass, _async_describe_event)
 
@@ -186,11 +212,12 @@ class LogbookView(HomeAssistantView):
     name = "api:logbook"
     extra_urls = ["/api/logbook/{datetime}"]
 
-    def __init__(self, config, filters, entities_filter):
+    def __init__(self, config, filters, entities_filter, day_cache):
         """Initialize the logbook view."""
         self.config = config
         self.filters = filters
         self.entities_filter = entities_filter
+        self.day_cache = day_cache
 
     async def get(self, request, datetime=None):
         """Retrieve logbook entries."""
@@ -232,23 +259,139 @@ class LogbookView(HomeAssistantView):
 
         entity_matches_only = "entity_matches_only" in request.query
 
-        def json_events():
-            """Fetch events and generate JSON."""
-            return self.json(
-                _get_events(
+        limit = request.query.get("limit")
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except ValueError:
+                limit = 0
+            if limit < 1:
+                return self.json_message("Invalid limit", HTTP_BAD_REQUEST)
+
+            cursor = request.query.get("cursor")
+            if cursor is not None:
+                try:
+                    _decode_cursor(cursor)
+                except ValueError:
+                    return self.json_message("Invalid cursor", HTTP_BAD_REQUEST)
+
+            def json_page():
+                """Fetch a page of events and generate JSON."""
+                entries, next_cursor = _get_events_page(
                     hass,
                     start_day,
                     end_day,
+                    limit,
+                    cursor,
                     entity_ids,
                     self.filters,
                     self.entities_filter,
                     entity_matches_only,
                 )
+                return self.json({"entries": entries, "cursor": next_cursor})
+
+            return await hass.async_add_executor_job(json_page)
+
+        def fetch_events(start, end, context_lookup=None, entity_attr_cache=None):
+            """Fetch the events of a period."""
+            return _get_events(
+                hass,
+                start,
+                end,
+                entity_ids,
+                self.filters,
+                self.entities_filter,
+                entity_matches_only,
+                context_lookup,
+                entity_attr_cache,
             )
 
+        def json_events():
+            """Fetch events and generate JSON."""
+            if end_time is not None:
+                return self.json(fetch_events(start_day, end_day))
+
+            # Whole days are served from the day cache
+            entries = []
+            filter_key = (entity_ids and tuple(entity_ids), entity_matches_only)
+            for day in range(period):
+                day_start = start_day + timedelta(days=day)
+                entries.extend(
+                    self.day_cache.get_day(
+                        (day_start, filter_key),
+                        day_start,
+                        day_start + timedelta(days=1),
+                        fetch_events,
+                    )
+                )
+            return self.json(entries)
+
         return await hass.async_add_executor_job(json_events)
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "logbook/get_events",
+        vol.Required("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Optional("entity_ids"): cv.entity_ids,
+        vol.Optional("entity_matches_only", default=False): bool,
+        vol.Optional("limit", default=DEFAULT_PAGE_SIZE): vol.All(
+            int, vol.Range(min=1)
+        ),
+        vol.Optional("cursor"): str,
+    }
+)
+@websocket_api.async_response
+async def websocket_get_events(hass, connection, msg):
+    """Handle a logbook page request."""
+    start_time = dt_util.parse_datetime(msg["start_time"])
+    if start_time is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_INVALID_FORMAT, "Invalid start_time"
+        )
+        return
+
+    if "end_time" in msg:
+        end_time = dt_util.parse_datetime(msg["end_time"])
+        if end_time is None:
+            connection.send_error(
+                msg["id"], websocket_api.ERR_INVALID_FORMAT, "Invalid end_time"
+            )
+            return
+    else:
+        end_time = dt_util.utcnow()
+
+    cursor = msg.get("cursor")
+    if cursor is not None:
+        try:
+            _decode_cursor(cursor)
+        except ValueError:
+            connection.send_error(
+                msg["id"], websocket_api.ERR_INVALID_FORMAT, "Invalid cursor"
+            )
+            return
+
+    filters, entities_filter = hass.data[DATA_FILTERS]
+    entries, next_cursor = await hass.async_add_executor_job(
+        _get_events_page,
+        hass,
+        dt_util.as_utc(start_time),
+        dt_util.as_utc(end_time),
+        msg["limit"],
+        cursor,
+        msg.get("entity_ids"),
+        filters,
+        entities_filter,
+        msg["entity_matches_only"],
+    )
+    connection.send_message(
+        websocket_api.result_message(
+            msg["id"], {"entries": entries, "cursor": next_cursor}
+        )
+    )
+
+
 def humanify(hass, events, entity_attr_cache, context_lookup):
     """Generate a converted list of events into Entry objects.
 
@@ -259,9 +402,7 @@ def humanify(hass, events, entity_attr_cache, context_lookup):
     external_events = hass.data.get(DOMAIN, {})
 
     # Group events in batches of GROUP_BY_MINUTES
-    for _, g_events in groupby(
-        events, lambda event: event.time_fired_minute // GROUP_BY_MINUTES
-    ):
+    for _, g_events in groupby(events, _event_batch_key):
 
         events_batch = list(g_events)
 
@@ -413,64 +554,164 @@ def _get_events(
     filters=None,
     entities_filter=None,
     entity_matches_only=False,
+    context_lookup=None,
+    entity_attr_cache=None,
 ):
-    """Get events for a period of time."""
+    """Get events for a period of time.
+
+    A context_lookup and entity_attr_cache can be passed to continue
+    a period that was fetched before.
+    """
+    if entity_attr_cache is None:
+        entity_attr_cache = EntityAttributeCache(hass)
+    if context_lookup is None:
+        context_lookup = {None: None}
+
+    with session_scope(hass=hass) as session:
+        events = _yield_events(
+            hass,
+            session,
+            start_day,
+            end_day,
+            entity_ids,
+            filters,
+            entities_filter,
+            entity_matches_only,
+            context_lookup,
+        )
+        return list(humanify(hass, events, entity_attr_cache, context_lookup))
+
+
+def _get_events_page(
+    hass,
+    start_day,
+    end_day,
+    limit,
+    cursor=None,
+    entity_ids=None,
+    filters=None,
+    entities_filter=None,
+    entity_matches_only=False,
+):
+    """Get at most limit entries of a period and the cursor of the next page.
+
+    Events are humanified one GROUP_BY_MINUTES batch at a time, so the
+    next page can start again at the first event of the batch that was
+    cut off and skip the entries that were already returned.
+    """
     entity_attr_cache = EntityAttributeCache(hass)
     context_lookup = {None: None}
+    skip = 0
+    if cursor is not None:
+        resume_time, skip = _decode_cursor(cursor)
+        # The time filter excludes its start
+        start_day = resume_time - timedelta(microseconds=1)
 
-    def yield_events(query):
-        """Yield Events that are not filtered away."""
-        for row in query.yield_per(1000):
-            event = LazyEventPartialState(row)
-            context_lookup.setdefault(event.context_id, event)
-            if event.event_type == EVENT_CALL_SERVICE:
-                continue
-            if event.event_type == EVENT_STATE_CHANGED or _keep_event(
-                hass, event, entities_filter
-            ):
-                yield event
+    entries = []
+    with session_scope(hass=hass) as session:
+        events = _yield_events(
+            hass,
+            session,
+            start_day,
+            end_day,
+            entity_ids,
+            filters,
+            entities_filter,
+            entity_matches_only,
+            context_lookup,
+        )
+        for _, g_events in groupby(events, _event_batch_key):
+            events_batch = list(g_events)
+            batch_entries = islice(
+                humanify(hass, events_batch, entity_attr_cache, context_lookup),
+                skip,
+                None,
+            )
+            for index, entry in enumerate(batch_entries, skip):
+                if len(entries) == limit:
+                    return entries, _encode_cursor(events_batch[0].time_fired, index)
+                entries.append(entry)
+            skip = 0
 
+    return entries, None
+
+
+def _encode_cursor(time_fired, skip):
+    """Encode the position of an entry as an url safe cursor."""
+    micros = (time_fired - CURSOR_EPOCH) // timedelta(microseconds=1)
+    return f"{micros}.{skip}"
+
+
+def _decode_cursor(cursor):
+    """Decode a cursor, raises ValueError if it is invalid."""
+    try:
+        micros, skip = (int(part) for part in cursor.split("."))
+        if skip < 0:
+            raise ValueError
+        return CURSOR_EPOCH + timedelta(microseconds=micros), skip
+    except (OverflowError, TypeError, ValueError) as err:
+        raise ValueError(f"Invalid cursor: {cursor}") from err
+
+
+def _event_batch_key(event):
+    """Return the key of the GROUP_BY_MINUTES batch of an event."""
+    return event.time_fired_minute // GROUP_BY_MINUTES
+
+
+def _yield_events(
+    hass,
+    session,
+    start_day,
+    end_day,
+    entity_ids,
+    filters,
+    entities_filter,
+    entity_matches_only,
+    context_lookup,
+):
+    """Yield Events of a period that are not filtered away."""
     if entity_ids is not None:
         entities_filter = generate_filter([], entity_ids, [], [])
 
-    with session_scope(hass=hass) as session:
-        old_state = aliased(States, name="old_state")
+    old_state = aliased(States, name="old_state")
 
-        if entity_ids is not None:
-            query = _generate_events_query_without_states(session)
-            query = _apply_event_time_filter(query, start_day, end_day)
-            query = _apply_event_types_filter(
-                hass, query, ALL_EVENT_TYPES_EXCEPT_STATE_CHANGED
-            )
-            if entity_matches_only:
-                # When entity_matches_only is provided, contexts and events that do not
-                # contain the entity_ids are not included in the logbook response.
-                query = _apply_event_entity_id_matchers(query, entity_ids)
-
-            query = query.union_all(
-                _generate_states_query(
-                    session, start_day, end_day, old_state, entity_ids
-                )
-            )
-        else:
-            query = _generate_events_query(session)
-            query = _apply_event_time_filter(query, start_day, end_day)
-            query = _apply_events_types_and_states_filter(
-                hass, query, old_state
-            ).filter(
-                (States.last_updated == States.last_changed)
-                | (Events.event_type != EVENT_STATE_CHANGED)
+    if entity_ids is not None:
+        query = _generate_events_query_without_states(session)
+        query = _apply_event_time_filter(query, start_day, end_day)
+        query = _apply_event_types_filter(
+            hass, query, ALL_EVENT_TYPES_EXCEPT_STATE_CHANGED
+        )
+        if entity_matches_only:
+            # When entity_matches_only is provided, contexts and events that do not
+            # contain the entity_ids are not included in the logbook response.
+            query = _apply_event_entity_id_matchers(query, entity_ids)
+
+        query = query.union_all(
+            _generate_states_query(session, start_day, end_day, old_state, entity_ids)
+        )
+    else:
+        query = _generate_events_query(session)
+        query = _apply_event_time_filter(query, start_day, end_day)
+        query = _apply_events_types_and_states_filter(hass, query, old_state).filter(
+            (States.last_updated == States.last_changed)
+            | (Events.event_type != EVENT_STATE_CHANGED)
+        )
+        if filters:
+            query = query.filter(
+                filters.entity_filter() | (Events.event_type != EVENT_STATE_CHANGED)
             )
-            if filters:
-                query = query.filter(
-                    filters.entity_filter() | (Events.event_type != EVENT_STATE_CHANGED)
-                )
 
-        query = query.order_by(Events.time_fired)
+    query = query.order_by(Events.time_fired)
 
-        return list(
-            humanify(hass, yield_events(query), entity_attr_cache, context_lookup)
-        )
+    for row in query.yield_per(1000):
+        event = LazyEventPartialState(row)
+        context_lookup.setdefault(event.context_id, event)
+        if event.event_type == EVENT_CALL_SERVICE:
+            continue
+        if event.event_type == EVENT_STATE_CHANGED or _keep_event(
+            hass, event, entities_filter
+        ):
+            yield event
 
 
 def _generate_events_query(session):
@@ -479,7 +720,7 @@ def _generate_events_query(session):
         States.state,
         States.entity_id,
         States.domain,
-        States.attributes,
+        STATE_ATTRIBUTES_COLUMN,
     )
 
 
@@ -498,6 +739,9 @@ def _generate_states_query(session, start_day, end_day, old_state, entity_ids):
         _generate_events_query(session)
         .outerjoin(Events, (States.event_id == Events.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .filter(_missing_state_matcher(old_state))
         .filter(_continuous_entity_matcher())
         .filter((States.last_updated > start_day) & (States.last_updated < end_day))
@@ -512,6 +756,9 @@ def _apply_events_types_and_states_filter(hass, query, old_state):
     events_query = (
         query.outerjoin(States, (Events.event_id == States.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .filter(
             (Events.event_type != EVENT_STATE_CHANGED)
             | _missing_state_matcher(old_state)
@@ -541,7 +788,7 @@ def _continuous_entity_matcher():
     #
     return sqlalchemy.or_(
         sqlalchemy.not_(States.domain.in_(CONTINUOUS_DOMAINS)),
-        sqlalchemy.not_(States.attributes.contains(UNIT_OF_MEASUREMENT_JSON)),
+        sqlalchemy.not_(STATE_ATTRIBUTES_JSON.contains(UNIT_OF_MEASUREMENT_JSON)),
     )
 
 
@@ -704,6 +951,11 @@ class LazyEventPartialState:
         result = ICON_JSON_EXTRACT.search(self._row.attributes)
         return result and result.group(1)
 
+    @property
+    def time_fired(self):
+        """Time event was fired in utc."""
+        return process_timestamp(self._row.time_fired)
+
     @property
     def data_entity_id(self):
         """Extract the entity id from the decoded data or json."""
@@ -0,0 +1,205 @@
+"""Cache of humanified logbook entries by day."""
+from collections import ChainMap, OrderedDict
+from datetime import datetime, timedelta
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Union
+
+from homeassistant.core import callback
+import homeassistant.util.dt as dt_util
+
+MAX_CACHED_DAYS = 32
+
+# Events fired exactly at the start of a fetch are not returned,
+# later windows of a day start this much earlier to include them
+_RESOLUTION = timedelta(microseconds=1)
+
+# fetch(start, end, context_lookup, entity_attr_cache) -> entries
+FetchEntries = Callable[[datetime, datetime, Dict, Any], List[dict]]
+
+
+class _PartialDay:
+    """The entries of a day in progress up to a settled point in time."""
+
+    __slots__ = ["start", "settled", "entries", "context_lookup", "entity_attr_cache"]
+
+    def __init__(self, start: datetime, entity_attr_cache: Any) -> None:
+        """Initialize an empty day."""
+        self.start = start
+        self.settled = start
+        self.entries: List[dict] = []
+        self.context_lookup: Dict = {None: None}
+        self.entity_attr_cache = entity_attr_cache
+
+    @property
+    def fetch_after(self) -> datetime:
+        """Return the start of the fetch of the next window."""
+        if self.settled == self.start:
+            return self.start
+        return self.settled - _RESOLUTION
+
+
+class _DayLock:
+    """Lock of the fetches of a day and the number of threads using it."""
+
+    __slots__ = ["lock", "users"]
+
+    def __init__(self) -> None:
+        """Initialize an unused lock."""
+        self.lock = threading.Lock()
+        self.users = 0
+
+
+class LogbookDayCache:
+    """Keep the humanified logbook entries of recently viewed days.
+
+    Completed days are kept until the recorder purges the database. A day
+    in progress is extended one settled GROUP_BY_MINUTES window at a time,
+    keeping the context lookup of the events already seen, so a repeated
+    view only queries the events since the last settled window.
+
+    A window is settled once committed_until, the time before which the
+    recorder has committed all events, has passed its end. The events of a
+    day are fetched by one thread at a time, other days are not blocked.
+    """
+
+    def __init__(
+        self,
+        group_by: timedelta,
+        entity_attr_cache_factory: Callable[[], Any],
+        committed_until: Callable[[], Optional[datetime]],
+        max_days: int = MAX_CACHED_DAYS,
+    ) -> None:
+        """Initialize the cache."""
+        self.group_by = group_by
+        self.entity_attr_cache_factory = entity_attr_cache_factory
+        self.committed_until = committed_until
+        self.max_days = max_days
+        self.hits = 0
+        self.misses = 0
+        self._days: "OrderedDict[Hashable, Union[List[dict], _PartialDay]]" = (
+            OrderedDict()
+        )
+        self._generation = 0
+        # Guards the cached days, the day locks guard the fetches of a day
+        self._lock = threading.Lock()
+        self._day_locks: Dict[Hashable, _DayLock] = {}
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Return the hit and miss counters and the size of the cache."""
+        return {"hits": self.hits, "misses": self.misses, "days": len(self._days)}
+
+    @callback
+    def async_clear(self) -> None:
+        """Drop all cached entries, for example after a purge."""
+        with self._lock:
+            self._generation += 1
+            self._days = OrderedDict()
+
+    def _settled_time(self) -> Optional[datetime]:
+        """Return the start of the last window that can no longer change."""
+        committed_until = self.committed_until()
+        if committed_until is None:
+            return None
+        settled = dt_util.as_timestamp(committed_until)
+        step = self.group_by.total_seconds()
+        return dt_util.utc_from_timestamp(settled - settled % step)
+
+    def get_day(
+        self, key: Hashable, start: datetime, end: datetime, fetch: FetchEntries
+    ) -> List[dict]:
+        """Return the entries of a day, fetching what is not cached."""
+        with self._lock:
+            day_lock = self._day_locks.get(key)
+            if day_lock is None:
+                day_lock = self._day_locks[key] = _DayLock()
+            day_lock.users += 1
+
+        try:
+            with day_lock.lock:
+                return self._get_day(key, start, end, fetch)
+        finally:
+            with self._lock:
+                day_lock.users -= 1
+                if not day_lock.users:
+                    del self._day_locks[key]
+
+    def _get_day(
+        self, key: Hashable, start: datetime, end: datetime, fetch: FetchEntries
+    ) -> List[dict]:
+        """Return the entries of a day while holding the lock of the day."""
+        settled = self._settled_time()
+        with self._lock:
+            generation = self._generation
+            cached = self._days.get(key)
+            if isinstance(cached, list):
+                self._days.move_to_end(key)
+                self.hits += 1
+                return cached
+
+        if settled is not None and end <= settled:
+            self._count(hit=False)
+            if cached is None:
+                entries = fetch(
+                    start, end, {None: None}, self.entity_attr_cache_factory()
+                )
+            else:
+                entries = cached.entries + fetch(
+                    cached.fetch_after,
+                    end,
+                    cached.context_lookup,
+                    cached.entity_attr_cache,
+                )
+            self._store(generation, key, entries)
+            return entries
+
+        if cached is None:
+            cached = _PartialDay(start, self.entity_attr_cache_factory())
+        if settled is not None and settled > cached.settled:
+            cached.entries.extend(
+                fetch(
+                    cached.fetch_after,
+                    settled,
+                    cached.context_lookup,
+                    cached.entity_attr_cache,
+                )
+            )
+            cached.settled = settled
+            self._count(hit=False)
+        else:
+            self._count(hit=True)
+        if cached.settled > start:
+            self._store(generation, key, cached)
+
+        # Contexts of the unsettled tail must not leak into the day, the
+        # same events are fetched again once their window has settled
+        return cached.entries + fetch(
+            cached.fetch_after,
+            end,
+            ChainMap({}, cached.context_lookup),
+            cached.entity_attr_cache,
+        )
+
+    def _count(self, hit: bool) -> None:
+        """Count a hit or a miss."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _store(
+        self,
+        generation: int,
+        key: Hashable,
+        value: Union[List[dict], _PartialDay],
+    ) -> None:
+        """Store entries unless the cache was cleared while they were fetched."""
+        with self._lock:
+            if generation != self._generation:
+                return
+            days = self._days
+            days[key] = value
+            days.move_to_end(key)
+            while len(days) > self.max_days:
+                days.popitem(last=False)
@@ -2,15 +2,15 @@
 import asyncio
 from collections import namedtuple
 import concurrent.futures
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 import queue
 import sqlite3
 import threading
 import time
-from typing import Any, Callable, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from sqlalchemy import create_engine, event as sqlalchemy_event, exc, select
+from sqlalchemy import create_engine, event as sqlalchemy_event, exc, func, select
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.pool import StaticPool
 import voluptuous as vol
@@ -25,8 +25,9 @@ from homeassistant.const import (
     EVENT_TIME_CHANGED,
     MATCH_ALL,
 )
-from homeassistant.core import CoreState, HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, CoreState, HomeAssistant, callback
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.dispatcher import dispatcher_send
 from homeassistant.helpers.entityfilter import (
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
     INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER,
@@ -36,8 +37,15 @@ from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 
 from . import migration, purge
-from .const import CONF_DB_INTEGRITY_CHECK, DATA_INSTANCE, DOMAIN, SQLITE_URL_PREFIX
-from .models import Base, Events, RecorderRuns, States
+from .const import (
+    CONF_DB_INTEGRITY_CHECK,
+    DATA_INSTANCE,
+    DOMAIN,
+    SIGNAL_PURGE_FINISHED,
+    SQLITE_URL_PREFIX,
+)
+from .models import Base, Events, RecorderRuns, StateAttributes, States
+from .statistics import StatisticsCompiler
 from .util import (
     dburl_to_path,
     move_away_broken_database,
@@ -75,6 +83,10 @@ KEEPALIVE_TIME = 30
 # States and Events objects
 EXPIRE_AFTER_COMMITS = 120
 
+# Number of recently written shared attributes
+# to remember so they are not looked up again
+STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
+
 CONF_AUTO_PURGE = "auto_purge"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
@@ -83,6 +95,7 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_BULK_INSERT = "bulk_insert"
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
     {vol.Optional(CONF_EVENT_TYPES): vol.All(cv.ensure_list, [cv.string])}
@@ -116,6 +129,7 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_INTEGRITY_CHECK, default=DEFAULT_DB_INTEGRITY_CHECK
                     ): cv.boolean,
+                    vol.Optional(CONF_BULK_INSERT, default=False): cv.boolean,
                 }
             ),
         )
@@ -174,6 +188,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
     db_integrity_check = conf[CONF_DB_INTEGRITY_CHECK]
+    bulk_insert = conf[CONF_BULK_INSERT]
 
     db_url = conf.get(CONF_DB_URL)
     if not db_url:
@@ -191,6 +206,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         entity_filter=entity_filter,
         exclude_t=exclude_t,
         db_integrity_check=db_integrity_check,
+        bulk_insert=bulk_insert,
     )
     instance.async_initialize()
     instance.start()
@@ -230,6 +246,18 @@ class WaitTask:
     """An object to insert into the recorder queue to tell it set the _queue_watch event."""
 
 
+class TickTask:
+    """An object to insert into the recorder queue for a tick of the commit interval."""
+
+
+class CommitTask:
+    """An object to insert into the recorder queue to commit right away."""
+
+
+class KeepAliveTask:
+    """An object to insert into the recorder queue to send a keepalive."""
+
+
 class Recorder(threading.Thread):
     """A threaded recorder class."""
 
@@ -245,6 +273,7 @@ class Recorder(threading.Thread):
         entity_filter: Callable[[str], bool],
         exclude_t: List[str],
         db_integrity_check: bool,
+        bulk_insert: bool,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -259,6 +288,7 @@ class Recorder(threading.Thread):
         self.db_max_retries = db_max_retries
         self.db_retry_wait = db_retry_wait
         self.db_integrity_check = db_integrity_check
+        self.bulk_insert = bulk_insert
         self.async_db_ready = asyncio.Future()
         self._queue_watch = threading.Event()
         self.engine: Any = None
@@ -268,10 +298,36 @@ class Recorder(threading.Thread):
         self.exclude_t = exclude_t
 
         self._timechanges_seen = 0
+        self._ticks_since_event = 0
+        self._tick_unsub: Optional[CALLBACK_TYPE] = None
         self._commits_without_expire = 0
-        self._keepalive_count = 0
         self._old_states = {}
         self._pending_expunge = []
+        # Bulk insert rows with ids allocated by the recorder
+        self._bulk_events: List[Dict[str, Any]] = []
+        self._bulk_states: List[Dict[str, Any]] = []
+        self._bulk_state_attributes: List[Dict[str, Any]] = []
+        self._old_state_ids: Dict[str, int] = {}
+        self._next_event_id = 1
+        self._next_state_id = 1
+        self._next_attributes_id = 1
+        # Shared attributes json to attributes_id, oldest first
+        self._state_attributes_ids: Dict[str, int] = {}
+        self._pending_state_attributes: Dict[str, StateAttributes] = {}
+        self._pending_rows = 0
+        self._last_commit = time.monotonic()
+        self._rows_written = 0
+        self._rows_per_second = 0.0
+        self._statistics = StatisticsCompiler()
+        self._closing = False
+        self.purge_cursor: Optional[purge.PurgeCursor] = None
+        # Events fired before this time are committed to the database
+        self.committed_until: Optional[datetime] = None
+        self._last_event_time: Optional[datetime] = None
+        # Events fired before this time were passed to the event listener
+        self._dispatched_until: Optional[datetime] = None
+        self._events_queued = 0
+        self._events_processed = 0
         self.event_session = None
         self.get_session = None
         self._completed_database_setup = None
@@ -285,13 +341,14 @@ class Recorder(threading.Thread):
     @callback
     def async_initialize(self):
         """Initialize the recorder."""
-        self.hass.bus.async_listen(
-            MATCH_ALL, self.event_listener, event_filter=self._async_event_filter
-        )
+        self.hass.bus.async_listen_batch(MATCH_ALL, self.event_listener)
 
     @callback
     def _async_event_filter(self, event):
         """Filter events."""
+        if event.event_type == EVENT_TIME_CHANGED:
+            return False
+
         if event.event_type in self.exclude_t:
             return False
 
@@ -302,6 +359,16 @@ class Recorder(threading.Thread):
 
         return True
 
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Return write throughput and backlog of the recorder."""
+        return {
+            "queue_depth": self.queue.qsize(),
+            "rows_written": self._rows_written,
+            "rows_per_second": self._rows_per_second,
+            "purge": self.purge_cursor and self.purge_cursor.as_dict(),
+        }
+
     def do_adhoc_purge(self, **kwargs):
         """Trigger an adhoc purge retaining keep_days worth of data."""
         keep_days = kwargs.get(ATTR_KEEP_DAYS, self.keep_days)
@@ -355,6 +422,25 @@ class Recorder(threading.Thread):
             self._shutdown()
             return
 
+        @callback
+        def async_keep_alive(now):
+            """Trigger a keepalive."""
+            self.queue.put(KeepAliveTask())
+
+        self.hass.helpers.event.track_time_interval(
+            async_keep_alive, timedelta(seconds=KEEPALIVE_TIME)
+        )
+
+        @callback
+        def async_commit(now):
+            """Commit to write the statistics of the period that ended."""
+            self.queue.put(CommitTask())
+
+        # Ticks stop when there are no events, periods still need to end
+        self.hass.helpers.event.track_utc_time_change(
+            async_commit, minute="/5", second=0
+        )
+
         # Start periodic purge
         if self.auto_purge:
 
@@ -421,28 +507,54 @@ class Recorder(threading.Thread):
     def _process_one_event(self, event):
         """Process one event."""
         if isinstance(event, PurgeTask):
-            # Schedule a new purge task if this one didn't finish
-            if not purge.purge_old_data(self, event.keep_days, event.repack):
+            # Queued states may use cached ids of shared attributes,
+            # they must be written before unused attributes are purged
+            self._commit_event_session_or_recover()
+            # Schedule a new purge task if this one didn't finish,
+            # events queued in the meantime are recorded between batches
+            if purge.purge_old_data(self, event.keep_days, event.repack):
+                dispatcher_send(self.hass, SIGNAL_PURGE_FINISHED)
+            else:
                 self.queue.put(PurgeTask(event.keep_days, event.repack))
+            # Shared attributes may have been purged
+            self._state_attributes_ids = {}
             return
         if isinstance(event, WaitTask):
             self._queue_watch.set()
             return
-        if event.event_type == EVENT_TIME_CHANGED:
-            self._keepalive_count += 1
-            if self._keepalive_count >= KEEPALIVE_TIME:
-                self._keepalive_count = 0
-                self._send_keep_alive()
-            if self.commit_interval:
-                self._timechanges_seen += 1
-                if self._timechanges_seen >= self.commit_interval:
-                    self._timechanges_seen = 0
-                    self._commit_event_session_or_recover()
+        if isinstance(event, TickTask):
+            self._timechanges_seen += 1
+            if self._timechanges_seen >= self.commit_interval:
+                self._timechanges_seen = 0
+                self._commit_event_session_or_recover()
+            return
+        if isinstance(event, CommitTask):
+            self._commit_event_session_or_recover()
+            return
+        if isinstance(event, KeepAliveTask):
+            self._send_keep_alive()
             return
 
+        self._last_event_time = event.time_fired
+        self._events_processed += 1
         if not self.enabled:
             return
 
+        if self.bulk_insert:
+            self._add_event_rows(event)
+        else:
+            self._add_event_objects(event)
+
+        if event.event_type == EVENT_STATE_CHANGED:
+            self._statistics.add_state(event.data.get("new_state"))
+
+        # If they do not have a commit interval
+        # than we commit right away
+        if not self.commit_interval:
+            self._commit_event_session_or_recover()
+
+    def _add_event_objects(self, event):
+        """Add the ORM objects of an event to the event session."""
         try:
             if event.event_type == EVENT_STATE_CHANGED:
                 dbevent = Events.from_event(event, event_data="{}")
@@ -450,6 +562,7 @@ class Recorder(threading.Thread):
                 dbevent = Events.from_event(event)
             dbevent.created = event.time_fired
             self.event_session.add(dbevent)
+            self._pending_rows += 1
         except (TypeError, ValueError):
             _LOGGER.warning("Event is not JSON serializable: %s", event)
             return
@@ -470,9 +583,11 @@ class Recorder(threading.Thread):
                         dbstate.old_state = old_state
                 if not has_new_state:
                     dbstate.state = None
+                self._link_state_attributes(dbstate)
                 dbstate.event = dbevent
                 dbstate.created = event.time_fired
                 self.event_session.add(dbstate)
+                self._pending_rows += 1
                 if has_new_state:
                     self._old_states[dbstate.entity_id] = dbstate
                     self._pending_expunge.append(dbstate)
@@ -485,10 +600,133 @@ class Recorder(threading.Thread):
                 # Must catch the exception to prevent the loop from collapsing
                 _LOGGER.exception("Error adding state change: %s", err)
 
-        # If they do not have a commit interval
-        # than we commit right away
-        if not self.commit_interval:
-            self._commit_event_session_or_recover()
+    def _add_event_rows(self, event):
+        """Queue the rows of an event for the next bulk insert.
+
+        Primary keys are allocated here so old_state_id can be
+        linked in memory instead of through ORM relationships.
+        """
+        try:
+            if event.event_type == EVENT_STATE_CHANGED:
+                event_row = Events.row_from_event(event, event_data="{}")
+            else:
+                event_row = Events.row_from_event(event)
+        except (TypeError, ValueError):
+            _LOGGER.warning("Event is not JSON serializable: %s", event)
+            return
+        except Exception as err:  # pylint: disable=broad-except
+            # Must catch the exception to prevent the loop from collapsing
+            _LOGGER.exception("Error adding event: %s", err)
+            return
+
+        event_id = self._next_event_id
+        self._next_event_id += 1
+        event_row["event_id"] = event_id
+        event_row["created"] = event.time_fired
+        self._bulk_events.append(event_row)
+
+        if event.event_type != EVENT_STATE_CHANGED:
+            return
+
+        try:
+            state_row = States.row_from_event(event)
+        except (TypeError, ValueError):
+            _LOGGER.warning(
+                "State is not JSON serializable: %s", event.data.get("new_state")
+            )
+            return
+        except Exception as err:  # pylint: disable=broad-except
+            # Must catch the exception to prevent the loop from collapsing
+            _LOGGER.exception("Error adding state change: %s", err)
+            return
+
+        entity_id = state_row["entity_id"]
+        state_id = self._next_state_id
+        self._next_state_id += 1
+        state_row["state_id"] = state_id
+        state_row["event_id"] = event_id
+        state_row["created"] = event.time_fired
+        state_row["old_state_id"] = self._old_state_ids.pop(entity_id, None)
+        if event.data.get("new_state"):
+            self._old_state_ids[entity_id] = state_id
+        else:
+            state_row["state"] = None
+        state_row["attributes_id"] = self._bulk_state_attributes_id(
+            state_row["attributes"]
+        )
+        state_row["attributes"] = None
+        self._bulk_states.append(state_row)
+
+    def _link_state_attributes(self, dbstate):
+        """Point a state object at shared attributes instead of storing them."""
+        shared_attrs = dbstate.attributes
+        dbstate.attributes = None
+
+        attributes_id = self._find_state_attributes_id(shared_attrs)
+        if attributes_id is not None:
+            dbstate.attributes_id = attributes_id
+            return
+
+        dbattrs = self._pending_state_attributes.get(shared_attrs)
+        if dbattrs is None:
+            dbattrs = StateAttributes(
+                hash=StateAttributes.hash_shared_attrs(shared_attrs),
+                shared_attrs=shared_attrs,
+            )
+            self._pending_state_attributes[shared_attrs] = dbattrs
+        dbstate.state_attributes = dbattrs
+
+    def _bulk_state_attributes_id(self, shared_attrs):
+        """Return the id of shared attributes, queueing a new row if needed."""
+        attributes_id = self._find_state_attributes_id(shared_attrs)
+        if attributes_id is not None:
+            return attributes_id
+
+        attributes_id = self._next_attributes_id
+        self._next_attributes_id += 1
+        self._bulk_state_attributes.append(
+            {
+                "attributes_id": attributes_id,
+                "hash": StateAttributes.hash_shared_attrs(shared_attrs),
+                "shared_attrs": shared_attrs,
+            }
+        )
+        self._cache_state_attributes_id(shared_attrs, attributes_id)
+        return attributes_id
+
+    def _find_state_attributes_id(self, shared_attrs):
+        """Find the id of already written shared attributes."""
+        attributes_id = self._state_attributes_ids.get(shared_attrs)
+        if attributes_id is not None:
+            self._cache_state_attributes_id(shared_attrs, attributes_id)
+            return attributes_id
+
+        if shared_attrs in self._pending_state_attributes:
+            return None
+
+        with self.event_session.no_autoflush:
+            row = (
+                self.event_session.query(StateAttributes.attributes_id)
+                .filter(
+                    StateAttributes.hash
+                    == StateAttributes.hash_shared_attrs(shared_attrs)
+                )
+                .filter(StateAttributes.shared_attrs == shared_attrs)
+                .first()
+            )
+
+        if row is None:
+            return None
+
+        self._cache_state_attributes_id(shared_attrs, row[0])
+        return row[0]
+
+    def _cache_state_attributes_id(self, shared_attrs, attributes_id):
+        """Remember shared attributes as most recently used."""
+        self._state_attributes_ids.pop(shared_attrs, None)
+        if len(self._state_attributes_ids) >= STATE_ATTRIBUTES_ID_CACHE_SIZE:
+            del self._state_attributes_ids[next(iter(self._state_attributes_ids))]
+        self._state_attributes_ids[shared_attrs] = attributes_id
 
     def _commit_event_session_or_recover(self):
         """Commit changes to the database and recover if the database fails when possible."""
@@ -536,15 +774,47 @@ class Recorder(threading.Thread):
     def _commit_event_session(self):
         self._commits_without_expire += 1
 
-        if self._pending_expunge:
-            self.event_session.flush()
-            for dbstate in self._pending_expunge:
-                # Expunge the state so its not expired
-                # until we use it later for dbstate.old_state
-                if dbstate in self.event_session:
-                    self.event_session.expunge(dbstate)
-            self._pending_expunge = []
-        self.event_session.commit()
+        # Events fired after the last one that was processed are still
+        # in the queue unless all queued events were processed. Read
+        # before the counts, the events dispatched by then were queued.
+        # Events fired after the last dispatched one may still be waiting
+        # for their batch to be dispatched.
+        dispatched_until = self._dispatched_until
+        if self._events_processed == self._events_queued:
+            committed_until = dispatched_until
+        else:
+            committed_until = self._last_event_time
+
+        # Periods that are still open are written on shutdown
+        # and merged with the rest of the period after a restart
+        finished_statistics = self._statistics.finished(
+            datetime.max.replace(tzinfo=dt_util.UTC)
+            if self._closing
+            else dt_util.utcnow()
+        )
+        self._statistics.add_to_session(self.event_session, finished_statistics)
+
+        if self._bulk_events:
+            self._commit_bulk_rows()
+        else:
+            if self._pending_expunge:
+                self.event_session.flush()
+                for dbstate in self._pending_expunge:
+                    # Expunge the state so its not expired
+                    # until we use it later for dbstate.old_state
+                    if dbstate in self.event_session:
+                        self.event_session.expunge(dbstate)
+                self._pending_expunge = []
+            self.event_session.commit()
+            self._update_write_metrics(self._pending_rows)
+            self._pending_rows = 0
+
+            for shared_attrs, dbattrs in self._pending_state_attributes.items():
+                self._cache_state_attributes_id(shared_attrs, dbattrs.attributes_id)
+            self._pending_state_attributes = {}
+
+        self._statistics.discard(finished_statistics)
+        self.committed_until = committed_until
 
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
@@ -553,6 +823,58 @@ class Recorder(threading.Thread):
             self._commits_without_expire = 0
             self.event_session.expire_all()
 
+    def _commit_bulk_rows(self):
+        """Write the queued rows with executemany inserts and commit."""
+        try:
+            if self._bulk_state_attributes:
+                self.event_session.execute(
+                    StateAttributes.__table__.insert(), self._bulk_state_attributes
+                )
+            self.event_session.execute(Events.__table__.insert(), self._bulk_events)
+            if self._bulk_states:
+                self.event_session.execute(States.__table__.insert(), self._bulk_states)
+            self.event_session.commit()
+        except Exception:
+            # Do not leave half of the rows in the transaction
+            # in case the commit is retried
+            self.event_session.rollback()
+            raise
+
+        self._update_write_metrics(len(self._bulk_events) + len(self._bulk_states))
+        self._bulk_events = []
+        self._bulk_states = []
+        self._bulk_state_attributes = []
+
+    def _update_write_metrics(self, rows):
+        """Update the write throughput after a commit."""
+        if not rows:
+            # Commits with nothing queued, for example in bulk mode when
+            # only statistics periods end, do not measure the throughput
+            return
+        now = time.monotonic()
+        elapsed = now - self._last_commit
+        self._last_commit = now
+        self._rows_written += rows
+        if elapsed > 0:
+            self._rows_per_second = rows / elapsed
+
+    def _setup_bulk_ids(self):
+        """Continue allocating primary keys after the highest stored ids."""
+        self._bulk_events = []
+        self._bulk_states = []
+        self._bulk_state_attributes = []
+        self._old_state_ids = {}
+        self._next_event_id = (
+            self.event_session.query(func.max(Events.event_id)).scalar() or 0
+        ) + 1
+        self._next_state_id = (
+            self.event_session.query(func.max(States.state_id)).scalar() or 0
+        ) + 1
+        self._next_attributes_id = (
+            self.event_session.query(func.max(StateAttributes.attributes_id)).scalar()
+            or 0
+        ) + 1
+
     def _handle_sqlite_corruption(self):
         """Handle the sqlite3 database being corrupt."""
         self._close_connection()
@@ -562,6 +884,7 @@ class Recorder(threading.Thread):
     def _reopen_event_session(self):
         """Rollback the event session and reopen it after a failure."""
         self._old_states = {}
+        self._pending_rows = 0
 
         try:
             self.event_session.rollback()
@@ -576,9 +899,14 @@ class Recorder(threading.Thread):
 
     def _open_event_session(self):
         """Open the event session."""
+        # Ids of rows that were never committed may be cached
+        self._state_attributes_ids = {}
+        self._pending_state_attributes = {}
         try:
             self.event_session = self.get_session()
             self.event_session.expire_on_commit = False
+            if self.bulk_insert:
+                self._setup_bulk_ids()
         except Exception as err:  # pylint: disable=broad-except
             _LOGGER.exception("Error while creating new event session: %s", err)
 
@@ -595,9 +923,34 @@ class Recorder(threading.Thread):
             self._reopen_event_session()
 
     @callback
-    def event_listener(self, event):
-        """Listen for new events and put them in the process queue."""
-        self.queue.put(event)
+    def event_listener(self, events):
+        """Listen for batches of new events and put them in the process queue."""
+        queued = False
+        for event in events:
+            if self._async_event_filter(event):
+                # Counted first so a commit never assumes it was processed
+                self._events_queued += 1
+                self.queue.put(event)
+                queued = True
+        self._dispatched_until = events[-1].time_fired
+        if queued and self.commit_interval:
+            self._ticks_since_event = 0
+            if self._tick_unsub is None:
+                self._tick_unsub = self.hass.ticker.async_listen(self._async_tick)
+
+    @callback
+    def _async_tick(self, now):
+        """Count a tick of the commit interval.
+
+        Ticks are only needed until the events that were queued are
+        committed, so the recorder does not wake up every second when
+        nothing happens.
+        """
+        self.queue.put(TickTask())
+        self._ticks_since_event += 1
+        if self._ticks_since_event >= self.commit_interval:
+            self._tick_unsub()
+            self._tick_unsub = None
 
     def block_till_done(self):
         """Block till all events processed.
@@ -669,6 +1022,13 @@ class Recorder(threading.Thread):
 
         self.engine = create_engine(self.db_url, **kwargs)
 
+        if self.bulk_insert and self.engine.dialect.name == "postgresql":
+            # Explicit primary keys would not advance the id sequences
+            _LOGGER.warning(
+                "Bulk insert is not supported on PostgreSQL, using the default writer"
+            )
+            self.bulk_insert = False
+
         sqlalchemy_event.listen(self.engine, "connect", setup_recorder_connection)
 
         Base.metadata.create_all(self.engine)
@@ -707,6 +1067,7 @@ class Recorder(threading.Thread):
 
     def _shutdown(self):
         """Save end time for current run."""
+        self._closing = True
         if self.event_session is not None:
             self.run_info.end = dt_util.utcnow()
             self.event_session.add(self.run_info)
@@ -4,4 +4,6 @@ DATA_INSTANCE = "recorder_instance"
 SQLITE_URL_PREFIX = "sqlite://"
 DOMAIN = "recorder"
 
+SIGNAL_PURGE_FINISHED = "recorder_purge_finished"
+
 CONF_DB_INTEGRITY_CHECK = "db_integrity_check"
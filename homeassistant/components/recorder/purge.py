@@ -1,77 +1,113 @@
 """Purge old data helper."""
-from datetime import timedelta
+from datetime import datetime, timedelta
 import logging
 import time
+from typing import Any, Dict, Tuple
 
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
 import homeassistant.util.dt as dt_util
 
-from .models import Events, RecorderRuns, States
-from .util import execute, session_scope
+from .models import Events, RecorderRuns, StateAttributes, States, StatisticsShortTerm
+from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
 
+PURGE_BATCH_SIZE = 4000
+
+STAGE_STATES = "states"
+STAGE_EVENTS = "events"
+STAGE_STATE_ATTRIBUTES = "state_attributes"
+STAGE_STATISTICS_SHORT_TERM = "statistics_short_term"
+STAGE_RECORDER_RUNS = "recorder_runs"
+STAGE_DONE = "done"
+
+
+class PurgeCursor:
+    """Position of a purge that is in progress.
+
+    The cursor is kept on the recorder between batches, so a purge that is
+    interrupted continues after the last committed batch.
+    """
+
+    def __init__(self, purge_days: int, purge_before: datetime) -> None:
+        """Initialize the cursor at the start of a purge."""
+        self.purge_days = purge_days
+        self.purge_before = purge_before
+        self.stage = STAGE_STATES
+        self.last_id = 0
+        self.rows_deleted = 0
+        self.started = time.monotonic()
+
+    @property
+    def rows_per_second(self) -> float:
+        """Return the rate at which rows have been deleted."""
+        elapsed = time.monotonic() - self.started
+        if elapsed <= 0:
+            return 0.0
+        return self.rows_deleted / elapsed
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the progress of the purge."""
+        return {
+            "stage": self.stage,
+            "purge_before": self.purge_before,
+            "rows_deleted": self.rows_deleted,
+            "rows_per_second": self.rows_per_second,
+        }
+
+
 def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
     """Purge events and states older than purge_days ago.
 
-    Cleans up an timeframe of an hour, based on the oldest record.
+    Deletes at most PURGE_BATCH_SIZE rows of each table per call and returns
+    False while there is more to purge, so the recorder can commit other
+    work between batches. The five minute statistics are purged with the
+    states, the hourly statistics are kept as the long-term history of the
+    purged states.
     """
-    purge_before = dt_util.utcnow() - timedelta(days=purge_days)
-    _LOGGER.debug("Purging states and events before target %s", purge_before)
+    cursor = instance.purge_cursor
+    if cursor is None or cursor.purge_days != purge_days:
+        purge_before = dt_util.utcnow() - timedelta(days=purge_days)
+        _LOGGER.debug("Purging states and events before target %s", purge_before)
+        cursor = instance.purge_cursor = PurgeCursor(purge_days, purge_before)
 
     try:
+        stage, last_id, deleted_rows = cursor.stage, cursor.last_id, 0
         with session_scope(session=instance.get_session()) as session:
-            # Purge a max of 1 hour, based on the oldest states or events record
-            batch_purge_before = purge_before
-
-            query = session.query(States).order_by(States.last_updated.asc()).limit(1)
-            states = execute(query, to_native=True, validate_entity_ids=False)
-            if states:
-                batch_purge_before = min(
-                    batch_purge_before,
-                    states[0].last_updated + timedelta(hours=1),
+            # Continue with the next stage in the same transaction
+            # until a batch is full or everything is purged
+            while stage != STAGE_DONE:
+                next_stage, last_id, batch_rows = _purge_batch(
+                    instance, session, cursor.purge_before, stage, last_id
                 )
-
-            query = session.query(Events).order_by(Events.time_fired.asc()).limit(1)
-            events = execute(query, to_native=True)
-            if events:
-                batch_purge_before = min(
-                    batch_purge_before,
-                    events[0].time_fired + timedelta(hours=1),
-                )
-
-            _LOGGER.debug("Purging states and events before %s", batch_purge_before)
-
-            deleted_rows = (
-                session.query(States)
-                .filter(States.last_updated < batch_purge_before)
-                .delete(synchronize_session=False)
+                _LOGGER.debug("Deleted %s rows from %s", batch_rows, stage)
+                deleted_rows += batch_rows
+                if next_stage == stage:
+                    break
+                stage = next_stage
+
+        # Only move the cursor once the batch is committed
+        cursor.stage = stage
+        cursor.last_id = last_id
+        cursor.rows_deleted += deleted_rows
+
+        if stage != STAGE_DONE:
+            _LOGGER.debug(
+                "Purge in progress, %s rows deleted (%.0f rows/s)",
+                cursor.rows_deleted,
+                cursor.rows_per_second,
             )
-            _LOGGER.debug("Deleted %s states", deleted_rows)
+            return False
 
-            deleted_rows = (
-                session.query(Events)
-                .filter(Events.time_fired < batch_purge_before)
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s events", deleted_rows)
-
-            # If states or events purging isn't processing the purge_before yet,
-            # return false, as we are not done yet.
-            if batch_purge_before != purge_before:
-                _LOGGER.debug("Purging hasn't fully completed yet")
-                return False
-
-            # Recorder runs is small, no need to batch run it
-            deleted_rows = (
-                session.query(RecorderRuns)
-                .filter(RecorderRuns.start < purge_before)
-                .filter(RecorderRuns.run_id != instance.run_info.run_id)
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
+        instance.purge_cursor = None
+        _LOGGER.debug(
+            "Purged %s rows in %.1fs (%.0f rows/s)",
+            cursor.rows_deleted,
+            time.monotonic() - cursor.started,
+            cursor.rows_per_second,
+        )
 
         if repack:
             # Execute sqlite or postgresql vacuum command to free up space on disk
@@ -81,7 +117,10 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
             # Optimize mysql / mariadb tables to free up space on disk
             elif instance.engine.driver in ("mysqldb", "pymysql"):
                 _LOGGER.debug("Optimizing SQL DB to free space")
-                instance.engine.execute("OPTIMIZE TABLE states, events, recorder_runs")
+                instance.engine.execute(
+                    "OPTIMIZE TABLE states, state_attributes, events, "
+                    "statistics_short_term, recorder_runs"
+                )
 
     except OperationalError as err:
         # Retry when one of the following MySQL errors occurred:
@@ -101,3 +140,116 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
     except SQLAlchemyError as err:
         _LOGGER.warning("Error purging history: %s", err)
     return True
+
+
+def _purge_batch(
+    instance, session, purge_before: datetime, stage: str, last_id: int
+) -> Tuple[str, int, int]:
+    """Delete the next batch of a stage.
+
+    Returns the stage and last id the cursor moves to and the number of
+    deleted rows.
+    """
+    if stage == STAGE_STATES:
+        return _purge_rows(
+            session,
+            stage,
+            last_id,
+            States.state_id,
+            STAGE_EVENTS,
+            States.last_updated < purge_before,
+        )
+
+    if stage == STAGE_EVENTS:
+        return _purge_rows(
+            session,
+            stage,
+            last_id,
+            Events.event_id,
+            STAGE_STATE_ATTRIBUTES,
+            Events.time_fired < purge_before,
+        )
+
+    if stage == STAGE_STATE_ATTRIBUTES:
+        return _purge_unused_state_attributes(session, last_id)
+
+    if stage == STAGE_STATISTICS_SHORT_TERM:
+        return _purge_rows(
+            session,
+            stage,
+            last_id,
+            StatisticsShortTerm.id,
+            STAGE_RECORDER_RUNS,
+            StatisticsShortTerm.start < purge_before,
+        )
+
+    # Recorder runs is small, no need to batch run it
+    deleted_rows = (
+        session.query(RecorderRuns)
+        .filter(RecorderRuns.start < purge_before)
+        .filter(RecorderRuns.run_id != instance.run_info.run_id)
+        .delete(synchronize_session=False)
+    )
+    return STAGE_DONE, 0, deleted_rows
+
+
+def _purge_unused_state_attributes(session, last_id: int) -> Tuple[str, int, int]:
+    """Delete the next shared attributes that are no longer used by any state.
+
+    They are found with an outer join on the index of states.attributes_id.
+    The recorder commits its states before purging and does not write while
+    the purge runs, so the ids can be deleted without checking them again.
+    """
+    ids = [
+        row[0]
+        for row in session.query(StateAttributes.attributes_id)
+        .outerjoin(States, States.attributes_id == StateAttributes.attributes_id)
+        .filter(StateAttributes.attributes_id > last_id)
+        .filter(States.state_id.is_(None))
+        .order_by(StateAttributes.attributes_id)
+        .limit(PURGE_BATCH_SIZE)
+    ]
+    if not ids:
+        return STAGE_STATISTICS_SHORT_TERM, 0, 0
+
+    deleted_rows = (
+        session.query(StateAttributes)
+        .filter(StateAttributes.attributes_id.in_(ids))
+        .delete(synchronize_session=False)
+    )
+    if len(ids) < PURGE_BATCH_SIZE:
+        # This was the last batch of the stage
+        return STAGE_STATISTICS_SHORT_TERM, 0, deleted_rows
+    return STAGE_STATE_ATTRIBUTES, ids[-1], deleted_rows
+
+
+def _purge_rows(
+    session, stage: str, last_id: int, id_column, next_stage: str, criterion
+) -> Tuple[str, int, int]:
+    """Delete the next rows matching criterion in primary key order.
+
+    The ids are looked up first and the rows are then deleted by primary
+    key range, which keeps each delete short and bounded.
+    """
+    ids = [
+        row[0]
+        for row in session.query(id_column)
+        .filter(id_column > last_id)
+        .filter(criterion)
+        .order_by(id_column)
+        .limit(PURGE_BATCH_SIZE)
+    ]
+    if not ids:
+        return next_stage, 0, 0
+
+    deleted_rows = (
+        session.query(id_column.class_)
+        .filter(id_column >= ids[0])
+        .filter(id_column <= ids[-1])
+        .filter(criterion)
+        .delete(synchronize_session=False)
+    )
+    if len(ids) < PURGE_BATCH_SIZE:
+        # This was the last batch of the stage
+        return next_stage, 0, deleted_rows
+    return stage, ids[-1], deleted_rows
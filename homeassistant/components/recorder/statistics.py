@@ -0,0 +1,176 @@
+"""Long-term statistics of numeric sensor states."""
+from collections import defaultdict
+from datetime import datetime, timedelta
+import logging
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+from homeassistant.core import State
+import homeassistant.util.dt as dt_util
+
+from .models import Statistics, StatisticsShortTerm, process_timestamp
+from .util import execute, session_scope
+
+_LOGGER = logging.getLogger(__name__)
+
+SENSOR_DOMAIN = "sensor"
+
+PERIOD_5MINUTE = "5minute"
+PERIOD_HOUR = "hour"
+
+STATISTICS_PERIODS = {
+    PERIOD_5MINUTE: (StatisticsShortTerm, timedelta(minutes=5)),
+    PERIOD_HOUR: (Statistics, timedelta(hours=1)),
+}
+
+BucketKey = Tuple[str, datetime]
+
+
+def period_start(period: str, point_in_time: datetime) -> datetime:
+    """Return the start of the statistics period containing point_in_time."""
+    point_in_time = dt_util.as_utc(point_in_time).replace(second=0, microsecond=0)
+    if period == PERIOD_HOUR:
+        return point_in_time.replace(minute=0)
+    return point_in_time.replace(minute=point_in_time.minute - point_in_time.minute % 5)
+
+
+class StatisticsBucket:
+    """Running aggregate of the values of one entity in one period."""
+
+    __slots__ = ["min", "max", "sum", "count"]
+
+    def __init__(self) -> None:
+        """Initialize an empty bucket."""
+        self.min = math.inf
+        self.max = -math.inf
+        self.sum = 0.0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        """Add a value to the bucket."""
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.sum += value
+        self.count += 1
+
+    def merge_into(self, row: Statistics) -> None:
+        """Merge the bucket into an already stored statistics row."""
+        row.min = min(row.min, self.min)
+        row.max = max(row.max, self.max)
+        row.sum += self.sum
+        row.count += self.count
+        row.mean = row.sum / row.count
+
+    def to_row(self, model, entity_id: str, start: datetime) -> Statistics:
+        """Create a statistics row from the bucket."""
+        return model(
+            entity_id=entity_id,
+            start=start,
+            mean=self.sum / self.count,
+            min=self.min,
+            max=self.max,
+            sum=self.sum,
+            count=self.count,
+        )
+
+
+class StatisticsCompiler:
+    """Roll numeric sensor states into statistics as they are recorded.
+
+    Buckets are kept in memory until their period has ended and are then
+    written with the next commit. Rows for a period that already exist,
+    for example after a restart, are merged instead of duplicated.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the compiler."""
+        self._buckets: Dict[str, Dict[BucketKey, StatisticsBucket]] = {
+            period: {} for period in STATISTICS_PERIODS
+        }
+
+    def add_state(self, state: Optional[State]) -> None:
+        """Add a recorded state if it is a numeric sensor state."""
+        if state is None or state.domain != SENSOR_DOMAIN:
+            return
+        try:
+            value = float(state.state)
+        except ValueError:
+            return
+        if not math.isfinite(value):
+            return
+
+        for period, buckets in self._buckets.items():
+            key = (state.entity_id, period_start(period, state.last_updated))
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = StatisticsBucket()
+            bucket.add(value)
+
+    def finished(self, now: datetime) -> Dict[str, List[BucketKey]]:
+        """Return the keys of the buckets whose period has ended."""
+        return {
+            period: [
+                key for key in buckets if key[1] + STATISTICS_PERIODS[period][1] <= now
+            ]
+            for period, buckets in self._buckets.items()
+        }
+
+    def add_to_session(self, session, finished: Dict[str, List[BucketKey]]) -> None:
+        """Add or merge the rows of finished buckets in the session."""
+        for period, keys in finished.items():
+            if not keys:
+                continue
+            model = STATISTICS_PERIODS[period][0]
+            buckets = self._buckets[period]
+            existing = {
+                (row.entity_id, process_timestamp(row.start)): row
+                for row in session.query(model)
+                .filter(model.entity_id.in_({key[0] for key in keys}))
+                .filter(model.start >= min(key[1] for key in keys))
+                .filter(model.start <= max(key[1] for key in keys))
+            }
+            for key in keys:
+                row = existing.get(key)
+                if row is None:
+                    session.add(buckets[key].to_row(model, *key))
+                else:
+                    buckets[key].merge_into(row)
+
+    def discard(self, finished: Dict[str, List[BucketKey]]) -> None:
+        """Forget buckets once their rows have been committed."""
+        for period, keys in finished.items():
+            buckets = self._buckets[period]
+            for key in keys:
+                buckets.pop(key, None)
+
+
+def statistics_during_period(
+    hass,
+    start_time: datetime,
+    end_time: Optional[datetime] = None,
+    entity_ids: Optional[List[str]] = None,
+    period: str = PERIOD_HOUR,
+) -> Dict[str, List[dict]]:
+    """Return the statistics of the periods that start between start_time and end_time."""
+    timer_start = time.perf_counter()
+    model = STATISTICS_PERIODS[period][0]
+
+    with session_scope(hass=hass) as session:
+        query = session.query(model).filter(model.start >= start_time)
+        if end_time is not None:
+            query = query.filter(model.start < end_time)
+        if entity_ids is not None:
+            query = query.filter(model.entity_id.in_(entity_ids))
+        query = query.order_by(model.entity_id, model.start)
+        rows = execute(query, to_native=True)
+
+    result: Dict[str, List[dict]] = defaultdict(list)
+    for row in rows:
+        result[row["entity_id"]].append(row)
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("statistics_during_period took %fs", elapsed)
+
+    return result
@@ -6,14 +6,20 @@ import voluptuous as vol
 from homeassistant.auth.permissions.const import CAT_ENTITIES, POLICY_READ
 from homeassistant.components.websocket_api.const import ERR_NOT_FOUND
 from homeassistant.const import EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL
-from homeassistant.core import DOMAIN as HASS_DOMAIN, callback
+from homeassistant.core import DOMAIN as HASS_DOMAIN, callback, split_entity_id
 from homeassistant.exceptions import (
     HomeAssistantError,
     ServiceNotFound,
     TemplateError,
     Unauthorized,
 )
-from homeassistant.helpers import config_validation as cv, entity, template
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry,
+    entity,
+    entity_registry,
+    template,
+)
 from homeassistant.helpers.event import TrackTemplate, async_track_template_result
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.loader import IntegrationNotFound, async_get_integration
@@ -27,12 +33,14 @@ from . import const, decorators, messages
 def async_register_commands(hass, async_reg):
     """Register commands."""
     async_reg(hass, handle_subscribe_events)
+    async_reg(hass, handle_subscribe_entities)
     async_reg(hass, handle_unsubscribe_events)
     async_reg(hass, handle_call_service)
     async_reg(hass, handle_get_states)
     async_reg(hass, handle_get_services)
     async_reg(hass, handle_get_config)
     async_reg(hass, handle_ping)
+    async_reg(hass, handle_supported_features)
     async_reg(hass, handle_render_template)
     async_reg(hass, handle_manifest_list)
     async_reg(hass, handle_manifest_get)
@@ -93,6 +101,97 @@ def handle_subscribe_events(hass, connection, msg):
     connection.send_message(messages.result_message(msg["id"]))
 
 
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "subscribe_entities",
+        vol.Optional("entity_ids"): cv.entity_ids,
+        vol.Optional("domains"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("area_ids"): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+def handle_subscribe_entities(hass, connection, msg):
+    """Handle subscribe entities command.
+
+    Sends the matching states once and then only what changed. Without
+    a filter all entities match. Areas are resolved to their entities
+    when subscribing.
+    """
+    entity_ids = set(msg.get("entity_ids", []))
+    domains = set(msg.get("domains", []))
+    if "area_ids" in msg:
+        entity_ids.update(_async_area_entity_ids(hass, msg["area_ids"]))
+    match_all = not ({"entity_ids", "domains", "area_ids"} & msg.keys())
+    entity_perm = connection.user.permissions.check_entity
+
+    @callback
+    def async_matches(entity_id):
+        """Return if an entity is part of the subscription."""
+        return (
+            match_all
+            or entity_id in entity_ids
+            or split_entity_id(entity_id)[0] in domains
+        )
+
+    @callback
+    def async_event_matches(event):
+        """Return if a state_changed event is part of the subscription."""
+        return async_matches(event.data["entity_id"])
+
+    @callback
+    def forward_entity_changes(event):
+        """Forward the changes of a state to the websocket."""
+        entity_id = event.data["entity_id"]
+        if not entity_perm(entity_id, POLICY_READ):
+            return
+
+        connection.send_message(messages.cached_state_diff_message(msg["id"], event))
+
+    if match_all or domains:
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED,
+            forward_entity_changes,
+            event_filter=async_event_matches,
+        )
+    else:
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen_keyed(
+            EVENT_STATE_CHANGED, entity_ids, forward_entity_changes
+        )
+
+    connection.send_message(messages.result_message(msg["id"]))
+    connection.send_message(
+        messages.event_message(
+            msg["id"],
+            {
+                messages.ENTITY_EVENT_ADD: {
+                    state.entity_id: messages.compressed_state_dict(state)
+                    for state in hass.states.async_all()
+                    if async_matches(state.entity_id)
+                    and entity_perm(state.entity_id, POLICY_READ)
+                }
+            },
+        )
+    )
+
+
+@callback
+def _async_area_entity_ids(hass, area_ids):
+    """Return the entities in areas, directly or through their device."""
+    ent_reg = entity_registry.async_get(hass)
+    dev_reg = device_registry.async_get(hass)
+    entity_ids = set()
+    for area_id in area_ids:
+        for entry in entity_registry.async_entries_for_area(ent_reg, area_id):
+            entity_ids.add(entry.entity_id)
+        for device in device_registry.async_entries_for_area(dev_reg, area_id):
+            for entry in entity_registry.async_entries_for_device(
+                ent_reg, device.id, include_disabled_entities=True
+            ):
+                if entry.area_id is None:
+                    entity_ids.add(entry.entity_id)
+    return entity_ids
+
+
 @callback
 @decorators.websocket_command(
     {
@@ -192,7 +291,14 @@ def handle_get_states(hass, connection, msg):
             if entity_perm(state.entity_id, "read")
         ]
 
-    connection.send_message(messages.result_message(msg["id"], states))
+    try:
+        states_json = ", ".join(state.as_json() for state in states)
+    except (ValueError, TypeError):
+        # Serialize again to log where the bad data is
+        connection.send_message(messages.result_message(msg["id"], states))
+        return
+
+    connection.send_message(messages.result_message_json(msg["id"], f"[{states_json}]"))
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -247,6 +353,19 @@ def handle_ping(hass, connection, msg):
     connection.send_message(pong_message(msg["id"]))
 
 
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "supported_features",
+        vol.Required("features"): {str: int},
+    }
+)
+def handle_supported_features(hass, connection, msg):
+    """Handle setting the features the client supports."""
+    connection.supported_features = msg["features"]
+    connection.send_result(msg["id"])
+
+
 @decorators.websocket_command(
     {
         vol.Required("type"): "render_template",
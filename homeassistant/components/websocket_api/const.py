@@ -33,6 +33,9 @@ ERR_TEMPLATE_ERROR = "template_error"
 
 TYPE_RESULT = "result"
 
+# Features a client can enable with the supported_features command
+FEATURE_COALESCE_MESSAGES = "coalesce_messages"
+
 # Define the possible errors that occur when connections are cancelled.
 # Originally, this was just asyncio.CancelledError, but issue #9546 showed
 # that futures.CancelledErrors can also occur in some situations.
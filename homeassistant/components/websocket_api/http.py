@@ -16,6 +16,7 @@ from .auth import AuthPhase, auth_required_message
 from .const import (
     CANCELLATION_ERRORS,
     DATA_CONNECTIONS,
+    FEATURE_COALESCE_MESSAGES,
     MAX_PENDING_MSG,
     PENDING_MSG_PEAK,
     PENDING_MSG_PEAK_TIME,
@@ -63,22 +64,58 @@ class WebSocketHandler:
         self._writer_task = None
         self._logger = WebSocketAdapter(_WS_LOGGER, {"connid": id(self)})
         self._peak_checker_unsub = None
+        self._connection = None
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.messages_coalesced = 0
 
     async def _writer(self):
-        """Write outgoing messages."""
+        """Write outgoing messages.
+
+        Clients that enable the coalesce_messages feature get all pending
+        messages in one frame with a JSON array.
+        """
+        to_write = self._to_write
         # Exceptions if Socket disconnected or cancelled by connection handler
         with suppress(RuntimeError, ConnectionResetError, *CANCELLATION_ERRORS):
             while not self.wsock.closed:
-                message = await self._to_write.get()
+                message = await to_write.get()
                 if message is None:
                     break
 
-                self._logger.debug("Sending %s", message)
+                closing = False
+                pending = [message]
+                if (
+                    self._connection is not None
+                    and self._connection.supported_features.get(
+                        FEATURE_COALESCE_MESSAGES
+                    )
+                ):
+                    while not to_write.empty():
+                        message = to_write.get_nowait()
+                        if message is None:
+                            closing = True
+                            break
+                        pending.append(message)
+
+                for index, message in enumerate(pending):
+                    self._logger.debug("Sending %s", message)
+                    if not isinstance(message, str):
+                        pending[index] = message_to_json(message)
+
+                if len(pending) == 1:
+                    frame = pending[0]
+                else:
+                    frame = f"[{','.join(pending)}]"
+                    self.messages_coalesced += len(pending)
 
-                if not isinstance(message, str):
-                    message = message_to_json(message)
+                self.frames_sent += 1
+                # JSON is encoded as ascii so characters are bytes
+                self.bytes_sent += len(frame)
+                await self.wsock.send_str(frame)
 
-                await self.wsock.send_str(message)
+                if closing:
+                    break
 
         # Clean up the peaker checker when we shut down the writer
         if self._peak_checker_unsub:
@@ -184,7 +221,7 @@ class WebSocketHandler:
                 raise Disconnect from err
 
             self._logger.debug("Received %s", msg_data)
-            connection = await auth.async_handle(msg_data)
+            connection = self._connection = await auth.async_handle(msg_data)
             self.hass.data[DATA_CONNECTIONS] = (
                 self.hass.data.get(DATA_CONNECTIONS, 0) + 1
             )
@@ -236,6 +273,12 @@ class WebSocketHandler:
                 self._writer_task.cancel()
 
             finally:
+                self._logger.debug(
+                    "Sent %s frames with %s bytes, %s messages coalesced",
+                    self.frames_sent,
+                    self.bytes_sent,
+                    self.messages_coalesced,
+                )
                 if disconnect_warn is None:
                     self._logger.debug("Disconnected")
                 else:
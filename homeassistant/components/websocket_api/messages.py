@@ -6,7 +6,7 @@ from typing import Any, Dict
 
 import voluptuous as vol
 
-from homeassistant.core import Event
+from homeassistant.core import Event, State
 from homeassistant.helpers import config_validation as cv
 from homeassistant.util.json import (
     find_paths_unserializable_data,
@@ -31,12 +31,31 @@ BASE_COMMAND_MESSAGE_SCHEMA = vol.Schema({vol.Required("id"): cv.positive_int})
 IDEN_TEMPLATE = "__IDEN__"
 IDEN_JSON_TEMPLATE = '"__IDEN__"'
 
+# Keys of the compressed states of entity subscriptions
+COMPRESSED_STATE_STATE = "s"
+COMPRESSED_STATE_ATTRIBUTES = "a"
+COMPRESSED_STATE_CONTEXT = "c"
+COMPRESSED_STATE_LAST_CHANGED = "lc"
+COMPRESSED_STATE_LAST_UPDATED = "lu"
+
+ENTITY_EVENT_ADD = "a"
+ENTITY_EVENT_CHANGE = "c"
+ENTITY_EVENT_REMOVE = "r"
+
 
 def result_message(iden: int, result: Any = None) -> Dict:
     """Return a success result message."""
     return {"id": iden, "type": const.TYPE_RESULT, "success": True, "result": result}
 
 
+def result_message_json(iden: int, result_json: str) -> str:
+    """Return a success result message with an already serialized result."""
+    return (
+        f'{{"id": {iden}, "type": "{const.TYPE_RESULT}", '
+        f'"success": true, "result": {result_json}}}'
+    )
+
+
 def error_message(iden: int, code: str, message: str) -> Dict:
     """Return an error result message."""
     return {
@@ -74,6 +93,87 @@ def _cached_event_message(event: Event) -> str:
     return message_to_json(event_message(IDEN_TEMPLATE, event))
 
 
+def cached_state_diff_message(iden: int, event: Event) -> str:
+    """Return an entity subscription message for a state_changed event.
+
+    Serialize to json once per event, like cached_event_message.
+    """
+    return _cached_state_diff_message(event).replace(IDEN_JSON_TEMPLATE, str(iden), 1)
+
+
+@lru_cache(maxsize=128)
+def _cached_state_diff_message(event: Event) -> str:
+    """Cache and serialize the state diff of the event to json."""
+    return message_to_json(
+        event_message(IDEN_TEMPLATE, _state_diff_event(event))  # type: ignore
+    )
+
+
+def _state_diff_event(event: Event) -> Dict:
+    """Convert a state_changed event to an entity subscription event."""
+    entity_id = event.data["entity_id"]
+    new_state = event.data["new_state"]
+    if new_state is None:
+        return {ENTITY_EVENT_REMOVE: [entity_id]}
+    old_state = event.data["old_state"]
+    if old_state is None:
+        return {ENTITY_EVENT_ADD: {entity_id: compressed_state_dict(new_state)}}
+    return {
+        ENTITY_EVENT_CHANGE: {entity_id: compressed_state_diff(old_state, new_state)}
+    }
+
+
+def compressed_state_dict(state: State) -> Dict[str, Any]:
+    """Return a compact dict of a state.
+
+    Times are timestamps and last_updated is left out when it is
+    the same as last_changed.
+    """
+    compressed = {
+        COMPRESSED_STATE_STATE: state.state,
+        COMPRESSED_STATE_ATTRIBUTES: dict(state.attributes),
+        COMPRESSED_STATE_CONTEXT: state.context.id,
+        COMPRESSED_STATE_LAST_CHANGED: state.last_changed.timestamp(),
+    }
+    if state.last_updated != state.last_changed:
+        compressed[COMPRESSED_STATE_LAST_UPDATED] = state.last_updated.timestamp()
+    return compressed
+
+
+def compressed_state_diff(old_state: State, new_state: State) -> Dict[str, Any]:
+    """Return what changed between two states of an entity.
+
+    Changed fields and attributes are under "+" and removed
+    attribute keys under "-".
+    """
+    additions: Dict[str, Any] = {}
+    diff: Dict[str, Any] = {"+": additions}
+    if old_state.state != new_state.state:
+        additions[COMPRESSED_STATE_STATE] = new_state.state
+    if old_state.last_changed != new_state.last_changed:
+        additions[COMPRESSED_STATE_LAST_CHANGED] = new_state.last_changed.timestamp()
+    elif old_state.last_updated != new_state.last_updated:
+        additions[COMPRESSED_STATE_LAST_UPDATED] = new_state.last_updated.timestamp()
+    if old_state.context.id != new_state.context.id:
+        additions[COMPRESSED_STATE_CONTEXT] = new_state.context.id
+
+    old_attributes = old_state.attributes
+    new_attributes = new_state.attributes
+    if old_attributes is new_attributes:
+        return diff
+    changed_attributes = {
+        key: value
+        for key, value in new_attributes.items()
+        if key not in old_attributes or old_attributes[key] != value
+    }
+    if changed_attributes:
+        additions[COMPRESSED_STATE_ATTRIBUTES] = changed_attributes
+    removed_attributes = [key for key in old_attributes if key not in new_attributes]
+    if removed_attributes:
+        diff["-"] = {COMPRESSED_STATE_ATTRIBUTES: removed_attributes}
+    return diff
+
+
 def message_to_json(message: Any) -> str:
     """Serialize a websocket message to json."""
     try:
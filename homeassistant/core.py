@@ -8,10 +8,12 @@ import asyncio
 import datetime
 import enum
 import functools
+import json
 import logging
 import os
 import pathlib
 import re
+import sys
 import threading
 from time import monotonic
 from types import MappingProxyType
@@ -41,6 +43,7 @@ import yarl
 from homeassistant import block_async_io, loader, util
 from homeassistant.const import (
     ATTR_DOMAIN,
+    ATTR_ENTITY_ID,
     ATTR_FRIENDLY_NAME,
     ATTR_NOW,
     ATTR_SECONDS,
@@ -70,6 +73,7 @@ from homeassistant.exceptions import (
     ServiceNotFound,
     Unauthorized,
 )
+from homeassistant.helpers.json import JSONEncoder
 from homeassistant.util import location
 from homeassistant.util.async_ import (
     fire_coroutine_threadsafe,
@@ -97,6 +101,8 @@ CALLABLE_T = TypeVar("CALLABLE_T", bound=Callable)
 CALLBACK_TYPE = Callable[[], None]
 # pylint: enable=invalid-name
 
+_FilterableJob = Tuple["HassJob", Optional[Callable]]
+
 CORE_STORAGE_KEY = "core.config"
 CORE_STORAGE_VERSION = 1
 
@@ -116,6 +122,12 @@ SOURCE_YAML = "yaml"
 # How long to wait until things that run on startup have to finish.
 TIMEOUT_EVENT_START = 15
 
+# Maximum number of distinct attribute mappings shared between states
+MAX_INTERNED_ATTRIBUTES = 4096
+
+# Attribute value types that are safe to use in an interning key
+_INTERNABLE_TYPES = (str, int, float, bool, type(None))
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -225,6 +237,7 @@ class HomeAssistant:
         self._pending_tasks: list = []
         self._track_task = True
         self.bus = EventBus(self)
+        self.ticker = Ticker(self)
         self.services = ServiceRegistry(self)
         self.states = StateMachine(self.bus, self.loop)
         self.config = Config(self)
@@ -662,7 +675,16 @@ class EventBus:
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
-        self._listeners: Dict[str, List[Tuple[HassJob, Optional[Callable]]]] = {}
+        self._listeners: Dict[str, List[_FilterableJob]] = {}
+        # Listeners routed by the entity_id in the event data
+        self._keyed_listeners: Dict[str, Dict[str, List[HassJob]]] = {}
+        self._keyed_listener_count: Dict[str, int] = {}
+        # Listeners that receive a list of events per fire
+        self._batch_listeners: Dict[str, List[HassJob]] = {}
+        # MATCH_ALL + event_type listeners, rebuilt when subscriptions change
+        self._merged_listeners: Dict[
+            str, Tuple[Tuple[_FilterableJob, ...], Tuple[HassJob, ...]]
+        ] = {}
         self._hass = hass
 
     @callback
@@ -671,13 +693,26 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(self._listeners[key]) for key in self._listeners}
+        listeners = {key: len(self._listeners[key]) for key in self._listeners}
+        for event_type, count in self._keyed_listener_count.items():
+            listeners[event_type] = listeners.get(event_type, 0) + count
+        for event_type, batch_jobs in self._batch_listeners.items():
+            listeners[event_type] = listeners.get(event_type, 0) + len(batch_jobs)
+        return listeners
 
     @property
     def listeners(self) -> Dict[str, int]:
         """Return dictionary with events and the number of listeners."""
         return run_callback_threadsafe(self._hass.loop, self.async_listeners).result()
 
+    @callback
+    def async_has_listeners(self, event_type: str) -> bool:
+        """Return if there are listeners for an event_type, not MATCH_ALL.
+
+        This method must be run in the event loop.
+        """
+        return event_type in self._listeners
+
     def fire(
         self,
         event_type: str,
@@ -703,21 +738,68 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        listeners = self._listeners.get(event_type, [])
-
-        # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
-        match_all_listeners = self._listeners.get(MATCH_ALL)
-        if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
-            listeners = match_all_listeners + listeners
+        merged = self._merged_listeners.get(event_type)
+        if merged is None:
+            merged = self._async_merge_listeners(event_type)
+        listeners, batch_jobs = merged
 
         event = Event(event_type, event_data, origin, time_fired, context)
 
         if event_type != EVENT_TIME_CHANGED:
             _LOGGER.debug("Bus:Handling %s", event)
 
-        if not listeners:
+        self._async_dispatch(event, listeners)
+
+        for batch_job in batch_jobs:
+            self._hass.async_add_hass_job(batch_job, [event])
+
+    @callback
+    def async_fire_batch(
+        self,
+        event_type: str,
+        events_data: Iterable[Dict[str, Any]],
+        origin: EventOrigin = EventOrigin.local,
+        context: Optional[Context] = None,
+        time_fired: Optional[datetime.datetime] = None,
+    ) -> None:
+        """Fire a batch of events of the same type.
+
+        Listeners registered with async_listen are called once per event.
+        Listeners registered with async_listen_batch are called once with
+        the list of all events in the batch.
+
+        This method must be run in the event loop.
+        """
+        merged = self._merged_listeners.get(event_type)
+        if merged is None:
+            merged = self._async_merge_listeners(event_type)
+        listeners, batch_jobs = merged
+
+        events = [
+            Event(event_type, event_data, origin, time_fired, context)
+            for event_data in events_data
+        ]
+
+        if not events:
             return
 
+        for event in events:
+            if event_type != EVENT_TIME_CHANGED:
+                _LOGGER.debug("Bus:Handling %s", event)
+
+            self._async_dispatch(event, listeners)
+
+        for batch_job in batch_jobs:
+            self._hass.async_add_hass_job(batch_job, events)
+
+    @callback
+    def _async_dispatch(
+        self, event: "Event", listeners: Tuple[_FilterableJob, ...]
+    ) -> None:
+        """Schedule the listeners and keyed listeners for an event.
+
+        This method must be run in the event loop.
+        """
         for job, event_filter in listeners:
             if event_filter is not None:
                 try:
@@ -728,6 +810,51 @@ class EventBus:
                     continue
             self._hass.async_add_hass_job(job, event)
 
+        keyed_listeners = self._keyed_listeners.get(event.event_type)
+        if keyed_listeners is None:
+            return
+
+        key = event.data.get(ATTR_ENTITY_ID)
+        if not isinstance(key, str) or key not in keyed_listeners:
+            return
+
+        for keyed_job in keyed_listeners[key]:
+            self._hass.async_add_hass_job(keyed_job, event)
+
+    @callback
+    def _async_merge_listeners(
+        self, event_type: str
+    ) -> Tuple[Tuple[_FilterableJob, ...], Tuple[HassJob, ...]]:
+        """Build and cache the listeners to call for an event_type.
+
+        This method must be run in the event loop.
+        """
+        listeners = self._listeners.get(event_type, [])
+        batch_jobs = self._batch_listeners.get(event_type, [])
+
+        # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
+        if event_type != EVENT_HOMEASSISTANT_CLOSE:
+            match_all_listeners = self._listeners.get(MATCH_ALL)
+            if match_all_listeners is not None:
+                listeners = match_all_listeners + listeners
+            match_all_batch_jobs = self._batch_listeners.get(MATCH_ALL)
+            if match_all_batch_jobs is not None:
+                batch_jobs = match_all_batch_jobs + batch_jobs
+
+        merged = self._merged_listeners[event_type] = (
+            tuple(listeners),
+            tuple(batch_jobs),
+        )
+        return merged
+
+    @callback
+    def _async_invalidate_merged_listeners(self, event_type: str) -> None:
+        """Drop cached listener tuples affected by a subscription change."""
+        if event_type == MATCH_ALL:
+            self._merged_listeners.clear()
+        else:
+            self._merged_listeners.pop(event_type, None)
+
     def listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
@@ -770,9 +897,12 @@ class EventBus:
 
     @callback
     def _async_listen_filterable_job(
-        self, event_type: str, filterable_job: Tuple[HassJob, Optional[Callable]]
+        self, event_type: str, filterable_job: _FilterableJob
     ) -> CALLBACK_TYPE:
         self._listeners.setdefault(event_type, []).append(filterable_job)
+        self._async_invalidate_merged_listeners(event_type)
+        if event_type == EVENT_TIME_CHANGED:
+            self._hass.ticker.async_update()
 
         def remove_listener() -> None:
             """Remove the listener."""
@@ -780,6 +910,98 @@ class EventBus:
 
         return remove_listener
 
+    @callback
+    def async_listen_keyed(
+        self,
+        event_type: str,
+        keys: Union[str, Iterable[str]],
+        listener: Callable,
+    ) -> CALLBACK_TYPE:
+        """Listen for events of a specific type indexed by entity_id.
+
+        The listener is only called for events whose ``entity_id`` in the
+        event data matches one of the keys. Routing is a dict lookup, so
+        unlike event_filter the cost does not grow with the number of
+        keyed listeners.
+
+        This method must be run in the event loop.
+        """
+        if event_type == MATCH_ALL:
+            raise HomeAssistantError("Keyed listeners require a specific event type")
+
+        keys = (keys,) if isinstance(keys, str) else tuple(keys)
+        job = HassJob(listener)
+        keyed_listeners = self._keyed_listeners.setdefault(event_type, {})
+
+        for key in keys:
+            keyed_listeners.setdefault(key, []).append(job)
+
+        self._keyed_listener_count[event_type] = (
+            self._keyed_listener_count.get(event_type, 0) + 1
+        )
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the keyed listener."""
+            self._async_remove_keyed_listener(event_type, keys, job)
+
+        return remove_listener
+
+    @callback
+    def _async_remove_keyed_listener(
+        self, event_type: str, keys: Tuple[str, ...], job: HassJob
+    ) -> None:
+        """Remove a keyed listener of a specific event_type.
+
+        This method must be run in the event loop.
+        """
+        try:
+            keyed_listeners = self._keyed_listeners[event_type]
+
+            for key in keys:
+                keyed_listeners[key].remove(job)
+                if not keyed_listeners[key]:
+                    del keyed_listeners[key]
+        except (KeyError, ValueError):
+            _LOGGER.exception("Unable to remove unknown keyed listener %s", job)
+            return
+
+        self._keyed_listener_count[event_type] -= 1
+        if not self._keyed_listener_count[event_type]:
+            del self._keyed_listener_count[event_type]
+            del self._keyed_listeners[event_type]
+
+    @callback
+    def async_listen_batch(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
+        """Listen for lists of events of a specific type.
+
+        The listener is called with a list of events: all events of a batch
+        fired with async_fire_batch, or a single event fired with async_fire.
+
+        To listen to all events specify the constant ``MATCH_ALL``
+        as event_type.
+
+        This method must be run in the event loop.
+        """
+        job = HassJob(listener)
+        self._batch_listeners.setdefault(event_type, []).append(job)
+        self._async_invalidate_merged_listeners(event_type)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the batch listener."""
+            try:
+                self._batch_listeners[event_type].remove(job)
+            except (KeyError, ValueError):
+                _LOGGER.exception("Unable to remove unknown batch listener %s", job)
+                return
+
+            if not self._batch_listeners[event_type]:
+                del self._batch_listeners[event_type]
+            self._async_invalidate_merged_listeners(event_type)
+
+        return remove_listener
+
     def listen_once(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
         """Listen once for event of a specific type.
 
@@ -809,7 +1031,7 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        filterable_job: Optional[Tuple[HassJob, Optional[Callable]]] = None
+        filterable_job: Optional[_FilterableJob] = None
 
         @callback
         def _onetime_listener(event: Event) -> None:
@@ -833,7 +1055,7 @@ class EventBus:
 
     @callback
     def _async_remove_listener(
-        self, event_type: str, filterable_job: Tuple[HassJob, Optional[Callable]]
+        self, event_type: str, filterable_job: _FilterableJob
     ) -> None:
         """Remove a listener of a specific event_type.
 
@@ -841,10 +1063,13 @@ class EventBus:
         """
         try:
             self._listeners[event_type].remove(filterable_job)
+            self._async_invalidate_merged_listeners(event_type)
 
             # delete event_type list if empty
             if not self._listeners[event_type]:
                 self._listeners.pop(event_type)
+                if event_type == EVENT_TIME_CHANGED:
+                    self._hass.ticker.async_update()
         except (KeyError, ValueError):
             # KeyError is key event_type listener did not exist
             # ValueError if listener did not exist within event_type
@@ -876,6 +1101,7 @@ class State:
         "domain",
         "object_id",
         "_as_dict",
+        "_as_json",
     ]
 
     def __init__(
@@ -905,12 +1131,16 @@ class State:
 
         self.entity_id = entity_id.lower()
         self.state = state
-        self.attributes = MappingProxyType(attributes or {})
+        if isinstance(attributes, MappingProxyType):
+            self.attributes = attributes
+        else:
+            self.attributes = MappingProxyType(attributes or {})
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
         self.domain, self.object_id = split_entity_id(self.entity_id)
         self._as_dict: Optional[Dict[str, Collection[Any]]] = None
+        self._as_json: Optional[str] = None
 
     @property
     def name(self) -> str:
@@ -943,6 +1173,18 @@ class State:
             }
         return self._as_dict
 
+    def as_json(self) -> str:
+        """Return the JSON of the dict representation of the State.
+
+        Async friendly.
+
+        Serialized once as states are replaced instead of changed.
+        Raises TypeError or ValueError if the attributes can not be serialized.
+        """
+        if self._as_json is None:
+            self._as_json = json.dumps(self.as_dict(), cls=JSONEncoder, allow_nan=False)
+        return self._as_json
+
     @classmethod
     def from_dict(cls, json_dict: Dict) -> Any:
         """Initialize a state from a dict.
@@ -1004,6 +1246,12 @@ class StateMachine:
         """Initialize state machine."""
         self._states: Dict[str, State] = {}
         self._reservations: Set[str] = set()
+        self._interned_attributes: Dict[Tuple, MappingProxyType] = {}
+        self._attribute_stats = {
+            "reused": 0,
+            "interned": 0,
+            "interned_bytes_saved": 0,
+        }
         self._bus = bus
         self._loop = loop
 
@@ -1189,6 +1437,74 @@ class StateMachine:
         If you just update the attributes and not the state, last changed will
         not be affected.
 
+        This method must be run in the event loop.
+        """
+        event_data = self._async_set_state(
+            entity_id, new_state, attributes, force_update, context, None
+        )
+        if event_data is None:
+            return
+
+        state = event_data["new_state"]
+        self._bus.async_fire(
+            EVENT_STATE_CHANGED,
+            event_data,
+            EventOrigin.local,
+            state.context,
+            time_fired=state.last_updated,
+        )
+
+    @callback
+    def async_set_many(
+        self,
+        states: Iterable[Tuple[str, str, Optional[Mapping[str, Any]]]],
+        force_update: bool = False,
+        context: Optional[Context] = None,
+    ) -> None:
+        """Set the states of multiple entities in one pass.
+
+        states is an iterable of (entity_id, new_state, attributes) tuples.
+        All updates share the same context and timestamp and the resulting
+        state_changed events are fired as a single batch.
+
+        This method must be run in the event loop.
+        """
+        if context is None:
+            context = Context()
+
+        now = dt_util.utcnow()
+        events_data = []
+
+        for entity_id, new_state, attributes in states:
+            event_data = self._async_set_state(
+                entity_id, new_state, attributes, force_update, context, now
+            )
+            if event_data is not None:
+                events_data.append(event_data)
+
+        if events_data:
+            self._bus.async_fire_batch(
+                EVENT_STATE_CHANGED,
+                events_data,
+                EventOrigin.local,
+                context,
+                time_fired=now,
+            )
+
+    @callback
+    def _async_set_state(
+        self,
+        entity_id: str,
+        new_state: str,
+        attributes: Optional[Mapping[str, Any]],
+        force_update: bool,
+        context: Optional[Context],
+        now: Optional[datetime.datetime],
+    ) -> Optional[Dict[str, Any]]:
+        """Store the state of an entity and return the state_changed event data.
+
+        Returns None if neither the state nor the attributes changed.
+
         This method must be run in the event loop.
         """
         entity_id = entity_id.lower()
@@ -1201,16 +1517,25 @@ class StateMachine:
             last_changed = None
         else:
             same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == MappingProxyType(attributes)
+            same_attr = attributes is old_state.attributes or (
+                old_state.attributes == MappingProxyType(attributes)
+            )
             last_changed = old_state.last_changed if same_state else None
 
         if same_state and same_attr:
-            return
+            return None
+
+        if same_attr:
+            attributes = old_state.attributes
+            self._attribute_stats["reused"] += 1
+        else:
+            attributes = self._async_intern_attributes(attributes)
 
         if context is None:
             context = Context()
 
-        now = dt_util.utcnow()
+        if now is None:
+            now = dt_util.utcnow()
 
         state = State(
             entity_id,
@@ -1222,13 +1547,59 @@ class StateMachine:
             old_state is None,
         )
         self._states[entity_id] = state
-        self._bus.async_fire(
-            EVENT_STATE_CHANGED,
-            {"entity_id": entity_id, "old_state": old_state, "new_state": state},
-            EventOrigin.local,
-            context,
-            time_fired=now,
-        )
+        return {"entity_id": entity_id, "old_state": old_state, "new_state": state}
+
+    @callback
+    def _async_intern_attributes(
+        self, attributes: Mapping[str, Any]
+    ) -> Mapping[str, Any]:
+        """Return a shared frozen mapping for attributes seen before.
+
+        Only mappings with simple values are interned, other attributes
+        are returned as is.
+
+        This method must be run in the event loop.
+        """
+        if isinstance(attributes, MappingProxyType):
+            return attributes
+
+        key = []
+        for item in attributes.items():
+            value_type = type(item[1])
+            if value_type not in _INTERNABLE_TYPES:
+                return attributes
+            # The type is part of the key as 1 == 1.0 == True
+            key.append((item[0], value_type, item[1]))
+
+        interned_key = tuple(key)
+        interned = self._interned_attributes.pop(interned_key, None)
+
+        if interned is None:
+            interned = MappingProxyType(dict(attributes))
+            if len(self._interned_attributes) >= MAX_INTERNED_ATTRIBUTES:
+                del self._interned_attributes[next(iter(self._interned_attributes))]
+        else:
+            self._attribute_stats["interned"] += 1
+            self._attribute_stats["interned_bytes_saved"] += sys.getsizeof(attributes)
+
+        # Re-insert to keep the most recently used mappings
+        self._interned_attributes[interned_key] = interned
+        return interned
+
+    @callback
+    def async_attribute_stats(self) -> Dict[str, int]:
+        """Return diagnostic counters for shared state attributes.
+
+        reused counts states that kept the mapping of the previous state,
+        interned counts states that got a mapping shared with another state
+        and interned_bytes_saved approximates the memory that saved.
+
+        This method must be run in the event loop.
+        """
+        return {
+            **self._attribute_stats,
+            "interned_mappings": len(self._interned_attributes),
+        }
 
 
 class Service:
@@ -1749,47 +2120,136 @@ class Config:
         await store.async_save(data)
 
 
-def _async_create_timer(hass: HomeAssistant) -> None:
-    """Create a timer that will start on HOMEASSISTANT_START."""
-    handle = None
-    timer_context = Context()
+class Ticker:
+    """Call tick listeners every second, next to the event bus.
+
+    Ticks are not events, a tick calls the listeners that registered for
+    ticks with the time. EVENT_TIME_CHANGED is still fired while there are
+    listeners for it on the event bus, listeners for MATCH_ALL do not keep
+    it alive. The loop timer only runs while there are listeners.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the ticker."""
+        self._hass = hass
+        self._jobs: List[HassJob] = []
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._context = Context()
+        self._running = False
+
+    @property
+    def active(self) -> bool:
+        """Return if the loop timer waits for the next second."""
+        return self._handle is not None
+
+    @callback
+    def async_listen(
+        self, listener: Callable[[datetime.datetime], Any]
+    ) -> CALLBACK_TYPE:
+        """Call a listener with the time of every tick.
+
+        This method must be run in the event loop.
+        """
+        job = HassJob(listener)
+        self._jobs.append(job)
+        self.async_update()
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the listener."""
+            try:
+                self._jobs.remove(job)
+            except ValueError:
+                _LOGGER.exception("Unable to remove unknown tick listener %s", job)
+                return
+            self.async_update()
+
+        return remove_listener
+
+    @callback
+    def async_start(self) -> None:
+        """Start ticking when there are listeners."""
+        self._running = True
+        self.async_update()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop ticking."""
+        self._running = False
+        self.async_update()
+
+    @callback
+    def async_update(self) -> None:
+        """Start or stop the loop timer after listeners changed."""
+        needed = self._running and (
+            bool(self._jobs) or self._hass.bus.async_has_listeners(EVENT_TIME_CHANGED)
+        )
+        if needed and self._handle is None:
+            self._schedule_tick(dt_util.utcnow())
+        elif not needed and self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
 
-    def schedule_tick(now: datetime.datetime) -> None:
-        """Schedule a timer tick when the next second rolls around."""
-        nonlocal handle
+    @callback
+    def async_tick(self, now: datetime.datetime) -> None:
+        """Call the tick listeners with the time.
 
+        This method must be run in the event loop.
+        """
+        for job in list(self._jobs):
+            try:
+                self._hass.async_run_hass_job(job, now)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error in tick listener %s", job)
+
+    def _schedule_tick(self, now: datetime.datetime) -> None:
+        """Schedule a tick when the next second rolls around."""
         slp_seconds = 1 - (now.microsecond / 10 ** 6)
         target = monotonic() + slp_seconds
-        handle = hass.loop.call_later(slp_seconds, fire_time_event, target)
+        self._handle = self._hass.loop.call_later(
+            slp_seconds, self._async_timer_fired, target
+        )
 
     @callback
-    def fire_time_event(target: float) -> None:
-        """Fire next time event."""
+    def _async_timer_fired(self, target: float) -> None:
+        """Tick and fire the time events for listeners on the event bus."""
+        self._handle = None
         now = dt_util.utcnow()
+        bus = self._hass.bus
 
-        hass.bus.async_fire(
-            EVENT_TIME_CHANGED, {ATTR_NOW: now}, time_fired=now, context=timer_context
-        )
+        if bus.async_has_listeners(EVENT_TIME_CHANGED):
+            bus.async_fire(
+                EVENT_TIME_CHANGED,
+                {ATTR_NOW: now},
+                time_fired=now,
+                context=self._context,
+            )
+        self.async_tick(now)
 
         # If we are more than a second late, a tick was missed
         late = monotonic() - target
         if late > 1:
-            hass.bus.async_fire(
+            bus.async_fire(
                 EVENT_TIMER_OUT_OF_SYNC,
                 {ATTR_SECONDS: late},
                 time_fired=now,
-                context=timer_context,
+                context=self._context,
             )
 
-        schedule_tick(now)
+        # Listeners can have restarted the timer or removed themselves
+        if self._handle is None:
+            self.async_update()
+
+
+def _async_create_timer(hass: HomeAssistant) -> None:
+    """Start the ticker and stop it on EVENT_HOMEASSISTANT_STOP."""
 
     @callback
     def stop_timer(_: Event) -> None:
         """Stop the timer."""
-        if handle is not None:
-            handle.cancel()
+        hass.ticker.async_stop()
 
     hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, stop_timer)
 
     _LOGGER.info("Timer:starting")
-    schedule_tick(dt_util.utcnow())
+    hass.ticker.async_start()
@@ -34,6 +34,8 @@ CONNECTION_NETWORK_MAC = "mac"
 CONNECTION_UPNP = "upnp"
 CONNECTION_ZIGBEE = "zigbee"
 
+IDX_AREA = "area_id"
+IDX_CONFIG_ENTRY = "config_entry_id"
 IDX_CONNECTIONS = "connections"
 IDX_IDENTIFIERS = "identifiers"
 REGISTERED_DEVICE = "registered"
@@ -136,6 +138,8 @@ class DeviceRegistry:
     devices: Dict[str, DeviceEntry]
     deleted_devices: Dict[str, DeletedDeviceEntry]
     _devices_index: Dict[str, Dict[str, Dict[Tuple[str, str], str]]]
+    # Ids of registered devices by area id and config entry id
+    _secondary_index: Dict[Tuple[str, str], Dict[str, None]]
 
     def __init__(self, hass: HomeAssistantType) -> None:
         """Initialize the device registry."""
@@ -148,6 +152,17 @@ class DeviceRegistry:
         """Get device."""
         return self.devices.get(device_id)
 
+    @callback
+    def async_entries_by(self, index: str, key: str) -> List[DeviceEntry]:
+        """Return the devices in an area or of a config entry.
+
+        The index is IDX_AREA or IDX_CONFIG_ENTRY.
+        """
+        device_ids = self._secondary_index.get((index, key))
+        if device_ids is None:
+            return []
+        return [self.devices[device_id] for device_id in device_ids]
+
     @callback
     def async_get_device(
         self,
@@ -201,6 +216,7 @@ class DeviceRegistry:
         else:
             devices_index = self._devices_index[REGISTERED_DEVICE]
             self.devices[device.id] = device
+            self._add_to_secondary_index(device.id, _secondary_index_keys(device))
 
         _add_device_to_index(devices_index, device)
 
@@ -212,6 +228,7 @@ class DeviceRegistry:
         else:
             devices_index = self._devices_index[REGISTERED_DEVICE]
             self.devices.pop(device.id)
+            self._remove_from_secondary_index(device.id, _secondary_index_keys(device))
 
         _remove_device_from_index(devices_index, device)
 
@@ -223,18 +240,43 @@ class DeviceRegistry:
         _remove_device_from_index(devices_index, old_device)
         _add_device_to_index(devices_index, new_device)
 
+        # Devices keep their place in the index for keys that did not change
+        old_keys = _secondary_index_keys(old_device)
+        new_keys = _secondary_index_keys(new_device)
+        self._remove_from_secondary_index(old_device.id, old_keys - new_keys)
+        self._add_to_secondary_index(new_device.id, new_keys - old_keys)
+
+    def _add_to_secondary_index(
+        self, device_id: str, keys: Set[Tuple[str, str]]
+    ) -> None:
+        """Add a device id to the secondary index."""
+        for key in keys:
+            self._secondary_index.setdefault(key, {})[device_id] = None
+
+    def _remove_from_secondary_index(
+        self, device_id: str, keys: Set[Tuple[str, str]]
+    ) -> None:
+        """Remove a device id from the secondary index."""
+        for key in keys:
+            device_ids = self._secondary_index[key]
+            del device_ids[device_id]
+            if not device_ids:
+                del self._secondary_index[key]
+
     def _clear_index(self) -> None:
         """Clear the index."""
         self._devices_index = {
             REGISTERED_DEVICE: {IDX_IDENTIFIERS: {}, IDX_CONNECTIONS: {}},
             DELETED_DEVICE: {IDX_IDENTIFIERS: {}, IDX_CONNECTIONS: {}},
         }
+        self._secondary_index = {}
 
     def _rebuild_index(self) -> None:
         """Create the index after loading devices."""
         self._clear_index()
         for device in self.devices.values():
             _add_device_to_index(self._devices_index[REGISTERED_DEVICE], device)
+            self._add_to_secondary_index(device.id, _secondary_index_keys(device))
         for deleted_device in self.deleted_devices.values():
             _add_device_to_index(self._devices_index[DELETED_DEVICE], deleted_device)
 
@@ -568,7 +610,7 @@ class DeviceRegistry:
     def async_clear_config_entry(self, config_entry_id: str) -> None:
         """Clear config entry from registry entries."""
         now_time = time.time()
-        for device in list(self.devices.values()):
+        for device in self.async_entries_by(IDX_CONFIG_ENTRY, config_entry_id):
             self._async_update_device(device.id, remove_config_entry_id=config_entry_id)
         for deleted_device in list(self.deleted_devices.values()):
             config_entries = deleted_device.config_entries
@@ -609,9 +651,8 @@ class DeviceRegistry:
     @callback
     def async_clear_area_id(self, area_id: str) -> None:
         """Clear area id from registry entries."""
-        for dev_id, device in self.devices.items():
-            if area_id == device.area_id:
-                self._async_update_device(dev_id, area_id=None)
+        for device in self.async_entries_by(IDX_AREA, area_id):
+            self._async_update_device(device.id, area_id=None)
 
 
 @callback
@@ -639,7 +680,7 @@ async def async_get_registry(hass: HomeAssistantType) -> DeviceRegistry:
 @callback
 def async_entries_for_area(registry: DeviceRegistry, area_id: str) -> List[DeviceEntry]:
     """Return entries that match an area."""
-    return [device for device in registry.devices.values() if device.area_id == area_id]
+    return registry.async_entries_by(IDX_AREA, area_id)
 
 
 @callback
@@ -647,11 +688,7 @@ def async_entries_for_config_entry(
     registry: DeviceRegistry, config_entry_id: str
 ) -> List[DeviceEntry]:
     """Return entries that match a config entry."""
-    return [
-        device
-        for device in registry.devices.values()
-        if config_entry_id in device.config_entries
-    ]
+    return registry.async_entries_by(IDX_CONFIG_ENTRY, config_entry_id)
 
 
 @callback
@@ -777,6 +814,14 @@ def _normalize_connections(connections: Set[Tuple[str, str]]) -> Set[Tuple[str,
     }
 
 
+def _secondary_index_keys(device: DeviceEntry) -> Set[Tuple[str, str]]:
+    """Return the keys of a device in the secondary index."""
+    keys = {(IDX_CONFIG_ENTRY, entry_id) for entry_id in device.config_entries}
+    if device.area_id is not None:
+        keys.add((IDX_AREA, device.area_id))
+    return keys
+
+
 def _add_device_to_index(
     devices_index: Dict[str, Dict[Tuple[str, str], str]],
     device: Union[DeviceEntry, DeletedDeviceEntry],
@@ -3,10 +3,19 @@ from __future__ import annotations
 
 import asyncio
 from contextvars import ContextVar
-from datetime import datetime, timedelta
+from datetime import timedelta
 from logging import Logger
 from types import ModuleType
-from typing import TYPE_CHECKING, Callable, Coroutine, Dict, Iterable, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+)
 
 from homeassistant import config_entries
 from homeassistant.const import ATTR_RESTORED, DEVICE_DEFAULT_NAME
@@ -23,7 +32,8 @@ from homeassistant.helpers.typing import HomeAssistantType
 from homeassistant.util.async_ import run_callback_threadsafe
 
 from .entity_registry import DISABLED_INTEGRATION
-from .event import async_call_later, async_track_time_interval
+from .event import async_call_later
+from .polling import PollScheduler
 
 if TYPE_CHECKING:
     from .entity import Entity
@@ -66,11 +76,10 @@ class EntityPlatform:
         self._tasks: List[asyncio.Future] = []
         # Stop tracking tasks after setup is completed
         self._setup_complete = False
-        # Method to cancel the state change listener
-        self._async_unsub_polling: Optional[CALLBACK_TYPE] = None
+        # Polls the entities, created when the first entity is added
+        self._poll_scheduler: Optional[PollScheduler] = None
         # Method to cancel the retry of setup
         self._async_cancel_retry_setup: Optional[CALLBACK_TYPE] = None
-        self._process_updates: Optional[asyncio.Lock] = None
 
         self.parallel_updates: Optional[asyncio.Semaphore] = None
 
@@ -330,16 +339,20 @@ class EntityPlatform:
             )
             raise
 
-        if self._async_unsub_polling is not None or not any(
-            entity.should_poll for entity in self.entities.values()
-        ):
+        if not self.entities:
             return
 
-        self._async_unsub_polling = async_track_time_interval(
-            self.hass,
-            self._update_entity_states,
-            self.scan_interval,
-        )
+        # Entities that do not poll now are scheduled as well, the scheduler
+        # checks should_poll on every poll as it can change later on
+        if self._poll_scheduler is None:
+            self._poll_scheduler = PollScheduler(
+                self.hass,
+                self.logger,
+                f"{self.platform_name} {self.domain}",
+                self.scan_interval,
+            )
+        for entity in self.entities.values():
+            self._poll_scheduler.async_add(entity)
 
     async def _async_add_entity(  # type: ignore[no-untyped-def]
         self, entity, update_before_add, entity_registry, device_registry
@@ -504,7 +517,14 @@ class EntityPlatform:
             # has a chance to finish.
             self.hass.states.async_reserve(entity.entity_id)
 
-        entity.async_on_remove(lambda: self.entities.pop(entity_id))
+        @callback
+        def remove_entity_cb() -> None:
+            """Forget the entity when it is removed."""
+            self.entities.pop(entity_id)
+            if self._poll_scheduler is not None:
+                self._poll_scheduler.async_remove(entity_id)
+
+        entity.async_on_remove(remove_entity_cb)
 
         await entity.add_to_platform_finish()
 
@@ -524,9 +544,9 @@ class EntityPlatform:
 
         await asyncio.gather(*tasks)
 
-        if self._async_unsub_polling is not None:
-            self._async_unsub_polling()
-            self._async_unsub_polling = None
+        if self._poll_scheduler is not None:
+            self._poll_scheduler.async_stop()
+            self._poll_scheduler = None
         self._setup_complete = False
 
     async def async_destroy(self) -> None:
@@ -541,13 +561,6 @@ class EntityPlatform:
         """Remove entity id from platform."""
         await self.entities[entity_id].async_remove()
 
-        # Clean up polling job if no longer needed
-        if self._async_unsub_polling is not None and not any(
-            entity.should_poll for entity in self.entities.values()
-        ):
-            self._async_unsub_polling()
-            self._async_unsub_polling = None
-
     async def async_extract_from_service(
         self, service_call: ServiceCall, expand_group: bool = True
     ) -> List[Entity]:
@@ -591,34 +604,15 @@ class EntityPlatform:
             self.platform_name, name, handle_service, schema
         )
 
-    async def _update_entity_states(self, now: datetime) -> None:
-        """Update the states of all the polling entities.
+    @property
+    def poll_stats(self) -> Optional[Dict[str, Any]]:
+        """Return the poll counters and latency histogram of the platform.
 
-        To protect from flooding the executor, we will update async entities
-        in parallel and other entities sequential.
-
-        This method must be run in the event loop.
+        Returns None if no entities were added to the platform.
         """
-        if self._process_updates is None:
-            self._process_updates = asyncio.Lock()
-        if self._process_updates.locked():
-            self.logger.warning(
-                "Updating %s %s took longer than the scheduled update interval %s",
-                self.platform_name,
-                self.domain,
-                self.scan_interval,
-            )
-            return
-
-        async with self._process_updates:
-            tasks = []
-            for entity in self.entities.values():
-                if not entity.should_poll:
-                    continue
-                tasks.append(entity.async_update_ha_state(True))
-
-            if tasks:
-                await asyncio.gather(*tasks)
+        if self._poll_scheduler is None:
+            return None
+        return self._poll_scheduler.stats
 
 
 current_platform: ContextVar[Optional[EntityPlatform]] = ContextVar(
@@ -72,6 +72,9 @@ ENTITY_DESCRIBING_ATTRIBUTES = {
     "unit_of_measurement",
 }
 
+# Attributes of the entries that are indexed to look up entries by
+SECONDARY_INDEXES = ("device_id", "area_id", "config_entry_id")
+
 
 @attr.s(slots=True, frozen=True)
 class RegistryEntry:
@@ -153,6 +156,10 @@ class EntityRegistry:
         self.hass = hass
         self.entities: Dict[str, RegistryEntry]
         self._index: Dict[Tuple[str, str, str], str] = {}
+        # Entity ids by device_id, area_id and config_entry_id
+        self._secondary_index: Dict[str, Dict[str, Dict[str, None]]] = {
+            attr_name: {} for attr_name in SECONDARY_INDEXES
+        }
         self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
         self.hass.bus.async_listen(
             EVENT_DEVICE_REGISTRY_UPDATED, self.async_device_modified
@@ -174,6 +181,14 @@ class EntityRegistry:
                 lookup[entity.device_id][domain_device_class] = entity.entity_id
         return lookup
 
+    @callback
+    def async_entries_by(self, attr_name: str, key: str) -> List[RegistryEntry]:
+        """Return the entries with a device_id, area_id or config_entry_id."""
+        entity_ids = self._secondary_index[attr_name].get(key)
+        if entity_ids is None:
+            return []
+        return [self.entities[entity_id] for entity_id in entity_ids]
+
     @callback
     def async_is_registered(self, entity_id: str) -> bool:
         """Check if an entity_id is currently registered."""
@@ -454,8 +469,8 @@ class EntityRegistry:
         if not new_values:
             return old
 
-        self._remove_index(old)
         new = attr.evolve(old, **new_values)
+        self._remove_index(old, new)
         self._register_entry(new)
 
         self.async_schedule_save()
@@ -546,19 +561,14 @@ class EntityRegistry:
     @callback
     def async_clear_config_entry(self, config_entry: str) -> None:
         """Clear config entry from registry entries."""
-        for entity_id in [
-            entity_id
-            for entity_id, entry in self.entities.items()
-            if config_entry == entry.config_entry_id
-        ]:
-            self.async_remove(entity_id)
+        for entry in self.async_entries_by("config_entry_id", config_entry):
+            self.async_remove(entry.entity_id)
 
     @callback
     def async_clear_area_id(self, area_id: str) -> None:
         """Clear area id from registry entries."""
-        for entity_id, entry in self.entities.items():
-            if area_id == entry.area_id:
-                self._async_update_entity(entity_id, area_id=None)
+        for entry in self.async_entries_by("area_id", area_id):
+            self._async_update_entity(entry.entity_id, area_id=None)
 
     def _register_entry(self, entry: RegistryEntry) -> None:
         self.entities[entry.entity_id] = entry
@@ -566,16 +576,38 @@ class EntityRegistry:
 
     def _add_index(self, entry: RegistryEntry) -> None:
         self._index[(entry.domain, entry.platform, entry.unique_id)] = entry.entity_id
+        for attr_name, index in self._secondary_index.items():
+            key = getattr(entry, attr_name)
+            if key is not None:
+                index.setdefault(key, {})[entry.entity_id] = None
 
     def _unregister_entry(self, entry: RegistryEntry) -> None:
         self._remove_index(entry)
         del self.entities[entry.entity_id]
 
-    def _remove_index(self, entry: RegistryEntry) -> None:
+    def _remove_index(
+        self, entry: RegistryEntry, replacement: Optional[RegistryEntry] = None
+    ) -> None:
         del self._index[(entry.domain, entry.platform, entry.unique_id)]
+        for attr_name, index in self._secondary_index.items():
+            key = getattr(entry, attr_name)
+            if key is None:
+                continue
+            # Entries keep their place in the index if the key did not change
+            if (
+                replacement is not None
+                and replacement.entity_id == entry.entity_id
+                and getattr(replacement, attr_name) == key
+            ):
+                continue
+            entity_ids = index[key]
+            del entity_ids[entry.entity_id]
+            if not entity_ids:
+                del index[key]
 
     def _rebuild_index(self) -> None:
         self._index = {}
+        self._secondary_index = {attr_name: {} for attr_name in SECONDARY_INDEXES}
         for entry in self.entities.values():
             self._add_index(entry)
 
@@ -609,9 +641,8 @@ def async_entries_for_device(
     """Return entries that match a device."""
     return [
         entry
-        for entry in registry.entities.values()
-        if entry.device_id == device_id
-        and (not entry.disabled_by or include_disabled_entities)
+        for entry in registry.async_entries_by("device_id", device_id)
+        if not entry.disabled_by or include_disabled_entities
     ]
 
 
@@ -620,7 +651,7 @@ def async_entries_for_area(
     registry: EntityRegistry, area_id: str
 ) -> List[RegistryEntry]:
     """Return entries that match an area."""
-    return [entry for entry in registry.entities.values() if entry.area_id == area_id]
+    return registry.async_entries_by("area_id", area_id)
 
 
 @callback
@@ -628,11 +659,7 @@ def async_entries_for_config_entry(
     registry: EntityRegistry, config_entry_id: str
 ) -> List[RegistryEntry]:
     """Return entries that match a config entry."""
-    return [
-        entry
-        for entry in registry.entities.values()
-        if entry.config_entry_id == config_entry_id
-    ]
+    return registry.async_entries_by("config_entry_id", config_entry_id)
 
 
 @callback
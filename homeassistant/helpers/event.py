@@ -1,11 +1,9 @@
 """Helpers for listening to events."""
-import asyncio
 import copy
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import functools as ft
 import logging
-import time
 from typing import (
     Any,
     Awaitable,
@@ -23,10 +21,8 @@ import attr
 
 from homeassistant.const import (
     ATTR_ENTITY_ID,
-    ATTR_NOW,
     EVENT_CORE_CONFIG_UPDATE,
     EVENT_STATE_CHANGED,
-    EVENT_TIME_CHANGED,
     MATCH_ALL,
     SUN_EVENT_SUNRISE,
     SUN_EVENT_SUNSET,
@@ -45,6 +41,7 @@ from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.ratelimit import KeyedRateLimit
 from homeassistant.helpers.sun import get_astral_event_next
 from homeassistant.helpers.template import RenderInfo, Template, result_as_boolean
+from homeassistant.helpers.timer_wheel import TimerWheel
 from homeassistant.helpers.typing import TemplateVarsType
 from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util
@@ -62,6 +59,10 @@ TRACK_STATE_REMOVED_DOMAIN_LISTENER = "track_state_removed_domain_listener"
 TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS = "track_entity_registry_updated_callbacks"
 TRACK_ENTITY_REGISTRY_UPDATED_LISTENER = "track_entity_registry_updated_listener"
 
+TRACK_TEMPLATE_INDEX = "track_template_index"
+
+TIMER_WHEEL = "timer_wheel"
+
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
@@ -775,6 +776,143 @@ def async_track_template(
 track_template = threaded_listener_factory(async_track_template)
 
 
+class _TemplateDependencyIndex:
+    """Route state changes to the template trackers that depend on them.
+
+    One state_changed listener is shared by all trackers. The trackers
+    are indexed by the entity_ids and domains their templates read, and
+    all trackers affected by an event are refreshed in one pass.
+
+    A template that only read specific values of the state that changed,
+    for example the state or a single attribute, is not re-rendered when
+    none of those values changed. The renders and skipped renders are
+    counted in the stats.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the index."""
+        self.hass = hass
+        # Dicts are used as ordered sets to refresh in registration order
+        self._entities: Dict[str, Dict["_TrackTemplateResultInfo", None]] = {}
+        self._domains: Dict[str, Dict["_TrackTemplateResultInfo", None]] = {}
+        self._all: Dict["_TrackTemplateResultInfo", None] = {}
+        self._track_states: Dict["_TrackTemplateResultInfo", TrackStates] = {}
+        self._unsub: Optional[CALLBACK_TYPE] = None
+        self.renders = 0
+        self.skipped = 0
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return the render counters and the rate of skipped renders."""
+        total = self.renders + self.skipped
+        return {
+            "trackers": len(self._track_states),
+            "renders": self.renders,
+            "skipped": self.skipped,
+            "skip_rate": self.skipped / total if total else 0.0,
+        }
+
+    @callback
+    def async_update(
+        self, tracker: "_TrackTemplateResultInfo", track_states: TrackStates
+    ) -> None:
+        """Index a tracker by what its templates depend on."""
+        last_track_states = self._track_states.get(tracker)
+        if last_track_states == track_states:
+            return
+        if last_track_states is not None:
+            self._async_unindex(tracker, last_track_states)
+        self._track_states[tracker] = track_states
+
+        if track_states.all_states:
+            self._all[tracker] = None
+        else:
+            for entity_id in track_states.entities:
+                self._entities.setdefault(entity_id, {})[tracker] = None
+            for domain in track_states.domains:
+                self._domains.setdefault(domain, {})[tracker] = None
+
+        if self._unsub is None:
+            self._unsub = self.hass.bus.async_listen_batch(
+                EVENT_STATE_CHANGED, self._async_state_changed
+            )
+
+    @callback
+    def async_remove(self, tracker: "_TrackTemplateResultInfo") -> None:
+        """Remove a tracker from the index."""
+        track_states = self._track_states.pop(tracker, None)
+        if track_states is not None:
+            self._async_unindex(tracker, track_states)
+        if not self._track_states and self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_unindex(
+        self, tracker: "_TrackTemplateResultInfo", track_states: TrackStates
+    ) -> None:
+        """Remove the index entries of a tracker."""
+        self._all.pop(tracker, None)
+        for index, keys in (
+            (self._entities, track_states.entities),
+            (self._domains, track_states.domains),
+        ):
+            for key in keys:
+                trackers = index.get(key)
+                if trackers is None:
+                    continue
+                trackers.pop(tracker, None)
+                if not trackers:
+                    del index[key]
+
+    @callback
+    def _async_state_changed(self, events: List[Event]) -> None:
+        """Refresh the trackers that depend on a batch of state changes.
+
+        Templates are rendered with the current states, so a tracker is
+        refreshed once per entity_id with the last event of that entity.
+        """
+        last_events: Dict[str, Event] = {}
+        for event in events:
+            entity_id = event.data[ATTR_ENTITY_ID]
+            last_events.pop(entity_id, None)
+            last_events[entity_id] = event
+
+        tracker_events: Dict["_TrackTemplateResultInfo", List[Event]] = {}
+        for entity_id, event in last_events.items():
+            trackers = dict(self._all)
+            if entity_id in self._entities:
+                trackers.update(self._entities[entity_id])
+            domain = split_entity_id(entity_id)[0]
+            if domain in self._domains:
+                trackers.update(self._domains[domain])
+            for tracker in trackers:
+                tracker_events.setdefault(tracker, []).append(event)
+
+        track_states = self._track_states
+        for tracker, tracker_batch in tracker_events.items():
+            for event in tracker_batch:
+                # A refresh can remove other trackers
+                if tracker not in track_states:
+                    break
+                try:
+                    tracker.async_refresh_from_event(event)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "Error while processing template update for %s",
+                        event.data[ATTR_ENTITY_ID],
+                    )
+
+
+@callback
+def _async_template_index(hass: HomeAssistant) -> _TemplateDependencyIndex:
+    """Return the template dependency index of hass."""
+    index: Optional[_TemplateDependencyIndex] = hass.data.get(TRACK_TEMPLATE_INDEX)
+    if index is None:
+        index = hass.data[TRACK_TEMPLATE_INDEX] = _TemplateDependencyIndex(hass)
+    return index
+
+
 class _TrackTemplateResultInfo:
     """Handle removal / refresh of tracker."""
 
@@ -796,7 +934,8 @@ class _TrackTemplateResultInfo:
 
         self._rate_limit = KeyedRateLimit(hass)
         self._info: Dict[Template, RenderInfo] = {}
-        self._track_state_changes: Optional[_TrackStateChangeFiltered] = None
+        self._index = _async_template_index(hass)
+        self._last_track_states: Optional[TrackStates] = None
         self._time_listeners: Dict[Template, Callable] = {}
 
     def async_setup(self, raise_on_template_error: bool) -> None:
@@ -815,8 +954,8 @@ class _TrackTemplateResultInfo:
                     exc_info=info.exception,
                 )
 
-        self._track_state_changes = async_track_state_change_filtered(
-            self.hass, _render_infos_to_track_states(self._info.values()), self._refresh
+        self._async_update_track_states(
+            _render_infos_to_track_states(self._info.values())
         )
         self._update_time_listeners()
         _LOGGER.debug(
@@ -828,12 +967,24 @@ class _TrackTemplateResultInfo:
     @property
     def listeners(self) -> Dict:
         """State changes that will cause a re-render."""
-        assert self._track_state_changes
+        track_states = self._last_track_states
+        assert track_states
         return {
-            **self._track_state_changes.listeners,
+            _ALL_LISTENER: track_states.all_states,
+            _ENTITIES_LISTENER: track_states.entities,
+            _DOMAINS_LISTENER: track_states.domains,
             "time": bool(self._time_listeners),
         }
 
+    @callback
+    def _async_update_track_states(self, track_states: TrackStates) -> None:
+        """Update what the templates depend on in the index."""
+        self._last_track_states = track_states
+        if track_states.all_states or track_states.entities or track_states.domains:
+            self._index.async_update(self, track_states)
+        else:
+            self._index.async_remove(self)
+
     @callback
     def _setup_time_listener(self, template: Template, has_time: bool) -> None:
         if not has_time:
@@ -867,8 +1018,7 @@ class _TrackTemplateResultInfo:
     @callback
     def async_remove(self) -> None:
         """Cancel the listener."""
-        assert self._track_state_changes
-        self._track_state_changes.async_remove()
+        self._index.async_remove(self)
         self._rate_limit.async_remove()
         for template in list(self._time_listeners):
             self._time_listeners.pop(template)()
@@ -878,14 +1028,23 @@ class _TrackTemplateResultInfo:
         """Force recalculate the template."""
         self._refresh(None)
 
+    @callback
+    def async_refresh_from_event(self, event: Event) -> None:
+        """Recalculate the templates that depend on a state_changed event."""
+        self._refresh(event)
+
     def _render_template_if_ready(
         self,
         track_template_: TrackTemplate,
         now: datetime,
         event: Optional[Event],
+        rendered: Set[Template],
     ) -> Union[bool, TrackTemplateResult]:
         """Re-render the template if conditions match.
 
+        rendered holds the templates already rendered in this refresh,
+        an equal template shares their render info and is rendered again.
+
         Returns False if the template was not be re-rendered
 
         Returns True if the template re-rendered and did not
@@ -902,6 +1061,15 @@ class _TrackTemplateResultInfo:
             if not _event_triggers_rerender(event, info):
                 return False
 
+            # Compare with the current state as a rate limited event
+            # can be replayed after newer changes
+            entity_id = event.data[ATTR_ENTITY_ID]
+            if template not in rendered and not info.state_read_changed(
+                entity_id, self.hass.states.get(entity_id)
+            ):
+                self._index.skipped += 1
+                return False
+
             had_timer = self._rate_limit.async_has_timer(template)
 
             if self._rate_limit.async_schedule_action(
@@ -922,6 +1090,7 @@ class _TrackTemplateResultInfo:
             )
 
         self._rate_limit.async_triggered(template, now)
+        self._index.renders += 1
         self._info[template] = info = template.async_render_to_info(
             track_template_.variables
         )
@@ -964,13 +1133,17 @@ class _TrackTemplateResultInfo:
         updates = []
         info_changed = False
         now = event.time_fired if not replayed and event else dt_util.utcnow()
+        rendered: Set[Template] = set()
 
         for track_template_ in track_templates or self._track_templates:
-            update = self._render_template_if_ready(track_template_, now, event)
+            update = self._render_template_if_ready(
+                track_template_, now, event, rendered
+            )
             if not update:
                 continue
 
             template = track_template_.template
+            rendered.add(template)
             self._setup_time_listener(template, self._info[template].has_time)
 
             info_changed = True
@@ -979,8 +1152,7 @@ class _TrackTemplateResultInfo:
                 updates.append(update)
 
         if info_changed:
-            assert self._track_state_changes
-            self._track_state_changes.async_update_listeners(
+            self._async_update_track_states(
                 _render_infos_to_track_states(
                     [
                         _suppress_domain_all_in_render_info(self._info[template])
@@ -1176,39 +1348,16 @@ def async_track_point_in_utc_time(
     # having to figure out how to call the action every time its called.
     job = action if isinstance(action, HassJob) else HassJob(action)
 
-    cancel_callback: Optional[asyncio.TimerHandle] = None
-
     @callback
     def run_action() -> None:
         """Call the action."""
-        nonlocal cancel_callback
-
-        now = time_tracker_utcnow()
-
-        # Depending on the available clock support (including timer hardware
-        # and the OS kernel) it can happen that we fire a little bit too early
-        # as measured by utcnow(). That is bad when callbacks have assumptions
-        # about the current time. Thus, we rearm the timer for the remaining
-        # time.
-        delta = (utc_point_in_time - now).total_seconds()
-        if delta > 0:
-            _LOGGER.debug("Called %f seconds too early, rearming", delta)
-
-            cancel_callback = hass.loop.call_later(delta, run_action)
-            return
-
         hass.async_run_hass_job(job, utc_point_in_time)
 
-    delta = utc_point_in_time.timestamp() - time.time()
-    cancel_callback = hass.loop.call_later(delta, run_action)
-
-    @callback
-    def unsub_point_in_time_listener() -> None:
-        """Cancel the call_later."""
-        assert cancel_callback is not None
-        cancel_callback.cancel()
-
-    return unsub_point_in_time_listener
+    return (
+        _async_timer_wheel(hass)
+        .async_schedule(utc_point_in_time.timestamp(), run_action)
+        .cancel
+    )
 
 
 track_point_in_utc_time = threaded_listener_factory(async_track_point_in_utc_time)
@@ -1360,6 +1509,28 @@ track_sunset = threaded_listener_factory(async_track_sunset)
 time_tracker_utcnow = dt_util.utcnow
 
 
+def _time_tracker_timestamp() -> float:
+    """Return the time that decides if a timer is due."""
+    return time_tracker_utcnow().timestamp()
+
+
+@callback
+def _async_timer_wheel(hass: HomeAssistant) -> TimerWheel:
+    """Return the timer wheel of the time trackers."""
+    wheel: Optional[TimerWheel] = hass.data.get(TIMER_WHEEL)
+    if wheel is None:
+        wheel = hass.data[TIMER_WHEEL] = TimerWheel(hass.loop, _time_tracker_timestamp)
+    return wheel
+
+
+@callback
+@bind_hass
+def async_pending_timer_count(hass: HomeAssistant) -> int:
+    """Return the number of time tracker timers that have not fired yet."""
+    wheel: Optional[TimerWheel] = hass.data.get(TIMER_WHEEL)
+    return 0 if wheel is None else wheel.pending
+
+
 @callback
 @bind_hass
 def async_track_utc_time_change(
@@ -1377,11 +1548,11 @@ def async_track_utc_time_change(
     if all(val is None for val in (hour, minute, second)):
 
         @callback
-        def time_change_listener(event: Event) -> None:
-            """Fire every time event that comes in."""
-            hass.async_run_hass_job(job, event.data[ATTR_NOW])
+        def time_change_listener(now: datetime) -> None:
+            """Fire every tick that comes in."""
+            hass.async_run_hass_job(job, now)
 
-        return hass.bus.async_listen(EVENT_TIME_CHANGED, time_change_listener)
+        return hass.ticker.async_listen(time_change_listener)
 
     matching_seconds = dt_util.parse_time_expression(second, 0, 59)
     matching_minutes = dt_util.parse_time_expression(minute, 0, 59)
@@ -0,0 +1,192 @@
+"""Schedule the polls of the entities of a platform."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from functools import partial
+from logging import Logger
+import math
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+import homeassistant.util.dt as dt_util
+
+from .event import async_track_point_in_utc_time
+
+if TYPE_CHECKING:
+    from .entity import Entity
+
+DATA_POLL_SEQUENCE = "poll_sequence"
+
+# Phases of consecutive entities are this fraction of the interval apart,
+# which spreads any number of entities evenly over the interval
+_PHASE_STEP = (math.sqrt(5) - 1) / 2
+
+# Polls without a state change or with an error before the interval doubles
+UNCHANGED_POLLS_BEFORE_BACKOFF = 10
+MAX_BACKOFF_FACTOR = 4
+
+# Upper bounds in seconds of the poll latency histogram buckets
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)
+
+
+class _PolledEntity:
+    """The poll schedule of an entity."""
+
+    __slots__ = ["entity", "factor", "unchanged", "polling", "unsub"]
+
+    def __init__(self, entity: Entity) -> None:
+        """Initialize the schedule."""
+        self.entity = entity
+        self.factor = 1
+        self.unchanged = 0
+        self.polling = False
+        self.unsub: Optional[CALLBACK_TYPE] = None
+
+
+class PollScheduler:
+    """Poll each entity of a platform at its own time.
+
+    The first poll of an entity is at a phase of the scan interval that
+    differs for every entity polled in Home Assistant, later polls follow
+    one interval after the previous one. This keeps entities and platforms
+    that were added at the same time from polling at the same time.
+
+    Entities whose state did not change in UNCHANGED_POLLS_BEFORE_BACKOFF
+    polls in a row, because it stayed the same or the update failed, are
+    polled at twice the interval up to MAX_BACKOFF_FACTOR times the
+    interval. The first change goes back to the scan interval.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        logger: Logger,
+        name: str,
+        scan_interval: timedelta,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.logger = logger
+        self.name = name
+        self.scan_interval = scan_interval
+        self.polls = 0
+        self.unchanged = 0
+        self.skipped = 0
+        self._entities: Dict[str, _PolledEntity] = {}
+        self._latency_counts: List[int] = [0] * len(LATENCY_BUCKETS)
+        self._latency_sum = 0.0
+
+    def __len__(self) -> int:
+        """Return the number of scheduled entities."""
+        return len(self._entities)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return the poll counters and the poll latency histogram.
+
+        The histogram maps the upper bound of each bucket in seconds to the
+        number of polls that took longer than the previous bound.
+        """
+        return {
+            "entities": len(self._entities),
+            "backed_off": sum(
+                1 for polled in self._entities.values() if polled.factor > 1
+            ),
+            "polls": self.polls,
+            "unchanged": self.unchanged,
+            "skipped": self.skipped,
+            "latency": dict(zip(LATENCY_BUCKETS, self._latency_counts)),
+            "latency_sum": self._latency_sum,
+        }
+
+    @callback
+    def async_add(self, entity: Entity) -> None:
+        """Start polling an entity."""
+        assert entity.entity_id is not None
+        if entity.entity_id in self._entities:
+            return
+        sequence = self.hass.data.get(DATA_POLL_SEQUENCE, 0)
+        self.hass.data[DATA_POLL_SEQUENCE] = sequence + 1
+        # The first entity keeps a full interval before its first poll
+        phase = 1 - (sequence * _PHASE_STEP) % 1
+
+        polled = self._entities[entity.entity_id] = _PolledEntity(entity)
+        self._async_schedule(polled, dt_util.utcnow() + self.scan_interval * phase)
+
+    @callback
+    def async_remove(self, entity_id: str) -> None:
+        """Stop polling an entity."""
+        polled = self._entities.pop(entity_id, None)
+        if polled is not None and polled.unsub is not None:
+            polled.unsub()
+            polled.unsub = None
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop polling all entities."""
+        for entity_id in list(self._entities):
+            self.async_remove(entity_id)
+
+    @callback
+    def _async_schedule(self, polled: _PolledEntity, point_in_time: datetime) -> None:
+        """Schedule the next poll of an entity."""
+        polled.unsub = async_track_point_in_utc_time(
+            self.hass, partial(self._async_poll_due, polled), point_in_time
+        )
+
+    @callback
+    def _async_poll_due(self, polled: _PolledEntity, _now: datetime) -> None:
+        """Poll an entity unless its last poll is still running."""
+        interval = self.scan_interval * polled.factor
+        self._async_schedule(polled, dt_util.utcnow() + interval)
+
+        if not polled.entity.should_poll:
+            return
+        if polled.polling:
+            self.skipped += 1
+            self.logger.warning(
+                "Updating %s %s took longer than the scheduled update interval %s",
+                self.name,
+                polled.entity.entity_id,
+                interval,
+            )
+            return
+        self.hass.async_create_task(self._async_poll(polled))
+
+    async def _async_poll(self, polled: _PolledEntity) -> None:
+        """Update an entity and adapt its interval to the result."""
+        entity = polled.entity
+        assert entity.entity_id is not None
+        old_state = self.hass.states.get(entity.entity_id)
+        polled.polling = True
+        start = time.monotonic()
+        try:
+            await entity.async_update_ha_state(True)
+        finally:
+            polled.polling = False
+            latency = time.monotonic() - start
+            self._latency_counts[bisect_left(LATENCY_BUCKETS, latency)] += 1
+            self._latency_sum += latency
+            self.polls += 1
+
+        if self.hass.states.get(entity.entity_id) is not old_state:
+            polled.unchanged = 0
+            polled.factor = 1
+            return
+
+        self.unchanged += 1
+        polled.unchanged += 1
+        if (
+            polled.unchanged >= UNCHANGED_POLLS_BEFORE_BACKOFF
+            and polled.factor < MAX_BACKOFF_FACTOR
+        ):
+            polled.unchanged = 0
+            polled.factor *= 2
+            self.logger.debug(
+                "Polling %s every %s, its state did not change in %s polls",
+                entity.entity_id,
+                self.scan_interval * polled.factor,
+                UNCHANGED_POLLS_BEFORE_BACKOFF,
+            )
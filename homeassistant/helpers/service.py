@@ -370,22 +370,21 @@ async def async_extract_referenced_entity_ids(
                 selected.missing_areas.add(area_id)
                 continue
 
-        # Find entities tied to an area
-        for entity_entry in ent_reg.entities.values():
-            if entity_entry.area_id in area_lookup:
+        for area_id in area_lookup:
+            # Find entities tied to an area
+            for entity_entry in ent_reg.async_entries_by("area_id", area_id):
                 selected.indirectly_referenced.add(entity_entry.entity_id)
 
-        # Find devices for this area
-        for device_entry in dev_reg.devices.values():
-            if device_entry.area_id in area_lookup:
+            # Find devices for this area
+            for device_entry in dev_reg.async_entries_by(
+                device_registry.IDX_AREA, area_id
+            ):
                 picked_devices.add(device_entry.id)
 
-    if not picked_devices:
-        return selected
-
-    for entity_entry in ent_reg.entities.values():
-        if not entity_entry.area_id and entity_entry.device_id in picked_devices:
-            selected.indirectly_referenced.add(entity_entry.entity_id)
+    for device_id in picked_devices:
+        for entity_entry in ent_reg.async_entries_by("device_id", device_id):
+            if not entity_entry.area_id:
+                selected.indirectly_referenced.add(entity_entry.entity_id)
 
     return selected
 
@@ -4,16 +4,22 @@ from __future__ import annotations
 from ast import literal_eval
 import asyncio
 import base64
+from collections import OrderedDict
 import collections.abc
 from datetime import datetime, timedelta
-from functools import partial, wraps
+from functools import lru_cache, partial, wraps
+import hashlib
+from importlib.util import MAGIC_NUMBER
 import json
 import logging
+import marshal
 import math
+import operator
 from operator import attrgetter
 import random
 import re
-from typing import Any, Dict, Generator, Iterable, Optional, Type, Union, cast
+from types import CodeType
+from typing import Any, Callable, Dict, Generator, Iterable, Optional, Type, Union, cast
 from urllib.parse import urlencode as urllib_urlencode
 import weakref
 
@@ -25,6 +31,7 @@ import voluptuous as vol
 
 from homeassistant.const import (
     ATTR_ENTITY_ID,
+    ATTR_FRIENDLY_NAME,
     ATTR_LATITUDE,
     ATTR_LONGITUDE,
     ATTR_UNIT_OF_MEASUREMENT,
@@ -49,10 +56,63 @@ DATE_STR_FORMAT = "%Y-%m-%d %H:%M:%S"
 _RENDER_INFO = "template.render_info"
 _ENVIRONMENT = "template.environment"
 _ENVIRONMENT_LIMITED = "template.environment_limited"
+_BYTECODE_CACHE = "template.bytecode_cache"
+
+BYTECODE_STORAGE_KEY = "core.template_bytecode"
+BYTECODE_STORAGE_VERSION = 1
+BYTECODE_SAVE_DELAY = 60
+
+# Compiled templates kept alive after the last Template using them is gone
+MAX_HOT_TEMPLATES = 1024
+
+FLAVOUR_NORMAL = "normal"
+FLAVOUR_LIMITED = "limited"
+FLAVOUR_NO_HASS = "no_hass"
 
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{|\{#")
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
 _IS_NUMERIC = re.compile(r"^[+-]?(?!0\d)\d*(?:\.\d*)?$")
+# Simple numbers with at least one digit that int() and float() parse like
+# literal_eval
+_IS_SIMPLE_NUMBER = re.compile(r"^[+-]?(?!0\d)(?=\.?\d)\d*(?:\.\d*)?$", re.ASCII)
+_SIMPLE_LITERALS = {"True": True, "False": False, "None": None}
+# Results that have to be parsed with literal_eval every time
+_PARSE_LITERAL = object()
+RESULT_CACHE_SIZE = 4096
+# Longer results are not cached
+MAX_CACHED_RESULT_LENGTH = 255
+
+# Common expressions that are rendered without Jinja, see _analyze_expression
+_FAST_STRING = r"""\s*('[^'\\]*'|"[^"\\]*")\s*"""
+_FAST_EXPRESSION = r"^\s*\{{\{{\s*{}\s*\}}\}}\s*$"
+_FAST_STATES = re.compile(
+    _FAST_EXPRESSION.format(
+        rf"states\({_FAST_STRING}\)"
+        r"(?P<float>\s*\|\s*float"
+        r"(?:\s*(?P<op>==|!=|<=|>=|<|>)\s*(?P<number>-?\d+(?:\.\d+)?))?)?"
+    )
+)
+_FAST_IS_STATE = re.compile(
+    _FAST_EXPRESSION.format(rf"is_state\({_FAST_STRING},{_FAST_STRING}\)")
+)
+_FAST_STATE_ATTR = re.compile(
+    _FAST_EXPRESSION.format(rf"state_attr\({_FAST_STRING},{_FAST_STRING}\)")
+)
+_FAST_IS_STATE_ATTR = re.compile(
+    _FAST_EXPRESSION.format(
+        rf"is_state_attr\({_FAST_STRING},{_FAST_STRING},{_FAST_STRING}\)"
+    )
+)
+_FAST_OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<=": operator.le,
+    ">=": operator.ge,
+    "<": operator.lt,
+    ">": operator.gt,
+}
+# Variables with these names hide the globals used by the fast expressions
+_FAST_NAMES = frozenset({"states", "is_state", "state_attr", "is_state_attr"})
 
 _RESERVED_NAMES = {"contextfunction", "evalcontextfunction", "environmentfunction"}
 
@@ -69,6 +129,9 @@ _COLLECTABLE_STATE_ATTRIBUTES = {
     "name",
 }
 
+# Key of a state read that only depends on the entity having a state
+_EXISTS_READ = "exists"
+
 ALL_STATES_RATE_LIMIT = timedelta(minutes=1)
 DOMAIN_STATES_RATE_LIMIT = timedelta(seconds=1)
 
@@ -183,6 +246,51 @@ RESULT_WRAPPERS: Dict[Type, Type] = {
 RESULT_WRAPPERS[tuple] = TupleWrapper
 
 
+@lru_cache(maxsize=RESULT_CACHE_SIZE)
+def _parse_simple_result(render_result: str) -> Any:
+    """Parse a result like Template._parse_result, avoiding literal_eval.
+
+    Returns _PARSE_LITERAL for containers, they are mutable and can not be
+    cached.
+    """
+    if render_result in _SIMPLE_LITERALS:
+        return _SIMPLE_LITERALS[render_result]
+
+    # Names and empty strings are not literals
+    if not render_result or render_result.isidentifier():
+        return render_result
+
+    if render_result[0] in "([{":
+        return _PARSE_LITERAL
+
+    if _IS_SIMPLE_NUMBER.match(render_result):
+        try:
+            if "." in render_result:
+                return float(render_result)
+            return int(render_result)
+        except ValueError:
+            # Exceeds the int string conversion limit, as for literal_eval
+            return render_result
+
+    try:
+        result = literal_eval(render_result)
+    except (ValueError, TypeError, SyntaxError, MemoryError):
+        return render_result
+
+    if type(result) in RESULT_WRAPPERS:
+        return _PARSE_LITERAL
+
+    # Strings, complex and scientific numbers are left as rendered
+    if isinstance(result, (str, complex)) or (
+        isinstance(result, (int, float))
+        and not isinstance(result, bool)
+        and _IS_NUMERIC.match(render_result) is None
+    ):
+        return render_result
+
+    return result
+
+
 def _true(arg: Any) -> bool:
     return True
 
@@ -208,6 +316,9 @@ class RenderInfo:
         self.domains = set()
         self.domains_lifecycle = set()
         self.entities = set()
+        # The values each render read from the state of an entity, None
+        # when the state was used as a whole
+        self._state_reads: Dict[str, Optional[Dict[Any, Any]]] = {}
         self.rate_limit: Optional[timedelta] = None
         self.has_time = False
 
@@ -229,6 +340,43 @@ class RenderInfo:
         """Template should re-render if the entity is added or removed with domains watched."""
         return split_entity_id(entity_id)[0] in self.domains_lifecycle
 
+    def state_read_changed(self, entity_id: str, state: Optional[State]) -> bool:
+        """Return if a value the render read from the state of an entity changed.
+
+        Only renders that depend on specific entities can be compared, for
+        all other renders a change can not be ruled out.
+        """
+        if (
+            self.exception
+            or self.has_time
+            or self.all_states
+            or self.all_states_lifecycle
+            or self.domains
+            or self.domains_lifecycle
+        ):
+            return True
+
+        reads = self._state_reads.get(entity_id)
+        if reads is None:
+            return True
+
+        for key, value in reads.items():
+            if _state_read_value(state, key) != value:
+                return True
+        return False
+
+    def _collect_state_read(self, entity_id: str, key: Any, value: Any) -> None:
+        self.entities.add(entity_id)
+        reads = self._state_reads.get(entity_id, _SENTINEL)
+        if reads is _SENTINEL:
+            self._state_reads[entity_id] = {key: value}
+        elif reads is not None:
+            reads[key] = value
+
+    def _collect_whole_state(self, entity_id: str) -> None:
+        self.entities.add(entity_id)
+        self._state_reads[entity_id] = None
+
     def result(self) -> str:
         """Results of the template computation."""
         if self.exception is not None:
@@ -285,6 +433,7 @@ class Template:
         "_compiled_code",
         "_compiled",
         "_limited",
+        "_fast_render",
     )
 
     def __init__(self, template, hass=None):
@@ -298,6 +447,7 @@ class Template:
         self.hass = hass
         self.is_static = not is_template_string(template)
         self._limited = None
+        self._fast_render: Optional[Callable[[HomeAssistantType], Any]] = None
 
     @property
     def _env(self) -> TemplateEnvironment:
@@ -364,8 +514,21 @@ class Template:
         if variables is not None:
             kwargs.update(variables)
 
+        fast_render = self._fast_render
+
         try:
-            render_result = compiled.render(kwargs)
+            if fast_render is not None and _FAST_NAMES.isdisjoint(kwargs):
+                result = fast_render(self.hass)
+                # Booleans would be parsed back to the same value
+                if (
+                    result.__class__ is bool
+                    and parse_result
+                    and not self.hass.config.legacy_templates
+                ):
+                    return result
+                render_result = str(result)
+            else:
+                render_result = compiled.render(kwargs)
         except Exception as err:  # pylint: disable=broad-except
             raise TemplateError(err) from err
 
@@ -378,6 +541,13 @@ class Template:
 
     def _parse_result(self, render_result: str) -> Any:  # pylint: disable=no-self-use
         """Parse the result."""
+        if len(render_result) <= MAX_CACHED_RESULT_LENGTH:
+            result = _parse_simple_result(render_result)
+        else:
+            result = _parse_simple_result.__wrapped__(render_result)
+        if result is not _PARSE_LITERAL:
+            return result
+
         try:
             result = literal_eval(render_result)
 
@@ -550,6 +720,8 @@ class Template:
             Template,
             jinja2.Template.from_code(env, self._compiled_code, env.globals, None),
         )
+        if not limited:
+            self._fast_render = _analyze_expression(self.template, env)
 
         return self._compiled
 
@@ -682,17 +854,21 @@ class TemplateState(State):
 
     def _collect_state(self) -> None:
         if self._collect and _RENDER_INFO in self._hass.data:
-            self._hass.data[_RENDER_INFO].entities.add(self._state.entity_id)
+            self._hass.data[_RENDER_INFO]._collect_whole_state(self._state.entity_id)
+
+    def _collect_read(self, key: Any, value: Any) -> Any:
+        if self._collect and _RENDER_INFO in self._hass.data:
+            self._hass.data[_RENDER_INFO]._collect_state_read(
+                self._state.entity_id, key, value
+            )
+        return value
 
     # Jinja will try __getitem__ first and it avoids the need
     # to call is_safe_attribute
     def __getitem__(self, item):
         """Return a property as an attribute for jinja."""
         if item in _COLLECTABLE_STATE_ATTRIBUTES:
-            # _collect_state inlined here for performance
-            if self._collect and _RENDER_INFO in self._hass.data:
-                self._hass.data[_RENDER_INFO].entities.add(self._state.entity_id)
-            return getattr(self._state, item)
+            return getattr(self, item)
         if item == "entity_id":
             return self._state.entity_id
         if item == "state_with_unit":
@@ -710,57 +886,58 @@ class TemplateState(State):
     @property
     def state(self):
         """Wrap State.state."""
-        self._collect_state()
-        return self._state.state
+        return self._collect_read("state", self._state.state)
 
     @property
     def attributes(self):
         """Wrap State.attributes."""
-        self._collect_state()
-        return self._state.attributes
+        return self._collect_read("attributes", self._state.attributes)
 
     @property
     def last_changed(self):
         """Wrap State.last_changed."""
-        self._collect_state()
-        return self._state.last_changed
+        return self._collect_read("last_changed", self._state.last_changed)
 
     @property
     def last_updated(self):
         """Wrap State.last_updated."""
-        self._collect_state()
-        return self._state.last_updated
+        return self._collect_read("last_updated", self._state.last_updated)
 
     @property
     def context(self):
         """Wrap State.context."""
-        self._collect_state()
-        return self._state.context
+        return self._collect_read("context", self._state.context)
 
     @property
     def domain(self):
         """Wrap State.domain."""
-        self._collect_state()
+        self._collect_read(_EXISTS_READ, True)
         return self._state.domain
 
     @property
     def object_id(self):
         """Wrap State.object_id."""
-        self._collect_state()
+        self._collect_read(_EXISTS_READ, True)
         return self._state.object_id
 
     @property
     def name(self):
         """Wrap State.name."""
-        self._collect_state()
+        self._attribute(ATTR_FRIENDLY_NAME)
         return self._state.name
 
     @property
     def state_with_unit(self) -> str:
         """Return the state concatenated with the unit if available."""
-        self._collect_state()
-        unit = self._state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
-        return f"{self._state.state} {unit}" if unit else self._state.state
+        state = self.state
+        unit = self._attribute(ATTR_UNIT_OF_MEASUREMENT)
+        return f"{state} {unit}" if unit else state
+
+    def _attribute(self, name: str) -> Any:
+        """Return a single attribute, only collecting that attribute."""
+        return self._collect_read(
+            ("attributes", name), self._state.attributes.get(name)
+        )
 
     def __eq__(self, other: Any) -> bool:
         """Ensure we collect on equality check."""
@@ -772,10 +949,21 @@ class TemplateState(State):
         return f"<template TemplateState({self._state.__repr__()})>"
 
 
-def _collect_state(hass: HomeAssistantType, entity_id: str) -> None:
+def _collect_state(hass: HomeAssistantType, entity_id: str, exists: bool) -> None:
     entity_collect = hass.data.get(_RENDER_INFO)
     if entity_collect is not None:
-        entity_collect.entities.add(entity_id)
+        entity_collect._collect_state_read(entity_id, _EXISTS_READ, exists)
+
+
+def _state_read_value(state: Optional[State], key: Any) -> Any:
+    """Return the value of a state that was read with a key."""
+    if key == _EXISTS_READ:
+        return state is not None
+    if state is None:
+        return _SENTINEL
+    if isinstance(key, tuple):
+        return state.attributes.get(key[1])
+    return getattr(state, key)
 
 
 def _state_generator(hass: HomeAssistantType, domain: Optional[str]) -> Generator:
@@ -803,7 +991,7 @@ def _get_template_state_from_state(
     if state is None:
         # Only need to collect if none, if not none collect first actual
         # access to the state properties in the state wrapper.
-        _collect_state(hass, entity_id)
+        _collect_state(hass, entity_id, False)
         return None
     return TemplateState(hass, state)
 
@@ -863,7 +1051,7 @@ def expand(hass: HomeAssistantType, *args: Any) -> Iterable[State]:
             if group_entities:
                 search += group_entities
         else:
-            _collect_state(hass, entity_id)
+            _collect_state(hass, entity_id, True)
             found[entity_id] = entity
 
     return sorted(found.values(), key=lambda a: a.entity_id)
@@ -1019,7 +1207,53 @@ def state_attr(hass, entity_id, name):
     """Get a specific attribute from a state."""
     state_obj = _get_state(hass, entity_id)
     if state_obj is not None:
-        return state_obj.attributes.get(name)
+        return state_obj._attribute(name)  # pylint: disable=protected-access
+    return None
+
+
+def _fast_string(literal: str) -> str:
+    """Return the value of a quoted string matched by _FAST_STRING."""
+    return literal[1:-1]
+
+
+def _analyze_expression(
+    template: str, env: TemplateEnvironment
+) -> Optional[Callable[[HomeAssistantType], Any]]:
+    """Return a function to render a template with a common expression.
+
+    The function returns the value of the expression, rendering it as a
+    string gives the output of the template. It calls the same functions
+    as the template, so the entities and state values collected in the
+    render info are the same.
+    """
+    match = _FAST_STATES.match(template)
+    if match:
+        entity_id = _fast_string(match[1])
+        if match["float"] is None:
+            return lambda hass: AllStates(hass)(entity_id)
+        to_float = env.filters["float"]
+        if match["op"] is None:
+            return lambda hass: to_float(AllStates(hass)(entity_id))
+        compare = _FAST_OPERATORS[match["op"]]
+        number = match["number"]
+        value = float(number) if "." in number else int(number)
+        return lambda hass: compare(to_float(AllStates(hass)(entity_id)), value)
+
+    match = _FAST_IS_STATE.match(template)
+    if match:
+        entity_id, state = _fast_string(match[1]), _fast_string(match[2])
+        return lambda hass: is_state(hass, entity_id, state)
+
+    match = _FAST_STATE_ATTR.match(template)
+    if match:
+        entity_id, name = _fast_string(match[1]), _fast_string(match[2])
+        return lambda hass: state_attr(hass, entity_id, name)
+
+    match = _FAST_IS_STATE_ATTR.match(template)
+    if match:
+        entity_id, name, value = (_fast_string(match[i]) for i in range(1, 4))
+        return lambda hass: is_state_attr(hass, entity_id, name, value)
+
     return None
 
 
@@ -1317,6 +1551,97 @@ def urlencode(value):
     return urllib_urlencode(value).encode("utf-8")
 
 
+def _compiler_version() -> str:
+    """Return the versions compiled template code depends on."""
+    return f"{MAGIC_NUMBER.hex()}-jinja-{jinja2.__version__}"
+
+
+def _bytecode_key(flavour: str, source: str) -> str:
+    """Return the key of the code of a template source."""
+    return f"{flavour}:{hashlib.sha256(source.encode()).hexdigest()}"
+
+
+class TemplateBytecodeCache:
+    """Keep the code of compiled templates across restarts.
+
+    Code is keyed on the environment flavour and a hash of the template
+    source and is only loaded when it was compiled by the same Python
+    and Jinja versions. Only code used since the start is saved, so
+    templates that are no longer used are dropped from the cache.
+    """
+
+    def __init__(self, hass: HomeAssistantType) -> None:
+        """Initialize the cache."""
+        # The storage helper depends on the event helper, which imports us
+        # pylint: disable=import-outside-toplevel
+        from homeassistant.helpers.storage import Store
+
+        self.hass = hass
+        self.hits = 0
+        self.misses = 0
+        self._store = Store(
+            hass, BYTECODE_STORAGE_VERSION, BYTECODE_STORAGE_KEY, private=True
+        )
+        self._loaded: Dict[str, str] = {}
+        self._used: Dict[str, str] = {}
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Return the hit and miss counters and the size of the cache."""
+        return {"hits": self.hits, "misses": self.misses, "templates": len(self._used)}
+
+    async def async_load(self) -> None:
+        """Load the code compiled by a previous run."""
+        data = await self._store.async_load()
+        if data is not None and data.get("compiler") == _compiler_version():
+            self._loaded = data["templates"]
+
+    def get(self, flavour: str, source: str) -> Optional[CodeType]:
+        """Return the cached code of a template source."""
+        key = _bytecode_key(flavour, source)
+        encoded = self._used.get(key) or self._loaded.get(key)
+        if encoded is None:
+            self.misses += 1
+            return None
+        try:
+            code = marshal.loads(base64.b64decode(encoded))
+        except (ValueError, EOFError, TypeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._add(key, encoded)
+        return code
+
+    def set(self, flavour: str, source: str, code: CodeType) -> None:
+        """Cache the code of a template source."""
+        self._add(
+            _bytecode_key(flavour, source),
+            base64.b64encode(marshal.dumps(code)).decode(),
+        )
+
+    def _add(self, key: str, encoded: str) -> None:
+        """Mark code as used, templates can be compiled in any thread."""
+        if key in self._used:
+            return
+        self._used[key] = encoded
+        self.hass.loop.call_soon_threadsafe(self._async_schedule_save)
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, BYTECODE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> Dict[str, Any]:
+        return {"compiler": _compiler_version(), "templates": dict(self._used)}
+
+
+async def async_load_bytecode_cache(hass: HomeAssistantType) -> None:
+    """Load the compiled templates of the previous run."""
+    cache = TemplateBytecodeCache(hass)
+    await cache.async_load()
+    hass.data[_BYTECODE_CACHE] = cache
+
+
 class TemplateEnvironment(ImmutableSandboxedEnvironment):
     """The Home Assistant template environment."""
 
@@ -1324,7 +1649,12 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         """Initialise template environment."""
         super().__init__()
         self.hass = hass
+        if hass is None:
+            self.flavour = FLAVOUR_NO_HASS
+        else:
+            self.flavour = FLAVOUR_LIMITED if limited else FLAVOUR_NORMAL
         self.template_cache = weakref.WeakValueDictionary()
+        self.hot_template_cache: OrderedDict[str, CodeType] = OrderedDict()
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
         self.filters["log"] = logarithm
@@ -1466,9 +1796,29 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         cached = self.template_cache.get(source)
 
         if cached is None:
-            cached = self.template_cache[source] = super().compile(source)
+            cached = self.template_cache[source] = self._compile_cached(source)
+
+        hot_template_cache = self.hot_template_cache
+        hot_template_cache[source] = cached
+        hot_template_cache.move_to_end(source)
+        if len(hot_template_cache) > MAX_HOT_TEMPLATES:
+            hot_template_cache.popitem(last=False)
 
         return cached
 
+    def _compile_cached(self, source: str) -> CodeType:
+        """Compile the template, reusing the code of a previous run."""
+        bytecode_cache: Optional[TemplateBytecodeCache] = (
+            self.hass.data.get(_BYTECODE_CACHE) if self.hass is not None else None
+        )
+        if bytecode_cache is None:
+            return super().compile(source)
+
+        code = bytecode_cache.get(self.flavour, source)
+        if code is None:
+            code = super().compile(source)
+            bytecode_cache.set(self.flavour, source, code)
+        return code
+
 
 _NO_HASS_ENV = TemplateEnvironment(None)  # type: ignore[no-untyped-call]
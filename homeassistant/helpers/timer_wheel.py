@@ -0,0 +1,289 @@
+"""Hierarchical timing wheel to run many timers from few loop timers."""
+import asyncio
+from heapq import heappop, heappush
+from itertools import count
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+from homeassistant.core import callback
+
+# Level of timers that are taken from the wheel to be run
+_LEVEL_DUE = -1
+
+# Width of a slot of the first level in seconds
+RESOLUTION = 1.0
+SLOT_BITS = 6
+SLOTS = 1 << SLOT_BITS
+LEVELS = 4
+
+
+class WheelTimer:
+    """A timer scheduled on a timer wheel."""
+
+    __slots__ = ("when", "callback", "seq", "level", "key", "_wheel")
+
+    def __init__(
+        self,
+        wheel: "TimerWheel",
+        when: float,
+        callback_: Callable[[], None],
+        seq: int,
+    ) -> None:
+        """Initialize the timer."""
+        self.when = when
+        self.callback = callback_
+        self.seq = seq
+        self.level = 0
+        self.key = 0
+        self._wheel: Optional[TimerWheel] = wheel
+
+    @callback
+    def cancel(self) -> None:
+        """Cancel the timer, does nothing once it ran or was cancelled."""
+        wheel = self._wheel
+        if wheel is not None:
+            self._wheel = None
+            wheel._async_remove(self)  # pylint: disable=protected-access
+
+    @property
+    def cancelled(self) -> bool:
+        """Return if the timer ran or was cancelled."""
+        return self._wheel is None
+
+
+class _Slot:
+    """The timers of a slot and the time of the earliest one."""
+
+    __slots__ = ("timers", "_min_when")
+
+    def __init__(self) -> None:
+        """Initialize an empty slot."""
+        self.timers: Dict[WheelTimer, None] = {}
+        self._min_when: Optional[float] = None
+
+    def add(self, timer: WheelTimer) -> None:
+        """Add a timer to the slot."""
+        if not self.timers or (
+            self._min_when is not None and timer.when < self._min_when
+        ):
+            self._min_when = timer.when
+        self.timers[timer] = None
+
+    def remove(self, timer: WheelTimer) -> None:
+        """Remove a timer from the slot."""
+        del self.timers[timer]
+        if timer.when == self._min_when:
+            # Found again when it is needed
+            self._min_when = None
+
+    @property
+    def min_when(self) -> float:
+        """Return the time of the earliest timer of the slot."""
+        if self._min_when is None:
+            self._min_when = min(timer.when for timer in self.timers)
+        return self._min_when
+
+
+class _Level:
+    """The slots of a level of the wheel by key.
+
+    The keys of the slots are kept in a heap to find the earliest slot
+    without looking at the others. Keys of slots that were emptied by
+    cancelled timers stay in the heap until they are reached.
+    """
+
+    __slots__ = ("slots", "_keys", "_queued_keys")
+
+    def __init__(self) -> None:
+        """Initialize an empty level."""
+        self.slots: Dict[int, _Slot] = {}
+        self._keys: List[int] = []
+        self._queued_keys: Set[int] = set()
+
+    def slot(self, key: int) -> _Slot:
+        """Return the slot of a key, creating it when it is empty."""
+        slot = self.slots.get(key)
+        if slot is None:
+            slot = self.slots[key] = _Slot()
+            if key not in self._queued_keys:
+                self._queued_keys.add(key)
+                heappush(self._keys, key)
+        return slot
+
+    def first_key(self) -> Optional[int]:
+        """Return the key of the earliest slot."""
+        keys = self._keys
+        while keys and keys[0] not in self.slots:
+            self._queued_keys.discard(heappop(keys))
+        return keys[0] if keys else None
+
+    def pop_first(self) -> _Slot:
+        """Remove the earliest slot and return it."""
+        key = self.first_key()
+        assert key is not None
+        heappop(self._keys)
+        self._queued_keys.discard(key)
+        return self.slots.pop(key)
+
+
+class TimerWheel:
+    """Schedule timers in the slots of a hierarchical timing wheel.
+
+    Level n has SLOTS slots that are SLOTS ** n times wider than the slots
+    of the first level, the last level takes all timers further out.
+    Timers are inserted in and removed from a slot in O(1). Slots of the
+    upper levels are moved down once their time has come, timers of the
+    first level are run when due.
+
+    One loop timer wakes the wheel at the time of the earliest timer and
+    all timers that are due by then are run in one batch. It is only
+    replaced when a timer earlier than all others is scheduled.
+
+    The time of a timer is a POSIX timestamp, now_func returns the current
+    time that decides if a timer is due.
+    """
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, now_func: Callable[[], float]
+    ) -> None:
+        """Initialize the wheel."""
+        self._loop = loop
+        self._now_func = now_func
+        self._levels = [_Level() for _ in range(LEVELS)]
+        self._base = int(now_func() // RESOLUTION)
+        self._pending = 0
+        self._seq = count()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self._wakeup_when = 0.0
+
+    @property
+    def pending(self) -> int:
+        """Return the number of timers that have not run yet."""
+        return self._pending
+
+    @callback
+    def async_schedule(self, when: float, callback_: Callable[[], None]) -> WheelTimer:
+        """Schedule a callback at a POSIX timestamp."""
+        timer = WheelTimer(self, when, callback_, next(self._seq))
+        self._async_insert(timer)
+        self._pending += 1
+        self._async_ensure_wakeup(when)
+        return timer
+
+    @callback
+    def _async_insert(self, timer: WheelTimer) -> None:
+        """Add a timer to the slot of its time."""
+        tick = int(timer.when // RESOLUTION)
+        delta = tick - self._base
+        level = 0
+        limit = SLOTS
+        while delta >= limit and level < LEVELS - 1:
+            level += 1
+            limit <<= SLOT_BITS
+        timer.level = level
+        timer.key = key = tick >> (SLOT_BITS * level)
+        self._levels[level].slot(key).add(timer)
+
+    @callback
+    def _async_remove(self, timer: WheelTimer) -> None:
+        """Remove a cancelled timer from its slot."""
+        if timer.level == _LEVEL_DUE:
+            return
+        slots = self._levels[timer.level].slots
+        slot = slots[timer.key]
+        slot.remove(timer)
+        if not slot.timers:
+            del slots[timer.key]
+        self._pending -= 1
+        if not self._pending:
+            self._async_cancel_wakeup()
+
+    @callback
+    def _async_cancel_wakeup(self) -> None:
+        """Stop waking up when there are no timers left."""
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+
+    def _next_when(self) -> Optional[float]:
+        """Return the time of the earliest timer."""
+        next_when = None
+        for level in self._levels:
+            key = level.first_key()
+            if key is None:
+                continue
+            when = level.slots[key].min_when
+            if next_when is None or when < next_when:
+                next_when = when
+        return next_when
+
+    @callback
+    def _async_ensure_wakeup(self, when: float) -> None:
+        """Make sure the wheel wakes up at a time."""
+        if self._wakeup is not None:
+            if self._wakeup_when <= when:
+                return
+            self._wakeup.cancel()
+        self._wakeup_when = when
+        self._wakeup = self._loop.call_at(
+            self._loop.time() + when - time.time(), self._async_wakeup
+        )
+
+    @callback
+    def _async_wakeup(self) -> None:
+        """Run the timers that are due and wait for the next one."""
+        self._wakeup = None
+        now = self._now_func()
+        self._base = now_tick = int(now // RESOLUTION)
+
+        # Move the timers of upper level slots that have started down
+        for level_index in range(LEVELS - 1, 0, -1):
+            level = self._levels[level_index]
+            shift = SLOT_BITS * level_index
+            while True:
+                key = level.first_key()
+                if key is None or key << shift > now_tick:
+                    break
+                for timer in level.pop_first().timers:
+                    self._async_insert(timer)
+
+        due = []
+        level = self._levels[0]
+        while True:
+            key = level.first_key()
+            if key is None or key > now_tick:
+                break
+            slot = level.slots[key]
+            if slot.min_when > now:
+                # The rest of the slot is due later in the current tick
+                break
+            level.pop_first()
+            for timer in slot.timers:
+                if timer.when <= now:
+                    timer.level = _LEVEL_DUE
+                    due.append(timer)
+                else:
+                    level.slot(key).add(timer)
+
+        self._pending -= len(due)
+        due.sort(key=lambda timer: (timer.when, timer.seq))
+        for timer in due:
+            # Callbacks of the batch can cancel later timers of the batch
+            if timer.cancelled:
+                continue
+            timer._wheel = None  # pylint: disable=protected-access
+            try:
+                timer.callback()
+            except Exception as exc:  # pylint: disable=broad-except
+                self._loop.call_exception_handler(
+                    {
+                        "message": f"Exception in timer callback {timer.callback!r}",
+                        "exception": exc,
+                    }
+                )
+
+        next_when = self._next_when()
+        if next_when is None:
+            self._async_cancel_wakeup()
+        else:
+            self._async_ensure_wakeup(next_when)
@@ -3,7 +3,18 @@ import asyncio
 from datetime import datetime, timedelta
 import logging
 from time import monotonic
-from typing import Any, Awaitable, Callable, Generic, List, Optional, TypeVar
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 import urllib.error
 
 import aiohttp
@@ -18,6 +29,15 @@ from .debounce import Debouncer
 
 REQUEST_REFRESH_DEFAULT_COOLDOWN = 10
 REQUEST_REFRESH_DEFAULT_IMMEDIATE = True
+# Scheduled refreshes reuse a shared result fetched this long ago
+FETCH_DEFAULT_TTL = timedelta(seconds=REQUEST_REFRESH_DEFAULT_COOLDOWN)
+
+DATA_SHARED_FETCHES = "update_coordinator_shared_fetches"
+
+# How the data of a refresh was obtained
+FETCH_SOURCE_FETCHED = "fetched"
+FETCH_SOURCE_SHARED = "shared"
+FETCH_SOURCE_CACHED = "cached"
 
 T = TypeVar("T")
 
@@ -28,6 +48,92 @@ class UpdateFailed(Exception):
     """Raised when an update has failed."""
 
 
+class _SharedFetch:
+    """The in-flight fetch and cached result of coordinators with a fetch key.
+
+    It is kept in hass.data while coordinators use it, they are added with
+    their TTL and the shortest TTL of the current users applies. The TTL of
+    a user is at most half its update interval so that each of its scheduled
+    refreshes gets data fetched after the previous one.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the shared fetch."""
+        self.hass = hass
+        self.ttl = 0.0
+        # Refreshes of all coordinators are scheduled from this point in time
+        self.anchor = utcnow().replace(microsecond=0)
+        self._users: Dict["DataUpdateCoordinator[Any]", float] = {}
+        self._task: Optional["asyncio.Task[Any]"] = None
+        self._result: Any = None
+        self._fetched: Optional[float] = None
+
+    @callback
+    def async_add_user(
+        self, user: "DataUpdateCoordinator[Any]", ttl: timedelta
+    ) -> None:
+        """Add a coordinator that uses the shared fetch."""
+        if user.update_interval is not None:
+            ttl = min(ttl, user.update_interval / 2)
+        self._users[user] = ttl.total_seconds()
+        self.ttl = min(self._users.values())
+
+    @callback
+    def async_remove_user(self, user: "DataUpdateCoordinator[Any]") -> bool:
+        """Remove a coordinator, return if the shared fetch is still used."""
+        del self._users[user]
+        if not self._users:
+            return False
+        self.ttl = min(self._users.values())
+        return True
+
+    @callback
+    def async_next_refresh(self, update_interval: timedelta) -> datetime:
+        """Return the next refresh on the schedule shared by the coordinators."""
+        now = utcnow()
+        intervals = (now - self.anchor) // update_interval + 1
+        return self.anchor + intervals * update_interval
+
+    @callback
+    def async_fetch(
+        self, fetch: Callable[[], Awaitable[Any]], allow_cached: bool
+    ) -> Tuple[Awaitable[Any], str]:
+        """Return an awaitable of the shared result and how it is obtained.
+
+        A fetch in flight is joined, a new fetch is only started when
+        there is none. Unless allow_cached is False the last result is
+        used when it is younger than the TTL.
+        """
+        if (
+            allow_cached
+            and self._fetched is not None
+            and monotonic() - self._fetched < self.ttl
+        ):
+            cached = self.hass.loop.create_future()
+            cached.set_result(self._result)
+            return cached, FETCH_SOURCE_CACHED
+
+        task = self._task
+        if task is None:
+            task = self._task = self.hass.async_create_task(fetch())
+            task.add_done_callback(self._async_fetch_done)
+            source = FETCH_SOURCE_FETCHED
+        else:
+            source = FETCH_SOURCE_SHARED
+
+        # A cancelled refresh does not cancel the fetch for the others
+        return asyncio.shield(task), source
+
+    @callback
+    def _async_fetch_done(self, task: "asyncio.Task[Any]") -> None:
+        """Cache the result of a successful fetch."""
+        self._task = None
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._result = task.result()
+        self._fetched = monotonic()
+
+
 class DataUpdateCoordinator(Generic[T]):
     """Class to manage fetching data from single endpoint."""
 
@@ -40,8 +146,15 @@ class DataUpdateCoordinator(Generic[T]):
         update_interval: Optional[timedelta] = None,
         update_method: Optional[Callable[[], Awaitable[T]]] = None,
         request_refresh_debouncer: Optional[Debouncer] = None,
+        fetch_key: Optional[Hashable] = None,
+        fetch_ttl: timedelta = FETCH_DEFAULT_TTL,
     ):
-        """Initialize global data updater."""
+        """Initialize global data updater.
+
+        Coordinators with the same fetch_key fetch the same data: they share
+        one fetch in flight, refresh on a common schedule and scheduled
+        refreshes use a result of the others that is younger than fetch_ttl.
+        """
         self.hass = hass
         self.logger = logger
         self.name = name
@@ -56,6 +169,18 @@ class DataUpdateCoordinator(Generic[T]):
         self._request_refresh_task: Optional[asyncio.TimerHandle] = None
         self.last_update_success = True
 
+        self._fetch_key = fetch_key
+        self._fetch_ttl = fetch_ttl
+        self._shared_fetch: Optional[_SharedFetch] = None
+
+        self.fetch_counts = {
+            FETCH_SOURCE_FETCHED: 0,
+            FETCH_SOURCE_SHARED: 0,
+            FETCH_SOURCE_CACHED: 0,
+        }
+        self.last_fetch_latency: Optional[float] = None
+        self._fetch_latency_sum = 0.0
+
         if request_refresh_debouncer is None:
             request_refresh_debouncer = Debouncer(
                 hass,
@@ -73,6 +198,22 @@ class DataUpdateCoordinator(Generic[T]):
             EVENT_HOMEASSISTANT_STOP, self._async_stop_refresh
         )
 
+    @property
+    def fetch_stats(self) -> Dict[str, Any]:
+        """Return how often data was fetched, shared or cached and the latency.
+
+        The latency is the time a refresh waited for its data, including
+        the time spent waiting for a fetch of another coordinator.
+        """
+        refreshes = sum(self.fetch_counts.values())
+        return {
+            **self.fetch_counts,
+            "last_latency": self.last_fetch_latency,
+            "average_latency": self._fetch_latency_sum / refreshes
+            if refreshes
+            else None,
+        }
+
     @callback
     def async_add_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
         """Listen for data updates."""
@@ -82,6 +223,7 @@ class DataUpdateCoordinator(Generic[T]):
 
         # This is the first listener, set up interval.
         if schedule_refresh:
+            self._async_acquire_shared_fetch()
             self._schedule_refresh()
 
         @callback
@@ -96,9 +238,37 @@ class DataUpdateCoordinator(Generic[T]):
         """Remove data update."""
         self._listeners.remove(update_callback)
 
-        if not self._listeners and self._unsub_refresh:
-            self._unsub_refresh()
-            self._unsub_refresh = None
+        if not self._listeners:
+            self._async_release_shared_fetch()
+            if self._unsub_refresh:
+                self._unsub_refresh()
+                self._unsub_refresh = None
+
+    @callback
+    def _async_acquire_shared_fetch(self) -> Optional[_SharedFetch]:
+        """Start using the shared fetch of the fetch key."""
+        if self._fetch_key is None or self._shared_fetch is not None:
+            return self._shared_fetch
+
+        shared_fetches: Dict[Hashable, _SharedFetch] = self.hass.data.setdefault(
+            DATA_SHARED_FETCHES, {}
+        )
+        shared_fetch = shared_fetches.get(self._fetch_key)
+        if shared_fetch is None:
+            shared_fetch = shared_fetches[self._fetch_key] = _SharedFetch(self.hass)
+        shared_fetch.async_add_user(self, self._fetch_ttl)
+        self._shared_fetch = shared_fetch
+        return shared_fetch
+
+    @callback
+    def _async_release_shared_fetch(self) -> None:
+        """Stop using the shared fetch, it is dropped once nobody uses it."""
+        shared_fetch = self._shared_fetch
+        if shared_fetch is None:
+            return
+        self._shared_fetch = None
+        if not shared_fetch.async_remove_user(self):
+            del self.hass.data[DATA_SHARED_FETCHES][self._fetch_key]
 
     @callback
     def _schedule_refresh(self) -> None:
@@ -114,16 +284,18 @@ class DataUpdateCoordinator(Generic[T]):
         # minimizing the time between the point and the real activation.
         # That way we obtain a constant update frequency,
         # as long as the update process takes less than a second
+        if self._shared_fetch is not None:
+            next_refresh = self._shared_fetch.async_next_refresh(self.update_interval)
+        else:
+            next_refresh = utcnow().replace(microsecond=0) + self.update_interval
         self._unsub_refresh = event.async_track_point_in_utc_time(
-            self.hass,
-            self._job,
-            utcnow().replace(microsecond=0) + self.update_interval,
+            self.hass, self._job, next_refresh
         )
 
     async def _handle_refresh_interval(self, _now: datetime) -> None:
         """Handle a refresh interval occurrence."""
         self._unsub_refresh = None
-        await self.async_refresh()
+        await self._async_refresh(allow_cached=True)
 
     async def async_request_refresh(self) -> None:
         """Request a refresh.
@@ -138,8 +310,34 @@ class DataUpdateCoordinator(Generic[T]):
             raise NotImplementedError("Update method not implemented")
         return await self.update_method()
 
+    async def _async_fetch_data(self, allow_cached: bool) -> Optional[T]:
+        """Fetch the data, shared with the coordinators with the same key."""
+        start = monotonic()
+        # Without listeners the shared fetch is only used for this refresh
+        temporary = self._shared_fetch is None
+        shared_fetch = self._async_acquire_shared_fetch()
+        if shared_fetch is None:
+            fetch: Awaitable[Optional[T]] = self._async_update_data()
+            source = FETCH_SOURCE_FETCHED
+        else:
+            fetch, source = shared_fetch.async_fetch(
+                self._async_update_data, allow_cached
+            )
+        try:
+            return await fetch
+        finally:
+            self.last_fetch_latency = latency = monotonic() - start
+            self._fetch_latency_sum += latency
+            self.fetch_counts[source] += 1
+            if temporary and not self._listeners:
+                self._async_release_shared_fetch()
+
     async def async_refresh(self) -> None:
         """Refresh data."""
+        await self._async_refresh(allow_cached=False)
+
+    async def _async_refresh(self, allow_cached: bool) -> None:
+        """Refresh data, from a shared result younger than the TTL if allowed."""
         if self._unsub_refresh:
             self._unsub_refresh()
             self._unsub_refresh = None
@@ -148,7 +346,7 @@ class DataUpdateCoordinator(Generic[T]):
         start = monotonic()
 
         try:
-            self.data = await self._async_update_data()
+            self.data = await self._async_fetch_data(allow_cached)
 
         except (asyncio.TimeoutError, requests.exceptions.Timeout):
             if self.last_update_success:
@@ -225,6 +423,7 @@ class DataUpdateCoordinator(Generic[T]):
     def _async_stop_refresh(self, _: Event) -> None:
         """Stop refreshing when Home Assistant is stopping."""
         self.update_interval = None
+        self._async_release_shared_fetch()
         if self._unsub_refresh:
             self._unsub_refresh()
             self._unsub_refresh = None
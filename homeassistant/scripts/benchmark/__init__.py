@@ -12,6 +12,7 @@ from typing import Callable, Dict, TypeVar
 from homeassistant import core
 from homeassistant.components.websocket_api.const import JSON_DUMP
 from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
+from homeassistant.helpers import template
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.util import dt as dt_util
@@ -250,6 +251,40 @@ async def state_changed_event_filter_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def state_changed_keyed_listeners(hass):
+    """Run a million events through keyed bus listeners for 1000 entities."""
+    count = 0
+    entity_id = "light.kitchen"
+    events_to_fire = 10 ** 6
+
+    @core.callback
+    def listener(*args):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+    for idx in range(1000):
+        hass.bus.async_listen_keyed(EVENT_STATE_CHANGED, f"{entity_id}{idx}", listener)
+
+    event_data = {
+        "entity_id": f"{entity_id}0",
+        "old_state": core.State(entity_id, "off"),
+        "new_state": core.State(entity_id, "on"),
+    }
+
+    for _ in range(events_to_fire):
+        hass.bus.async_fire(EVENT_STATE_CHANGED, event_data)
+
+    start = timer()
+
+    await hass.async_block_till_done()
+
+    assert count == events_to_fire
+
+    return timer() - start
+
+
 @benchmark
 async def logbook_filtering_state(hass):
     """Filter state changes."""
@@ -388,6 +423,52 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def render_templates(hass):
+    """Render and parse the results of common templates 100k times."""
+    hass.states.async_set("sensor.temperature", "21.5")
+    hass.states.async_set("sensor.name", "Living room")
+    hass.states.async_set("binary_sensor.door", "on")
+    templates = [
+        template.Template(template_string, hass)
+        for template_string in (
+            "{{ states('sensor.temperature') }}",
+            "{{ states('sensor.name') }}",
+            "{{ states('sensor.temperature') | float > 20 }}",
+            "{{ is_state('binary_sensor.door', 'on') }}",
+            "{{ states('sensor.temperature') | float * 1.8 + 32 }}",
+            "{{ states('sensor.name') }} is {{ states('binary_sensor.door') }}",
+        )
+    ]
+    count = len(templates)
+
+    start = timer()
+    for i in range(10 ** 5):
+        templates[i % count].async_render()
+    return timer() - start
+
+
+@benchmark
+async def parse_template_results(hass):
+    """Render and parse typical template results 100k times."""
+    tpl = template.Template("{{ result }}", hass)
+    results = [
+        "21.5",
+        "-3",
+        "True",
+        "on",
+        "Living room is on",
+        "2021-03-01 10:00:00",
+        "[1, 2]",
+    ]
+    count = len(results)
+
+    start = timer()
+    for i in range(10 ** 5):
+        tpl.async_render({"result": results[i % count]})
+    return timer() - start
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
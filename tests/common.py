@@ -363,8 +363,9 @@ fire_mqtt_message = threadsafe_callback_factory(async_fire_mqtt_message)
 
 @ha.callback
 def async_fire_time_changed(hass, datetime_, fire_all=False):
-    """Fire a time changes event."""
+    """Fire a time changes event and tick."""
     hass.bus.async_fire(EVENT_TIME_CHANGED, {"now": date_util.as_utc(datetime_)})
+    hass.ticker.async_tick(date_util.as_utc(datetime_))
 
     for task in list(hass.loop._scheduled):
         if not isinstance(task, asyncio.TimerHandle):
@@ -0,0 +1,102 @@
+"""The tests for the recent history cache."""
+from datetime import timedelta
+from functools import partial
+from unittest.mock import patch
+
+from homeassistant.components import history
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
+
+from tests.common import init_recorder_component
+from tests.components.recorder.common import async_wait_recording_done
+
+
+async def _async_setup_history(hass, config):
+    """Set up history with a recent history cache after a state was recorded."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    hass.states.async_set("light.kitchen", "on")
+    await async_wait_recording_done(hass)
+    await async_setup_component(hass, "history", {"history": config})
+    return hass.data[history.DATA_RECENT_CACHE]
+
+
+async def test_significant_states_from_cache(hass):
+    """Test recent significant states are served from the cache."""
+    cache = await _async_setup_history(hass, {"recent_cache": {}})
+    start = dt_util.utcnow()
+
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.kitchen", "off", {"brightness": 10})
+    hass.states.async_set("sensor.temperature", "20")
+    hass.states.async_set("sensor.temperature", "21")
+    hass.states.async_set("climate.living_room", "heat", {"temperature": 20})
+    hass.states.async_set("climate.living_room", "heat", {"temperature": 21})
+    hass.states.async_remove("sensor.temperature")
+    await async_wait_recording_done(hass)
+
+    entity_ids = ["light.kitchen", "sensor.temperature", "climate.living_room"]
+    for kwargs in (
+        {},
+        {"minimal_response": True},
+        {"significant_changes_only": False},
+        {"include_start_time_state": False},
+    ):
+        get_significant_states = partial(
+            history.get_significant_states, hass, start, None, entity_ids, **kwargs
+        )
+        hist = await hass.async_add_executor_job(get_significant_states)
+        assert cache.stats["hits"] == 1
+
+        with patch.dict(hass.data, {history.DATA_RECENT_CACHE: None}):
+            expected = await hass.async_add_executor_job(get_significant_states)
+
+        assert hist == expected
+        cache.hits = 0
+
+    hist = await hass.async_add_executor_job(
+        history.state_changes_during_period, hass, start, None, "light.kitchen"
+    )
+    assert [state.state for state in hist["light.kitchen"]] == ["on", "off"]
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 0
+
+
+async def test_cache_misses(hass):
+    """Test periods that are not fully cached are read from the database."""
+    before_start = dt_util.utcnow()
+    cache = await _async_setup_history(
+        hass, {"recent_cache": {"window": {"hours": 1}, "max_states_per_entity": 2}}
+    )
+    start = dt_util.utcnow()
+
+    # The cache started after the beginning of the period
+    hist = await hass.async_add_executor_job(
+        history.get_significant_states, hass, before_start, None, ["light.kitchen"]
+    )
+    assert [state.state for state in hist["light.kitchen"]] == ["on"]
+    assert cache.stats["misses"] == 1
+
+    # The oldest states of the entity were dropped
+    for state in ("off", "on", "off"):
+        hass.states.async_set("light.kitchen", state)
+    await async_wait_recording_done(hass)
+    hist = await hass.async_add_executor_job(
+        history.get_significant_states, hass, start, None, ["light.kitchen"]
+    )
+    assert [state.state for state in hist["light.kitchen"]] == [
+        "on",
+        "off",
+        "on",
+        "off",
+    ]
+    assert cache.stats["misses"] == 2
+
+    # The period starts before the window
+    with patch(
+        "homeassistant.components.history.cache.dt_util.utcnow",
+        return_value=start + timedelta(hours=2),
+    ):
+        await hass.async_add_executor_job(
+            history.get_significant_states, hass, start, None, ["light.kitchen"]
+        )
+    assert cache.stats == {"hits": 0, "misses": 3, "entities": 1, "states": 2}
@@ -7,7 +7,8 @@ import unittest
 from unittest.mock import patch, sentinel
 
 from homeassistant.components import history, recorder
-from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.models import Statistics, process_timestamp
+from homeassistant.components.recorder.util import session_scope
 import homeassistant.core as ha
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.setup import async_setup_component, setup_component
@@ -663,6 +664,56 @@ class TestComponentHistory(unittest.TestCase):
         assert len(hist[entity_id]) == 3
         assert states == hist[entity_id]
 
+    def test_get_significant_states_downsampled(self):
+        """Test numeric states are reduced to the min and max of each bucket."""
+        self.test_setup()
+        entity_id = "sensor.temperature"
+        zero = dt_util.utcnow()
+        values = [5, 3, 9, 4, 7, 2, 8, 6, 1, 10, "unavailable", 6, 3, 5]
+        states = []
+        for second, value in enumerate(values):
+            with patch(
+                "homeassistant.components.recorder.dt_util.utcnow",
+                return_value=zero + timedelta(seconds=second + 0.5),
+            ):
+                self.hass.states.set(entity_id, value)
+                wait_recording_done(self.hass)
+                states.append(self.hass.states.get(entity_id))
+        end = zero + timedelta(seconds=len(values) + 1)
+
+        hist = history.get_significant_states(
+            self.hass, zero, end, [entity_id], max_points=100
+        )
+        assert hist[entity_id] == states
+
+        # Buckets of 5 seconds keep the min and max of each,
+        # the non-numeric state and the last state
+        hist = history.get_significant_states(
+            self.hass, zero, end, [entity_id], resolution=5
+        )
+        assert hist[entity_id] == [
+            states[1],
+            states[2],
+            states[8],
+            states[9],
+            states[10],
+            states[11],
+            states[12],
+            states[13],
+        ]
+
+        hist = history.get_significant_states(
+            self.hass, zero, end, [entity_id], max_points=2
+        )
+        assert hist[entity_id] == [
+            states[8],
+            states[9],
+            states[10],
+            states[11],
+            states[12],
+            states[13],
+        ]
+
     def check_significant_states(self, zero, four, states, config):
         """Check if significant states are retrieved."""
         filters = history.Filters()
@@ -1008,3 +1059,125 @@ async def test_entity_ids_limit_via_api_with_skip_initial_state(hass, hass_clien
     assert len(response_json) == 2
     assert response_json[0][0]["entity_id"] == "light.kitchen"
     assert response_json[1][0]["entity_id"] == "light.cow"
+
+
+async def test_fetch_period_api_statistics(hass, hass_client):
+    """Test the fetch period view serves statistics for a period."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+
+    with session_scope(hass=hass) as session:
+        session.add(
+            Statistics(
+                entity_id="sensor.temperature",
+                start=start,
+                mean=21.5,
+                min=20,
+                max=23,
+                sum=43,
+                count=2,
+            )
+        )
+
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}?period=hour&filter_entity_id=sensor.temperature"
+    )
+    assert response.status == 200
+    response_json = await response.json()
+    assert response_json == [
+        [
+            {
+                "entity_id": "sensor.temperature",
+                "start": start.isoformat(),
+                "mean": 21.5,
+                "min": 20.0,
+                "max": 23.0,
+                "sum": 43.0,
+            }
+        ]
+    ]
+
+    response = await client.get(f"/api/history/period/{start.isoformat()}?period=week")
+    assert response.status == 400
+
+
+async def test_fetch_period_api_stream(hass, hass_client):
+    """Test the fetch period view streams the same states one entity at a time."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.cow", "on")
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("sensor.temperature", "20", {"unit_of_measurement": "°C"})
+
+    await hass.async_block_till_done()
+
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    # States changed during the period, and states only known at the start time
+    for when, query in (
+        (start, ""),
+        (start, "&minimal_response"),
+        (start, "&skip_initial_state"),
+        (dt_util.utcnow(), ""),
+    ):
+        response = await client.get(
+            f"/api/history/period/{when.isoformat()}?stream{query}"
+        )
+        assert response.status == 200
+        assert response.headers["Content-Type"] == "application/json"
+        streamed = await response.json()
+
+        response = await client.get(f"/api/history/period/{when.isoformat()}?{query}")
+        assert response.status == 200
+        expected = await response.json()
+
+        assert len(streamed) == 3
+        assert sorted(streamed, key=lambda states: states[0]["entity_id"]) == sorted(
+            expected, key=lambda states: states[0]["entity_id"]
+        )
+
+
+async def test_fetch_period_api_downsampled(hass, hass_client):
+    """Test the fetch period view validates the downsampling options."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    for value in range(10):
+        hass.states.async_set("sensor.temperature", value)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    for query in ("max_points=2", "max_points=2&stream"):
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}?{query}"
+            "&filter_entity_id=sensor.temperature"
+        )
+        assert response.status == 200
+        response_json = await response.json()
+        assert [state["state"] for state in response_json[0]] == ["0", "9"]
+
+    for query in (
+        "max_points=1",
+        "max_points=many",
+        f"max_points={10 ** 13}",
+        "resolution=0",
+        "resolution=1e-9",
+        "resolution=inf",
+        "resolution=nan",
+        "resolution=1e300",
+    ):
+        response = await client.get(f"/api/history/period/{start.isoformat()}?{query}")
+        assert response.status == 400
@@ -0,0 +1,143 @@
+"""The tests for the logbook day cache."""
+from datetime import datetime, timedelta
+import threading
+
+from homeassistant.components.logbook.cache import LogbookDayCache
+import homeassistant.util.dt as dt_util
+
+START = datetime(2021, 3, 1, tzinfo=dt_util.UTC)
+END = START + timedelta(days=1)
+
+
+def _after(time):
+    """Return the start of a fetch that includes events fired at time."""
+    return time - timedelta(microseconds=1)
+
+
+def test_day_in_progress_is_extended_by_settled_windows():
+    """Test only the unsettled part of a day is fetched again."""
+    calls = []
+
+    def fetch(start, end, context_lookup, entity_attr_cache):
+        calls.append((start, end))
+        context_lookup.setdefault(start, start)
+        return [{"when": start, "contexts": len(context_lookup)}]
+
+    committed_until = START
+    cache = LogbookDayCache(timedelta(minutes=15), dict, lambda: committed_until)
+
+    def get_day(now):
+        nonlocal committed_until
+        calls.clear()
+        committed_until = now
+        return cache.get_day("today", START, END, fetch)
+
+    ten = START + timedelta(hours=10)
+    quarter_past = ten + timedelta(minutes=15)
+
+    entries = get_day(ten + timedelta(minutes=7))
+    assert calls == [(START, ten), (_after(ten), END)]
+    assert [entry["contexts"] for entry in entries] == [2, 3]
+
+    # The window starting at 10:00 has not settled yet
+    entries = get_day(ten + timedelta(minutes=8))
+    assert calls == [(_after(ten), END)]
+    assert [entry["contexts"] for entry in entries] == [2, 3]
+
+    entries = get_day(ten + timedelta(minutes=25))
+    assert calls == [(_after(ten), quarter_past), (_after(quarter_past), END)]
+    assert [entry["contexts"] for entry in entries] == [2, 3, 4]
+
+    # Once the day has ended it is completed and kept
+    entries = get_day(END + timedelta(minutes=10))
+    assert calls == [(_after(quarter_past), END)]
+    assert [entry["when"] for entry in entries] == [
+        START,
+        _after(ten),
+        _after(quarter_past),
+    ]
+    assert get_day(END + timedelta(minutes=30)) == entries
+    assert calls == []
+    assert cache.stats == {"hits": 2, "misses": 3, "days": 1}
+
+    cache.async_clear()
+    assert cache.stats["days"] == 0
+    get_day(END + timedelta(minutes=30))
+    assert calls == [(START, END)]
+
+
+def test_day_not_settled_before_recorder_commits():
+    """Test windows the recorder has not committed yet are not cached."""
+    calls = []
+
+    def fetch(start, end, context_lookup, entity_attr_cache):
+        calls.append((start, end))
+        return []
+
+    committed_until = None
+    cache = LogbookDayCache(timedelta(minutes=15), dict, lambda: committed_until)
+
+    # The recorder has not committed since it started
+    cache.get_day("yesterday", START, END, fetch)
+    cache.get_day("yesterday", START, END, fetch)
+    assert calls == [(START, END), (START, END)]
+    assert cache.stats["days"] == 0
+
+    # The recorder is behind, the end of the day is not committed yet
+    calls.clear()
+    committed_until = END - timedelta(minutes=20)
+    cache.get_day("yesterday", START, END, fetch)
+    cache.get_day("yesterday", START, END, fetch)
+    settled = END - timedelta(minutes=30)
+    assert calls == [(START, settled), (_after(settled), END), (_after(settled), END)]
+
+    calls.clear()
+    committed_until = END
+    cache.get_day("yesterday", START, END, fetch)
+    cache.get_day("yesterday", START, END, fetch)
+    assert calls == [(_after(settled), END)]
+
+
+def test_fetch_does_not_block_other_days():
+    """Test a day is fetched while another day is being fetched."""
+    fetching = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch(start, end, context_lookup, entity_attr_cache):
+        calls.append(start)
+        fetching.set()
+        assert release.wait(5)
+        return [{"when": start}]
+
+    def fetch(start, end, context_lookup, entity_attr_cache):
+        calls.append(start)
+        return [{"when": start}]
+
+    cache = LogbookDayCache(timedelta(minutes=15), dict, lambda: END)
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(cache.get_day("slow", START, END, slow_fetch))
+        ),
+        threading.Thread(
+            target=lambda: results.append(cache.get_day("slow", START, END, fetch))
+        ),
+    ]
+    threads[0].start()
+    assert fetching.wait(5)
+    threads[1].start()
+
+    # Another day is not blocked by the fetch in progress
+    yesterday = START - timedelta(days=1)
+    assert cache.get_day("yesterday", yesterday, START, fetch) == [{"when": yesterday}]
+
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    # The second request of the day waited for the first fetch
+    assert calls == [START, yesterday]
+    assert results == [[{"when": START}], [{"when": START}]]
+    assert cache.stats == {"hits": 1, "misses": 2, "days": 2}
+    assert not cache._day_locks
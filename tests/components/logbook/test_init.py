@@ -570,6 +570,146 @@ async def test_logbook_view_end_time_entity(hass, hass_client):
     assert response_json[0]["entity_id"] == entity_id_test
 
 
+async def test_logbook_view_day_cache(hass, hass_client):
+    """Test completed days are cached until the recorder purges."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    day_cache = hass.data[logbook.DATA_DAY_CACHE]
+
+    yesterday = dt_util.start_of_local_day() - timedelta(days=1)
+    entity_id = "switch.test"
+    for hours, state in ((1, STATE_OFF), (2, STATE_ON), (3, STATE_OFF)):
+        with patch(
+            "homeassistant.util.dt.utcnow",
+            return_value=dt_util.as_utc(yesterday) + timedelta(hours=hours),
+        ):
+            hass.states.async_set(entity_id, state)
+    await _async_commit_and_wait(hass)
+
+    client = await hass_client()
+    response = await client.get(f"/api/logbook/{yesterday.isoformat()}")
+    assert response.status == 200
+    response_json = await response.json()
+    assert [entry["state"] for entry in response_json] == [STATE_ON, STATE_OFF]
+    assert day_cache.stats["misses"] == 1
+
+    with patch(
+        "homeassistant.util.dt.utcnow",
+        return_value=dt_util.as_utc(yesterday) + timedelta(hours=4),
+    ):
+        hass.states.async_set(entity_id, STATE_ON)
+    await _async_commit_and_wait(hass)
+
+    response = await client.get(f"/api/logbook/{yesterday.isoformat()}")
+    assert len(await response.json()) == 2
+    assert day_cache.stats["hits"] == 1
+
+    # A purge invalidates the cached days
+    await hass.services.async_call(recorder.DOMAIN, "purge", {"keep_days": 10})
+    await _async_commit_and_wait(hass)
+
+    response = await client.get(f"/api/logbook/{yesterday.isoformat()}")
+    assert len(await response.json()) == 3
+    assert day_cache.stats["misses"] == 2
+
+
+async def test_logbook_view_pages(hass, hass_client):
+    """Test the logbook view returns pages that continue with a cursor."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    for state in (STATE_OFF, STATE_ON, STATE_OFF, STATE_ON):
+        hass.states.async_set("switch.test", state)
+        hass.states.async_set("light.kitchen", state)
+    await _async_commit_and_wait(hass)
+
+    client = await hass_client()
+    expected = await _async_fetch_logbook(client)
+    assert len(expected) == 6
+
+    start = dt_util.utcnow().date()
+    start_date = datetime(start.year, start.month, start.day) - timedelta(hours=24)
+    end_time = start + timedelta(hours=48)
+    url = f"/api/logbook/{start_date.isoformat()}?end_time={end_time}&limit=4"
+
+    response = await client.get(url)
+    assert response.status == 200
+    page = await response.json()
+    assert page["entries"] == expected[:4]
+    assert page["cursor"] is not None
+
+    response = await client.get(f"{url}&cursor={page['cursor']}")
+    page = await response.json()
+    assert page == {"entries": expected[4:], "cursor": None}
+
+    for cursor in ("invalid", "1.-1", f"{10 ** 20}.0", f"-{10 ** 17}.0"):
+        response = await client.get(f"{url}&cursor={cursor}")
+        assert response.status == 400
+    response = await client.get(url.replace("limit=4", "limit=0"))
+    assert response.status == 400
+
+
+async def test_logbook_websocket_pages(hass, hass_ws_client):
+    """Test the logbook websocket command returns pages."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+
+    for state in (STATE_OFF, STATE_ON, STATE_OFF, STATE_ON):
+        hass.states.async_set("switch.test", state)
+        hass.states.async_set("light.kitchen", state)
+    await _async_commit_and_wait(hass)
+
+    client = await hass_ws_client()
+    entries = []
+    cursor = None
+    pages = 0
+    while True:
+        msg = {
+            "id": pages + 1,
+            "type": "logbook/get_events",
+            "start_time": start.isoformat(),
+            "entity_ids": ["switch.test"],
+            "limit": 2,
+        }
+        if cursor is not None:
+            msg["cursor"] = cursor
+        await client.send_json(msg)
+        response = await client.receive_json()
+        assert response["success"]
+        entries.extend(response["result"]["entries"])
+        cursor = response["result"]["cursor"]
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 2
+    assert [entry["state"] for entry in entries] == [STATE_ON, STATE_OFF, STATE_ON]
+    assert {entry["entity_id"] for entry in entries} == {"switch.test"}
+
+    await client.send_json(
+        {"id": 10, "type": "logbook/get_events", "start_time": "invalid"}
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_format"
+
+    await client.send_json(
+        {
+            "id": 11,
+            "type": "logbook/get_events",
+            "start_time": start.isoformat(),
+            "cursor": f"{10 ** 20}.0",
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_format"
+
+
 async def test_logbook_entity_filter_with_automations(hass, hass_client):
     """Test the logbook view with end_time and entity with automations and scripts."""
     await hass.async_add_executor_job(init_recorder_component, hass)
@@ -27,6 +27,8 @@ def trigger_db_commit(hass):
     for _ in range(recorder.DEFAULT_COMMIT_INTERVAL):
         # We only commit on time change
         fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    # Ticks stop once the events are committed, also end statistics periods
+    hass.data[recorder.DATA_INSTANCE].queue.put(recorder.CommitTask())
 
 
 def corrupt_db_file(test_db_file):
@@ -5,6 +5,7 @@ from unittest.mock import patch
 
 from sqlalchemy.exc import OperationalError
 
+from homeassistant.components import recorder
 from homeassistant.components.recorder import (
     CONF_DB_URL,
     CONFIG_SCHEMA,
@@ -19,7 +20,12 @@ from homeassistant.components.recorder import (
     run_information_from_instance,
     run_information_with_session,
 )
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import (
     EVENT_HOMEASSISTANT_STOP,
@@ -83,6 +89,84 @@ def test_saving_state(hass, hass_recorder):
     assert state == _state_empty_context(hass, entity_id)
 
 
+def test_saving_state_bulk_insert(hass, hass_recorder):
+    """Test saving states with the bulk insert writer."""
+    hass = hass_recorder({"bulk_insert": True})
+
+    entity_id = "test.recorder"
+    attributes = {"test_attr": 5, "test_attr_10": "nice"}
+
+    hass.states.set(entity_id, "on", attributes)
+    hass.states.set(entity_id, "off", attributes)
+    hass.states.set("test.other", "on")
+    hass.states.remove("test.other")
+    hass.bus.fire("test_event", {"some": "data"})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States).order_by(States.state_id))
+        assert [db_state.state for db_state in db_states] == ["on", "off", "on", None]
+        assert db_states[0].old_state_id is None
+        assert db_states[1].old_state_id == db_states[0].state_id
+        assert db_states[3].old_state_id == db_states[2].state_id
+        for db_state in db_states:
+            assert db_state.event.event_type == "state_changed"
+        assert db_states[1].to_native() == _state_empty_context(hass, entity_id)
+        last_state_id = db_states[1].state_id
+
+        db_events = list(session.query(Events).filter_by(event_type="test_event"))
+        assert len(db_events) == 1
+        assert db_events[0].to_native().data == {"some": "data"}
+
+    # Links continue across commits
+    hass.states.set(entity_id, "on", attributes)
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        db_state = session.query(States).order_by(States.state_id.desc()).first()
+        assert db_state.old_state_id == last_state_id
+
+    metrics = hass.data[DATA_INSTANCE].metrics
+    assert metrics["rows_written"] >= 10
+    assert metrics["rows_per_second"] > 0
+    assert metrics["queue_depth"] == 0
+
+    # A commit with nothing queued keeps the throughput of the last write
+    wait_recording_done(hass)
+    assert hass.data[DATA_INSTANCE].metrics == metrics
+
+
+def _assert_shared_state_attributes(hass):
+    """Set states with repeated attributes and check they are stored once."""
+    attributes = {"test_attr": 5, "test_attr_10": "nice"}
+
+    hass.states.set("test.one", "on", attributes)
+    hass.states.set("test.two", "on", attributes)
+    wait_recording_done(hass)
+    hass.states.set("test.one", "off", attributes)
+    hass.states.set("test.two", "off", {"test_attr": 6})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States).order_by(States.state_id))
+        assert len(db_states) == 4
+        assert all(db_state.attributes is None for db_state in db_states)
+        assert len({db_state.attributes_id for db_state in db_states}) == 2
+        assert db_states[2].to_native().attributes == attributes
+        assert db_states[3].to_native().attributes == {"test_attr": 6}
+        assert session.query(StateAttributes).count() == 2
+
+
+def test_saving_state_shares_attributes(hass, hass_recorder):
+    """Test identical attributes are stored once."""
+    _assert_shared_state_attributes(hass_recorder())
+
+
+def test_saving_state_shares_attributes_bulk_insert(hass, hass_recorder):
+    """Test identical attributes are stored once with the bulk insert writer."""
+    _assert_shared_state_attributes(hass_recorder({"bulk_insert": True}))
+
+
 def test_saving_state_with_exception(hass, hass_recorder, caplog):
     """Test saving and restoring a state."""
     hass = hass_recorder()
@@ -342,6 +426,54 @@ def test_saving_state_and_removing_entity(hass, hass_recorder):
         assert states[2].state is None
 
 
+def test_saving_state_batch(hass_recorder):
+    """Test saving a batch of states and filtering it."""
+    hass = hass_recorder({"exclude": {"entities": "test.excluded"}})
+    hass.add_job(
+        hass.states.async_set_many,
+        [
+            ("test.first", "on", None),
+            ("test.excluded", "on", None),
+            ("test.second", "off", {"brightness": 10}),
+        ],
+    )
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = [state.to_native() for state in session.query(States)]
+        assert session.query(Events).filter_by(event_type="state_changed").count() == 2
+
+    assert [(state.entity_id, state.state) for state in states] == [
+        ("test.first", "on"),
+        ("test.second", "off"),
+    ]
+    assert states[1].attributes == {"brightness": 10}
+
+
+def test_committed_until(hass_recorder):
+    """Test the recorder reports until when events are committed."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    before = dt_util.utcnow()
+    hass.states.set("test.recorder", "on")
+    wait_recording_done(hass)
+    assert instance.committed_until >= before
+    time_fired = hass.states.get("test.recorder").last_updated
+
+    # Events that are not dispatched yet hold back the committed time
+    later = dt_util.utcnow() + timedelta(hours=1)
+    with patch("homeassistant.util.dt.utcnow", return_value=later):
+        instance.queue.put(recorder.CommitTask())
+        instance.block_till_done()
+    assert time_fired <= instance.committed_until < later
+
+    # An event that is still queued holds back the committed time
+    instance._events_queued += 1
+    instance.queue.put(recorder.CommitTask())
+    instance.block_till_done()
+    assert instance.committed_until == time_fired
+
+
 def test_recorder_setup_failure():
     """Test some exceptions."""
     hass = get_test_home_assistant()
@@ -361,6 +493,7 @@ def test_recorder_setup_failure():
             entity_filter=CONFIG_SCHEMA({DOMAIN: {}}),
             exclude_t=[],
             db_integrity_check=False,
+            bulk_insert=False,
         )
         rec.start()
         rec.join()
@@ -3,9 +3,19 @@ from datetime import datetime, timedelta
 import json
 from unittest.mock import patch
 
+from sqlalchemy.exc import SQLAlchemyError
+
 from homeassistant.components import recorder
+from homeassistant.components.recorder import purge
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+    Statistics,
+    StatisticsShortTerm,
+)
 from homeassistant.components.recorder.purge import purge_old_data
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.util import dt as dt_util
@@ -13,10 +23,12 @@ from homeassistant.util import dt as dt_util
 from .common import wait_recording_done
 
 
+@patch("homeassistant.components.recorder.purge.PURGE_BATCH_SIZE", 2)
 def test_purge_old_states(hass, hass_recorder):
     """Test deleting old states."""
     hass = hass_recorder()
     _add_test_states(hass)
+    instance = hass.data[DATA_INSTANCE]
 
     # make sure we start with 6 states
     with session_scope(hass=hass) as session:
@@ -24,19 +36,197 @@ def test_purge_old_states(hass, hass_recorder):
         assert states.count() == 6
 
         # run purge_old_data()
-        finished = purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
+        finished = purge_old_data(instance, 4, repack=False)
         assert not finished
         assert states.count() == 4
+        assert instance.purge_cursor.stage == purge.STAGE_STATES
+        assert instance.purge_cursor.rows_deleted == 2
 
-        finished = purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
+        finished = purge_old_data(instance, 4, repack=False)
         assert not finished
         assert states.count() == 2
+        assert instance.metrics["purge"]["rows_deleted"] == 4
 
-        finished = purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
+        finished = purge_old_data(instance, 4, repack=False)
         assert finished
         assert states.count() == 2
+        assert instance.purge_cursor is None
+        assert instance.metrics["purge"] is None
+
+
+@patch("homeassistant.components.recorder.purge.PURGE_BATCH_SIZE", 2)
+def test_purge_resumes_from_cursor(hass, hass_recorder):
+    """Test a purge that failed continues after the last committed batch."""
+    hass = hass_recorder()
+    _add_test_states(hass)
+    instance = hass.data[DATA_INSTANCE]
+
+    with session_scope(hass=hass) as session:
+        states = session.query(States)
+
+        assert not purge_old_data(instance, 4, repack=False)
+        cursor = instance.purge_cursor
+        last_id = cursor.last_id
+        assert last_id > 0
+
+        with patch(
+            "homeassistant.components.recorder.purge._purge_rows",
+            side_effect=SQLAlchemyError,
+        ):
+            assert purge_old_data(instance, 4, repack=False)
+        assert instance.purge_cursor is cursor
+        assert cursor.last_id == last_id
+        assert states.count() == 4
+
+        assert not purge_old_data(instance, 4, repack=False)
+        assert instance.purge_cursor is cursor
+        assert cursor.last_id > last_id
+        assert states.count() == 2
+
+
+def test_purge_unused_state_attributes(hass, hass_recorder):
+    """Test shared attributes are purged once no state uses them."""
+    hass = hass_recorder()
+    _add_test_states(hass)
+
+    with session_scope(hass=hass) as session:
+        session.add(StateAttributes(attributes_id=1, shared_attrs='{"old": true}'))
+        session.add(StateAttributes(attributes_id=2, shared_attrs='{"new": true}'))
+        for db_state in session.query(States).filter_by(state="dontpurgeme"):
+            db_state.attributes_id = 2
+
+    with session_scope(hass=hass) as session:
+        state_attributes = session.query(StateAttributes)
+        assert state_attributes.count() == 2
+
+        while not purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False):
+            pass
+
+        assert [row.attributes_id for row in state_attributes] == [2]
+
+
+@patch("homeassistant.components.recorder.purge.PURGE_BATCH_SIZE", 2)
+def test_purge_unused_state_attributes_in_batches(hass, hass_recorder):
+    """Test unused shared attributes are purged in batches."""
+    hass = hass_recorder()
+    _add_test_states(hass)
+    instance = hass.data[DATA_INSTANCE]
+
+    with session_scope(hass=hass) as session:
+        for attributes_id in range(1, 7):
+            session.add(
+                StateAttributes(
+                    attributes_id=attributes_id,
+                    shared_attrs=f'{{"id": {attributes_id}}}',
+                )
+            )
+        db_states = session.query(States).filter_by(state="dontpurgeme")
+        for db_state, attributes_id in zip(db_states, (2, 5)):
+            db_state.attributes_id = attributes_id
+
+    with session_scope(hass=hass) as session:
+        while not purge_old_data(instance, 4, repack=False):
+            pass
+
+        state_attributes = session.query(StateAttributes)
+        assert [row.attributes_id for row in state_attributes] == [2, 5]
+
+
+def test_purge_keeps_uncommitted_state_attributes(hass, hass_recorder):
+    """Test shared attributes of states that are not committed yet are kept."""
+    # Only commit when the test waits for the recording to be done
+    hass = hass_recorder({"commit_interval": 3600})
+    instance = hass.data[DATA_INSTANCE]
+    hass.states.set("test.old", "on", {"shared": True})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        session.query(States).update(
+            {States.last_updated: dt_util.utcnow() - timedelta(days=11)}
+        )
+
+    # The new state reuses the cached id of the shared attributes
+    rows_written = instance.metrics["rows_written"]
+    hass.states.set("test.new", "on", {"shared": True})
+    hass.block_till_done()
+    instance.do_adhoc_purge(keep_days=4)
+    instance.block_till_done()
+    # The event and state were committed by the recorder before the purge
+    assert instance.metrics["rows_written"] == rows_written + 2
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        db_state = session.query(States).one()
+        assert db_state.entity_id == "test.new"
+        assert (
+            session.query(StateAttributes)
+            .filter_by(attributes_id=db_state.attributes_id)
+            .count()
+            == 1
+        )
+
+
+def test_purge_keeps_statistics(hass, hass_recorder):
+    """Test the statistics of purged states are kept."""
+    hass = hass_recorder()
+    _add_test_states(hass)
+    eleven_days_ago = dt_util.utcnow() - timedelta(days=11)
+
+    with session_scope(hass=hass) as session:
+        session.add(
+            Statistics(
+                entity_id="test.recorder2",
+                start=eleven_days_ago,
+                mean=5,
+                min=5,
+                max=5,
+                sum=5,
+                count=1,
+            )
+        )
+
+    with session_scope(hass=hass) as session:
+        while not purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False):
+            pass
+
+        assert session.query(States).count() == 2
+        assert session.query(Statistics).count() == 1
+
+
+@patch("homeassistant.components.recorder.purge.PURGE_BATCH_SIZE", 2)
+def test_purge_old_short_term_statistics(hass, hass_recorder):
+    """Test deleting old five minute statistics in batches."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    now = dt_util.utcnow()
+
+    with session_scope(hass=hass) as session:
+        for days in (11, 10, 5, 1):
+            session.add(
+                StatisticsShortTerm(
+                    entity_id="sensor.test",
+                    start=now - timedelta(days=days),
+                    mean=days,
+                    min=days,
+                    max=days,
+                    sum=days,
+                    count=1,
+                )
+            )
+
+    with session_scope(hass=hass) as session:
+        statistics = session.query(StatisticsShortTerm)
+        assert not purge_old_data(instance, 4, repack=False)
+        assert statistics.count() == 2
+        assert instance.purge_cursor.stage == purge.STAGE_STATISTICS_SHORT_TERM
+
+        while not purge_old_data(instance, 4, repack=False):
+            pass
+        assert statistics.count() == 1
+        assert statistics.one().mean == 1
 
 
+@patch("homeassistant.components.recorder.purge.PURGE_BATCH_SIZE", 2)
 def test_purge_old_events(hass, hass_recorder):
     """Test deleting old events."""
     hass = hass_recorder()
@@ -138,7 +328,7 @@ def test_purge_method(hass, hass_recorder):
             hass.data[DATA_INSTANCE].block_till_done()
             wait_recording_done(hass)
             assert (
-                mock_logger.debug.mock_calls[5][1][0]
+                mock_logger.debug.mock_calls[7][1][0]
                 == "Vacuuming SQL DB to free space"
             )
 
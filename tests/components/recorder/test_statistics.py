@@ -0,0 +1,118 @@
+"""The tests for the recorder statistics."""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from homeassistant.components.recorder.models import Statistics
+from homeassistant.components.recorder.statistics import (
+    PERIOD_5MINUTE,
+    PERIOD_HOUR,
+    StatisticsCompiler,
+    period_start,
+    statistics_during_period,
+)
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import State
+import homeassistant.util.dt as dt_util
+
+from .common import wait_recording_done
+
+ZERO = datetime(2021, 3, 1, 10, 2, 30, tzinfo=dt_util.UTC)
+
+
+def _set_state(hass, point_in_time, entity_id, state):
+    """Set a state at a point in time and wait for it to be recorded."""
+    with patch("homeassistant.util.dt.utcnow", return_value=point_in_time):
+        hass.states.set(entity_id, state, {"unit_of_measurement": "°C"})
+        wait_recording_done(hass)
+
+
+def test_period_start():
+    """Test the start of the period of a point in time."""
+    assert period_start(PERIOD_5MINUTE, ZERO) == datetime(
+        2021, 3, 1, 10, 0, tzinfo=dt_util.UTC
+    )
+    assert period_start(PERIOD_5MINUTE, ZERO + timedelta(minutes=5)) == datetime(
+        2021, 3, 1, 10, 5, tzinfo=dt_util.UTC
+    )
+    assert period_start(PERIOD_HOUR, ZERO) == datetime(
+        2021, 3, 1, 10, 0, tzinfo=dt_util.UTC
+    )
+
+
+def test_compile_statistics(hass_recorder):
+    """Test numeric sensor states are rolled into statistics once a period ends."""
+    hass = hass_recorder()
+
+    _set_state(hass, ZERO, "sensor.temperature", "10")
+    _set_state(hass, ZERO + timedelta(minutes=1), "sensor.temperature", "20")
+    _set_state(hass, ZERO + timedelta(minutes=2), "sensor.temperature", "30")
+    _set_state(hass, ZERO + timedelta(minutes=6), "sensor.temperature", "50")
+    _set_state(hass, ZERO, "sensor.text", "hello")
+    _set_state(hass, ZERO, "light.kitchen", "15")
+
+    start = datetime(2021, 3, 1, 10, 0, tzinfo=dt_util.UTC)
+    # The hour has not ended yet
+    assert statistics_during_period(hass, start, period=PERIOD_HOUR) == {}
+    stats = statistics_during_period(hass, start, period=PERIOD_5MINUTE)
+    assert stats == {
+        "sensor.temperature": [
+            {
+                "entity_id": "sensor.temperature",
+                "start": start,
+                "mean": 20.0,
+                "min": 10.0,
+                "max": 30.0,
+                "sum": 60.0,
+            }
+        ]
+    }
+
+    with patch("homeassistant.util.dt.utcnow", return_value=start + timedelta(hours=1)):
+        wait_recording_done(hass)
+
+    stats = statistics_during_period(hass, start, period=PERIOD_5MINUTE)
+    assert [stat["mean"] for stat in stats["sensor.temperature"]] == [20.0, 50.0]
+    stats = statistics_during_period(hass, start, period=PERIOD_HOUR)
+    assert stats == {
+        "sensor.temperature": [
+            {
+                "entity_id": "sensor.temperature",
+                "start": start,
+                "mean": 27.5,
+                "min": 10.0,
+                "max": 50.0,
+                "sum": 110.0,
+            }
+        ]
+    }
+    assert (
+        statistics_during_period(hass, start + timedelta(hours=1), period=PERIOD_HOUR)
+        == {}
+    )
+
+
+def test_compile_statistics_merges_existing_rows(hass_recorder):
+    """Test a period written twice, for example across a restart, is merged."""
+    hass = hass_recorder()
+    start = datetime(2021, 3, 1, 10, 0, tzinfo=dt_util.UTC)
+    end = start + timedelta(hours=1)
+
+    for values in ((10, 20), (60,)):
+        compiler = StatisticsCompiler()
+        for value in values:
+            compiler.add_state(
+                State("sensor.temperature", str(value), last_updated=ZERO)
+            )
+        finished = compiler.finished(end)
+        with session_scope(hass=hass) as session:
+            compiler.add_to_session(session, finished)
+        compiler.discard(finished)
+        assert compiler.finished(end) == {PERIOD_5MINUTE: [], PERIOD_HOUR: []}
+
+    with session_scope(hass=hass) as session:
+        rows = session.query(Statistics).all()
+        assert len(rows) == 1
+        assert rows[0].count == 3
+        assert rows[0].mean == 30.0
+        assert rows[0].min == 10.0
+        assert rows[0].max == 60.0
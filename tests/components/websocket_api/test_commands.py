@@ -11,12 +11,18 @@ from homeassistant.components.websocket_api.auth import (
 from homeassistant.components.websocket_api.const import URL
 from homeassistant.core import Context, callback
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers import entity
+from homeassistant.helpers import device_registry, entity, entity_registry
 from homeassistant.helpers.typing import HomeAssistantType
 from homeassistant.loader import async_get_integration
 from homeassistant.setup import async_setup_component
 
-from tests.common import MockEntity, MockEntityPlatform, async_mock_service
+from tests.common import (
+    MockEntity,
+    MockEntityPlatform,
+    async_mock_service,
+    mock_device_registry,
+    mock_registry,
+)
 
 
 async def test_call_service(hass, websocket_client):
@@ -516,6 +522,121 @@ async def test_subscribe_unsubscribe_events_state_changed(
     assert msg["event"]["data"]["entity_id"] == "light.permitted"
 
 
+async def test_subscribe_entities(hass, websocket_client):
+    """Test subscribe entities sends a snapshot and then state diffs."""
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100, "effect": "x"})
+    hass.states.async_set("switch.fan", "off")
+    hass.states.async_set("sensor.temperature", "20")
+    kitchen = hass.states.get("light.kitchen")
+
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "subscribe_entities",
+            "entity_ids": ["light.kitchen"],
+            "domains": ["switch"],
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "a": {
+            "light.kitchen": {
+                "s": "on",
+                "a": {"brightness": 100, "effect": "x"},
+                "c": kitchen.context.id,
+                "lc": kitchen.last_changed.timestamp(),
+            },
+            "switch.fan": {
+                "s": "off",
+                "a": {},
+                "c": hass.states.get("switch.fan").context.id,
+                "lc": hass.states.get("switch.fan").last_changed.timestamp(),
+            },
+        }
+    }
+
+    hass.states.async_set("sensor.temperature", "21")
+    hass.states.async_set("light.kitchen", "on", {"brightness": 50})
+    msg = await websocket_client.receive_json()
+    kitchen = hass.states.get("light.kitchen")
+    assert msg["event"] == {
+        "c": {
+            "light.kitchen": {
+                "+": {
+                    "lu": kitchen.last_updated.timestamp(),
+                    "c": kitchen.context.id,
+                    "a": {"brightness": 50},
+                },
+                "-": {"a": ["effect"]},
+            }
+        }
+    }
+
+    hass.states.async_set("switch.heater", "on")
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["a"]) == ["switch.heater"]
+
+    hass.states.async_remove("switch.fan")
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"r": ["switch.fan"]}
+
+
+async def test_subscribe_entities_area(hass, websocket_client):
+    """Test subscribe entities resolves areas through devices."""
+    mock_device_registry(
+        hass,
+        {
+            "device-1": device_registry.DeviceEntry(id="device-1", area_id="kitchen"),
+            "device-2": device_registry.DeviceEntry(id="device-2", area_id="garage"),
+        },
+    )
+    mock_registry(
+        hass,
+        {
+            "light.in_area": entity_registry.RegistryEntry(
+                entity_id="light.in_area",
+                unique_id="1",
+                platform="demo",
+                area_id="kitchen",
+            ),
+            "light.on_device": entity_registry.RegistryEntry(
+                entity_id="light.on_device",
+                unique_id="2",
+                platform="demo",
+                device_id="device-1",
+            ),
+            "light.moved": entity_registry.RegistryEntry(
+                entity_id="light.moved",
+                unique_id="3",
+                platform="demo",
+                device_id="device-1",
+                area_id="garage",
+            ),
+        },
+    )
+    for entity_id in ("light.in_area", "light.on_device", "light.moved"):
+        hass.states.async_set(entity_id, "off")
+
+    await websocket_client.send_json(
+        {"id": 5, "type": "subscribe_entities", "area_ids": ["kitchen"]}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert set(msg["event"]["a"]) == {"light.in_area", "light.on_device"}
+
+    hass.states.async_set("light.moved", "on")
+    hass.states.async_set("light.on_device", "on")
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["c"]) == ["light.on_device"]
+
+
 async def test_render_template_renders_template(hass, websocket_client):
     """Test simple template is rendered and updated."""
     hass.states.async_set("light.test", "on")
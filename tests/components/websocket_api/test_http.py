@@ -80,3 +80,52 @@ async def test_non_json_message(hass, websocket_client, caplog):
         f"Unable to serialize to JSON. Bad data found at $.result[0](state: test_domain.entity).attributes.bad={bad_data}(<class 'object'>"
         in caplog.text
     )
+
+
+async def test_coalesce_messages(hass, hass_ws_client):
+    """Test pending messages are sent in one frame when the client opts in."""
+    orig_handler = http.WebSocketHandler
+    instance = None
+
+    def instantiate_handler(*args):
+        nonlocal instance
+        instance = orig_handler(*args)
+        return instance
+
+    with patch(
+        "homeassistant.components.websocket_api.http.WebSocketHandler",
+        instantiate_handler,
+    ):
+        websocket_client = await hass_ws_client()
+
+    # Without the feature every message is a frame
+    instance._send_message({"id": 1, "type": "pong"})
+    instance._send_message({"id": 2, "type": "pong"})
+    assert await websocket_client.receive_json() == {"id": 1, "type": "pong"}
+    assert await websocket_client.receive_json() == {"id": 2, "type": "pong"}
+
+    await websocket_client.send_json(
+        {
+            "id": 3,
+            "type": "supported_features",
+            "features": {const.FEATURE_COALESCE_MESSAGES: 1},
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    frames_sent = instance.frames_sent
+
+    for idx in range(4, 7):
+        instance._send_message({"id": idx, "type": "pong"})
+    assert await websocket_client.receive_json() == [
+        {"id": 4, "type": "pong"},
+        {"id": 5, "type": "pong"},
+        {"id": 6, "type": "pong"},
+    ]
+    assert instance.frames_sent == frames_sent + 1
+    assert instance.messages_coalesced == 3
+    assert instance.bytes_sent > 0
+
+    # A single pending message is not wrapped
+    await websocket_client.send_json({"id": 7, "type": "ping"})
+    assert await websocket_client.receive_json() == {"id": 7, "type": "pong"}
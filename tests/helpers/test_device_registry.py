@@ -1247,3 +1247,44 @@ async def test_disable_config_entry_disables_devices(hass, registry):
     entry2 = registry.async_get(entry2.id)
     assert entry2.disabled
     assert entry2.disabled_by == "user"
+
+
+async def test_entries_by_secondary_index(hass, registry):
+    """Test the area and config entry indexes follow updates and removals."""
+    entry1 = registry.async_get_or_create(
+        config_entry_id="1234", connections={("mac", "12:34:56:AB:CD:EF")}
+    )
+    entry2 = registry.async_get_or_create(
+        config_entry_id="1234", connections={("mac", "34:56:AB:CD:EF:12")}
+    )
+    entry1 = registry.async_update_device(entry1.id, area_id="kitchen")
+    entry2 = registry.async_get_or_create(
+        config_entry_id="5678", connections={("mac", "34:56:AB:CD:EF:12")}
+    )
+
+    assert device_registry.async_entries_for_area(registry, "kitchen") == [entry1]
+    assert device_registry.async_entries_for_config_entry(registry, "1234") == [
+        entry1,
+        entry2,
+    ]
+    assert device_registry.async_entries_for_config_entry(registry, "5678") == [entry2]
+
+    # Devices keep their place when an unrelated attribute changes
+    entry1 = registry.async_update_device(entry1.id, name="Renamed")
+    assert device_registry.async_entries_for_config_entry(registry, "1234") == [
+        entry1,
+        entry2,
+    ]
+
+    registry.async_clear_area_id("kitchen")
+    assert device_registry.async_entries_for_area(registry, "kitchen") == []
+
+    registry.async_clear_config_entry("1234")
+    assert device_registry.async_entries_for_config_entry(registry, "1234") == []
+    assert device_registry.async_entries_for_config_entry(registry, "5678") == [
+        registry.async_get(entry2.id)
+    ]
+
+    registry.async_remove_device(entry2.id)
+    assert device_registry.async_entries_for_config_entry(registry, "5678") == []
+    assert registry._secondary_index == {}
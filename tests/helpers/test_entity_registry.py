@@ -895,3 +895,32 @@ async def test_disabled_entities_excluded_from_entity_list(hass, registry):
         registry, device_entry.id, include_disabled_entities=True
     )
     assert entries == [entry1, entry2]
+
+
+async def test_entries_by_secondary_index(hass, registry):
+    """Test the secondary indexes follow updates and removals."""
+    entry1 = registry.async_get_or_create(
+        "light", "hue", "1234", device_id="device-1", config_entry=None
+    )
+    entry2 = registry.async_get_or_create("light", "hue", "5678", device_id="device-1")
+    entry1 = registry.async_update_entity(entry1.entity_id, area_id="kitchen")
+
+    assert registry.async_entries_by("device_id", "device-1") == [entry1, entry2]
+    assert registry.async_entries_by("area_id", "kitchen") == [entry1]
+    assert registry.async_entries_by("area_id", "unknown") == []
+
+    # Entries keep their place when an unrelated attribute changes
+    entry1 = registry.async_update_entity(entry1.entity_id, name="Renamed")
+    assert registry.async_entries_by("device_id", "device-1") == [entry1, entry2]
+    assert registry.async_entries_by("area_id", "kitchen") == [entry1]
+
+    registry.async_clear_area_id("kitchen")
+    assert registry.async_entries_by("area_id", "kitchen") == []
+    entry1 = registry.async_get(entry1.entity_id)
+    assert entity_registry.async_entries_for_device(registry, "device-1") == [
+        entry1,
+        entry2,
+    ]
+
+    registry.async_remove(entry2.entity_id)
+    assert registry.async_entries_by("device_id", "device-1") == [entry1]
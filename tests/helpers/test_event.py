@@ -15,10 +15,12 @@ from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.event import (
+    TRACK_TEMPLATE_INDEX,
     TrackStates,
     TrackTemplate,
     TrackTemplateResult,
     async_call_later,
+    async_pending_timer_count,
     async_track_point_in_time,
     async_track_point_in_utc_time,
     async_track_same_state,
@@ -1218,6 +1220,166 @@ async def test_track_template_result_with_wildcard(hass):
     assert "cover.office_skylight=open" in specific_runs[0]
 
 
+async def test_track_template_result_shared_index(hass):
+    """Test template trackers share one state_changed listener."""
+    hass.states.async_set("sensor.a", "1")
+    listeners = hass.bus.async_listeners().get(ha.EVENT_STATE_CHANGED, 0)
+    results = []
+
+    @ha.callback
+    def refresh_listener(event, updates):
+        results.append(updates.pop().result)
+
+    infos = [
+        async_track_template_result(
+            hass,
+            [TrackTemplate(Template(template, hass), None)],
+            refresh_listener,
+        )
+        for template in (
+            "{{ states('sensor.a') }}",
+            "{{ states('sensor.a') | int + 1 }}",
+            "{{ states.light | count }}",
+            "{{ states | count }}",
+        )
+    ]
+    assert hass.bus.async_listeners()[ha.EVENT_STATE_CHANGED] == listeners + 1
+
+    hass.states.async_set("sensor.a", "2")
+    await hass.async_block_till_done()
+    assert results == [2, 3]
+
+    results.clear()
+    hass.states.async_set("light.kitchen", "on")
+    await hass.async_block_till_done()
+    assert results == [2, 1]
+
+    for info in infos:
+        info.async_remove()
+    assert hass.bus.async_listeners().get(ha.EVENT_STATE_CHANGED, 0) == listeners
+
+    hass.states.async_set("sensor.a", "3")
+    await hass.async_block_till_done()
+    assert results == [2, 1]
+
+
+async def test_track_template_result_state_batch(hass):
+    """Test a batch of state changes renders a template once."""
+    hass.states.async_set("sensor.a", "1")
+    hass.states.async_set("sensor.b", "1")
+    results = []
+
+    @ha.callback
+    def refresh_listener(event, updates):
+        results.append(updates.pop().result)
+
+    async_track_template_result(
+        hass,
+        [
+            TrackTemplate(
+                Template(
+                    "{{ states('sensor.a') | int + states('sensor.b') | int }}", hass
+                ),
+                None,
+            )
+        ],
+        refresh_listener,
+    )
+    hass.data[TRACK_TEMPLATE_INDEX].renders = 0
+
+    hass.states.async_set_many(
+        [("sensor.a", "2", None), ("sensor.b", "2", None), ("sensor.a", "3", None)]
+    )
+    await hass.async_block_till_done()
+    assert results == [5]
+    stats = hass.data[TRACK_TEMPLATE_INDEX].stats
+    assert stats["renders"] == 1
+    assert stats["skipped"] == 1
+
+
+async def test_track_template_result_skips_unchanged_reads(hass):
+    """Test templates are not re-rendered when the values they read are unchanged."""
+    hass.states.async_set("light.kitchen", "on", {"brightness": 10, "color": "red"})
+    results = []
+
+    @ha.callback
+    def refresh_listener(event, updates):
+        results.append(updates.pop().result)
+
+    info = async_track_template_result(
+        hass,
+        [
+            TrackTemplate(
+                Template(
+                    "{{ states('light.kitchen') }} "
+                    "{{ state_attr('light.kitchen', 'brightness') }}",
+                    hass,
+                ),
+                None,
+            )
+        ],
+        refresh_listener,
+    )
+    stats = hass.data[TRACK_TEMPLATE_INDEX].stats
+    assert stats["renders"] == 0
+
+    # Only an attribute the template does not read changed
+    hass.states.async_set("light.kitchen", "on", {"brightness": 10, "color": "blue"})
+    await hass.async_block_till_done()
+    assert results == []
+    stats = hass.data[TRACK_TEMPLATE_INDEX].stats
+    assert stats["renders"] == 0
+    assert stats["skipped"] == 1
+
+    hass.states.async_set("light.kitchen", "on", {"brightness": 20, "color": "blue"})
+    await hass.async_block_till_done()
+    assert results == ["on 20"]
+
+    hass.states.async_set("light.kitchen", "off", {"brightness": 20})
+    await hass.async_block_till_done()
+    assert results == ["on 20", "off 20"]
+
+    hass.states.async_remove("light.kitchen")
+    await hass.async_block_till_done()
+    assert results == ["on 20", "off 20", "unknown None"]
+    assert hass.data[TRACK_TEMPLATE_INDEX].stats == {
+        "trackers": 1,
+        "renders": 3,
+        "skipped": 1,
+        "skip_rate": 0.25,
+    }
+
+    info.async_remove()
+
+
+async def test_track_template_result_whole_state_not_skipped(hass):
+    """Test templates using a whole state or a time are always re-rendered."""
+    hass.states.async_set("light.kitchen", "on", {"color": "red"})
+    results = []
+
+    @ha.callback
+    def refresh_listener(event, updates):
+        results.extend(update.result for update in updates)
+
+    async_track_template_result(
+        hass,
+        [
+            TrackTemplate(
+                Template("{{ states.light.kitchen.attributes.color }}", hass), None
+            ),
+            TrackTemplate(
+                Template("{{ states('light.kitchen') }} {{ now().year }}", hass), None
+            ),
+        ],
+        refresh_listener,
+    )
+
+    hass.states.async_set("light.kitchen", "on", {"color": "blue"})
+    await hass.async_block_till_done()
+    assert "blue" in results
+    assert hass.data[TRACK_TEMPLATE_INDEX].stats["skipped"] == 0
+
+
 async def test_track_template_result_with_group(hass):
     """Test tracking template with a group."""
     hass.states.async_set("sensor.power_1", 0)
@@ -3049,6 +3211,26 @@ async def test_async_call_later(hass):
     assert remove is mock()
 
 
+async def test_pending_timer_count(hass):
+    """Test time trackers share the timer wheel and count pending timers."""
+    calls = []
+    now = dt_util.utcnow()
+    assert async_pending_timer_count(hass) == 0
+
+    unsub = async_call_later(hass, 10, calls.append)
+    async_track_point_in_utc_time(hass, calls.append, now + timedelta(seconds=5))
+    async_track_point_in_utc_time(hass, calls.append, now + timedelta(seconds=5))
+    assert async_pending_timer_count(hass) == 3
+
+    unsub()
+    assert async_pending_timer_count(hass) == 2
+
+    async_fire_time_changed(hass, now + timedelta(seconds=20))
+    await hass.async_block_till_done()
+    assert calls == [now + timedelta(seconds=5)] * 2
+    assert async_pending_timer_count(hass) == 0
+
+
 async def test_track_state_change_event_chain_multple_entity(hass):
     """Test that adding a new state tracker inside a tracker does not fire right away."""
     tracker_called = []
@@ -0,0 +1,145 @@
+"""Tests for the entity poll scheduler."""
+import asyncio
+from datetime import timedelta
+import logging
+
+from homeassistant.helpers import polling
+from homeassistant.helpers.entity_component import EntityComponent
+import homeassistant.util.dt as dt_util
+
+from tests.common import MockEntity, async_fire_time_changed
+
+_LOGGER = logging.getLogger(__name__)
+DOMAIN = "test_domain"
+
+
+class PolledEntity(MockEntity):
+    """Entity that counts its updates."""
+
+    def __init__(self, **values):
+        """Initialize the entity."""
+        super().__init__(should_poll=True, **values)
+        self.updates = 0
+
+    async def async_update(self):
+        """Count the update."""
+        self.updates += 1
+
+
+async def _async_add_entities(hass, entities):
+    """Add polling entities and return their platform."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
+    await component.async_add_entities(entities)
+    return next(iter(entities)).platform
+
+
+async def test_polls_spread_over_interval(hass):
+    """Test entities added together poll at different times."""
+    start = dt_util.utcnow()
+    entities = [PolledEntity() for _ in range(4)]
+    await _async_add_entities(hass, entities)
+
+    polled = []
+    for seconds in (4, 9, 16):
+        async_fire_time_changed(hass, start + timedelta(seconds=seconds))
+        await hass.async_block_till_done()
+        polled.append(sum(entity.updates for entity in entities))
+
+    assert polled == [1, 2, 3]
+    # The first entity waits a full interval
+    assert entities[0].updates == 0
+
+
+async def test_backoff_unchanged_state(hass):
+    """Test an entity with an unchanged state is polled less often."""
+    entity = PolledEntity(state="on")
+    platform = await _async_add_entities(hass, [entity])
+
+    # The poll that backs off already scheduled the next one
+    polls = polling.UNCHANGED_POLLS_BEFORE_BACKOFF + 1
+    for _ in range(polls):
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=20))
+        await hass.async_block_till_done()
+    assert entity.updates == polls
+    assert platform.poll_stats["backed_off"] == 1
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=20))
+    await hass.async_block_till_done()
+    assert entity.updates == polls
+
+    # A changed state goes back to the scan interval
+    entity._values["state"] = "off"
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=40))
+    await hass.async_block_till_done()
+    assert entity.updates == polls + 1
+    assert hass.states.get(entity.entity_id).state == "off"
+    assert platform.poll_stats["backed_off"] == 0
+
+    for _ in range(2):
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=40))
+        await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=20))
+    await hass.async_block_till_done()
+    assert entity.updates == polls + 4
+
+
+async def test_skip_poll_while_updating(hass, caplog):
+    """Test an entity is not polled again while its update is running."""
+    release = asyncio.Event()
+
+    class SlowEntity(PolledEntity):
+        """Entity with an update that waits."""
+
+        async def async_update(self):
+            """Wait for the test."""
+            self.updates += 1
+            await release.wait()
+
+    entity = SlowEntity()
+    platform = await _async_add_entities(hass, [entity])
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=20))
+    await asyncio.sleep(0)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=40))
+    await asyncio.sleep(0)
+    assert entity.updates == 1
+    assert "took longer than the scheduled update interval" in caplog.text
+
+    release.set()
+    await hass.async_block_till_done()
+    stats = platform.poll_stats
+    assert stats["polls"] == 1
+    assert stats["skipped"] == 1
+    assert sum(stats["latency"].values()) == 1
+    assert stats["latency_sum"] > 0
+
+
+async def test_stop_polling_removed_entity(hass):
+    """Test removed entities are no longer polled."""
+    entity = PolledEntity()
+    platform = await _async_add_entities(hass, [entity])
+    assert platform.poll_stats["entities"] == 1
+
+    await platform.async_remove_entity(entity.entity_id)
+    assert platform.poll_stats["entities"] == 0
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=20))
+    await hass.async_block_till_done()
+    assert entity.updates == 0
+
+
+async def test_poll_entity_that_starts_polling(hass):
+    """Test an entity is polled once it starts to poll after it was added."""
+    entity = PolledEntity()
+    entity._values["should_poll"] = False
+    await _async_add_entities(hass, [entity])
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=20))
+    await hass.async_block_till_done()
+    assert entity.updates == 0
+
+    # For example when its push connection dropped
+    entity._values["should_poll"] = True
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=40))
+    await hass.async_block_till_done()
+    assert entity.updates == 1
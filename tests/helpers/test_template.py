@@ -1,5 +1,5 @@
 """Test Home Assistant template helper methods."""
-from datetime import datetime
+from datetime import datetime, timedelta
 import math
 import random
 from unittest.mock import patch
@@ -18,13 +18,19 @@ from homeassistant.const import (
     TEMP_CELSIUS,
     VOLUME_LITERS,
 )
+from homeassistant.core import State
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers import template
 from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import UnitSystem
 
-from tests.common import MockConfigEntry, mock_device_registry, mock_registry
+from tests.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    mock_device_registry,
+    mock_registry,
+)
 
 
 def _set_up_units(hass):
@@ -832,6 +838,41 @@ def test_state_attr(hass):
     assert tpl.async_render() is True
 
 
+def test_render_info_state_reads(hass):
+    """Test the render info compares the state values that were read."""
+    hass.states.async_set("light.kitchen", "on", {"brightness": 10, "color": "red"})
+    info = template.Template(
+        "{{ states.light.kitchen.state_with_unit }} "
+        "{{ state_attr('light.kitchen', 'brightness') }} "
+        "{{ is_state('light.missing', 'on') }}",
+        hass,
+    ).async_render_to_info()
+    assert_result_info(info, "on 10 False", ["light.kitchen", "light.missing"])
+
+    state = State("light.kitchen", "on", {"brightness": 10, "color": "blue"})
+    assert not info.state_read_changed("light.kitchen", state)
+    state = State("light.kitchen", "on", {"brightness": 10, "unit_of_measurement": "%"})
+    assert info.state_read_changed("light.kitchen", state)
+    state = State("light.kitchen", "off", {"brightness": 10})
+    assert info.state_read_changed("light.kitchen", state)
+    assert info.state_read_changed("light.kitchen", None)
+    assert not info.state_read_changed("light.missing", None)
+    assert info.state_read_changed("light.missing", State("light.missing", "on"))
+    assert info.state_read_changed("light.other", None)
+
+    info = template.Template(
+        "{{ states.light.kitchen.attributes.color }}", hass
+    ).async_render_to_info()
+    state = State("light.kitchen", "on", {"brightness": 20, "color": "red"})
+    assert info.state_read_changed("light.kitchen", state)
+
+    info = template.Template(
+        "{{ states.light | count }} {{ states('light.kitchen') }}", hass
+    ).async_render_to_info()
+    state = State("light.kitchen", "on")
+    assert info.state_read_changed("light.kitchen", state)
+
+
 def test_states_function(hass):
     """Test using states as a function."""
     hass.states.async_set("test.object", "available")
@@ -2156,6 +2197,11 @@ async def test_cache_garbage_collection():
         template_string
     )  # pylint: disable=protected-access
     del tpl2
+    # Recently compiled templates are kept alive
+    assert template._NO_HASS_ENV.template_cache.get(
+        template_string
+    )  # pylint: disable=protected-access
+    template._NO_HASS_ENV.hot_template_cache.pop(template_string)
     assert not template._NO_HASS_ENV.template_cache.get(
         template_string
     )  # pylint: disable=protected-access
@@ -2509,3 +2555,146 @@ async def test_parse_result(hass):
         ("0011101.00100001010001", "0011101.00100001010001"),
     ):
         assert template.Template(tpl, hass).async_render() == result
+
+
+async def test_bytecode_cache(hass, hass_storage):
+    """Test compiled templates are saved and reused by the next run."""
+    await template.async_load_bytecode_cache(hass)
+    cache = hass.data[template._BYTECODE_CACHE]
+
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    template.TemplateEnvironment(hass, limited=True).compile("{{ 1 + 1 }}")
+    assert cache.stats == {"hits": 0, "misses": 2, "templates": 2}
+
+    await hass.async_block_till_done()
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=template.BYTECODE_SAVE_DELAY)
+    )
+    await hass.async_block_till_done()
+    data = hass_storage[template.BYTECODE_STORAGE_KEY]["data"]
+    assert sorted(key.split(":")[0] for key in data["templates"]) == [
+        template.FLAVOUR_LIMITED,
+        template.FLAVOUR_NORMAL,
+    ]
+
+    # A new run reuses the saved code
+    hass.data.pop(template._ENVIRONMENT)
+    await template.async_load_bytecode_cache(hass)
+    cache = hass.data[template._BYTECODE_CACHE]
+    with patch("jinja2.sandbox.ImmutableSandboxedEnvironment.compile") as mock_compile:
+        assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    assert not mock_compile.called
+    assert cache.stats == {"hits": 1, "misses": 0, "templates": 1}
+
+    # Code compiled by other versions is not loaded
+    hass_storage[template.BYTECODE_STORAGE_KEY]["data"]["compiler"] = "other"
+    hass.data.pop(template._ENVIRONMENT)
+    await template.async_load_bytecode_cache(hass)
+    cache = hass.data[template._BYTECODE_CACHE]
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    assert cache.stats == {"hits": 0, "misses": 1, "templates": 1}
+
+
+async def test_hot_templates_kept_alive(hass):
+    """Test recently compiled templates are kept when no template uses them."""
+    template.Template("{{ 3 + 3 }}", hass).ensure_valid()
+    env = hass.data[template._ENVIRONMENT]
+    assert "{{ 3 + 3 }}" in env.hot_template_cache
+
+    with patch.object(template, "MAX_HOT_TEMPLATES", 2):
+        for value in range(3):
+            template.Template(f"{{{{ {value} }}}}", hass).ensure_valid()
+    assert list(env.hot_template_cache) == ["{{ 1 }}", "{{ 2 }}"]
+
+
+async def test_fast_expressions(hass):
+    """Test common expressions render like Jinja without using Jinja."""
+    hass.states.async_set("sensor.temperature", "21.5", {"unit": "°C", "dict": {1: 2}})
+    hass.states.async_set("sensor.text", "abc")
+    hass.states.async_set("binary_sensor.door", "on", {"device_class": "door"})
+
+    templates = [
+        "{{ states('sensor.temperature') }}",
+        '  {{states("sensor.text")}}\n',
+        "{{ states('sensor.missing') }}",
+        "{{ states('sensor.temperature') | float }}",
+        "{{ states('sensor.text')|float }}",
+        "{{ states('sensor.temperature') | float > 20 }}",
+        "{{ states('sensor.temperature') | float <= 21.5 }}",
+        "{{ states('sensor.missing') | float == -1 }}",
+        "{{ is_state('binary_sensor.door', 'on') }}",
+        "{{ is_state('binary_sensor.missing', 'on') }}",
+        "{{ state_attr('sensor.temperature', 'unit') }}",
+        "{{ state_attr('sensor.temperature', 'dict') }}",
+        "{{ state_attr('sensor.temperature', 'missing') }}",
+        "{{ is_state_attr('binary_sensor.door', 'device_class', 'door') }}",
+        "{{ is_state_attr('binary_sensor.door', 'device_class', 'window') }}",
+    ]
+    for template_string in templates:
+        tpl = template.Template(template_string, hass)
+        info = tpl.async_render_to_info()
+        assert tpl._fast_render is not None, template_string
+
+        with patch.object(template, "_analyze_expression", return_value=None):
+            jinja_info = template.Template(template_string, hass).async_render_to_info()
+
+        assert info.result() == jinja_info.result(), template_string
+        assert info.entities == jinja_info.entities
+        assert info._state_reads == jinja_info._state_reads
+
+    # Other expressions and variables hiding the globals are rendered by Jinja
+    for template_string in (
+        "{{ states('sensor.temperature') ~ 'x' }}",
+        "{{ states('sensor.temperature') | float(1) > 20 }}",
+        "{{ states('sensor.temperature') }} {{ states('sensor.text') }}",
+        "{{- states('sensor.temperature') }}",
+    ):
+        tpl = template.Template(template_string, hass)
+        tpl.async_render()
+        assert tpl._fast_render is None, template_string
+
+    tpl = template.Template("{{ states('sensor.temperature') }}", hass)
+    assert tpl.async_render({"states": lambda entity_id: "hidden"}) == "hidden"
+    assert tpl.async_render() == 21.5
+    tpl = template.Template("{{ states('sensor.temperature') }}", hass)
+    with pytest.raises(TemplateError):
+        tpl.async_render(limited=True)
+
+
+def test_parse_result_without_literal_eval(hass):
+    """Test results are parsed like literal_eval without calling it."""
+    template._parse_simple_result.cache_clear()
+    tpl = template.Template("{{ 1 }}", hass)
+    with patch.object(template, "literal_eval") as mock_literal_eval:
+        assert tpl._parse_result("21.5") == 21.5
+        assert tpl._parse_result("-3") == -3
+        assert tpl._parse_result("+.5") == 0.5
+        assert tpl._parse_result("True") is True
+        assert tpl._parse_result("None") is None
+        assert tpl._parse_result("on") == "on"
+        assert tpl._parse_result("") == ""
+    assert not mock_literal_eval.called
+
+    assert tpl._parse_result("007") == "007"
+
+    assert tpl._parse_result("1e5") == "1e5"
+    assert tpl._parse_result("1j") == "1j"
+    assert tpl._parse_result("'quoted'") == "'quoted'"
+    assert tpl._parse_result("21.5 °C") == "21.5 °C"
+    assert tpl._parse_result("٣") == "٣"
+
+    # Containers are parsed for every render as they can be changed
+    first = tpl._parse_result("[1, 2]")
+    first.append(3)
+    assert tpl._parse_result("[1, 2]") == [1, 2]
+    assert tpl._parse_result("1, 2") == (1, 2)
+
+
+async def test_fast_expression_native_result(hass):
+    """Test boolean results of common expressions are not rendered as strings."""
+    hass.states.async_set("binary_sensor.door", "on")
+    tpl = template.Template("{{ is_state('binary_sensor.door', 'on') }}", hass)
+    with patch.object(template.Template, "_parse_result") as mock_parse_result:
+        assert tpl.async_render() is True
+    assert not mock_parse_result.called
+    assert tpl.async_render(parse_result=False) == "True"
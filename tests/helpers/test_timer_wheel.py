@@ -0,0 +1,148 @@
+"""Test the timer wheel."""
+from unittest.mock import patch
+
+from homeassistant.helpers.timer_wheel import TimerWheel
+
+
+class MockClock:
+    """Clock that is moved by the test."""
+
+    def __init__(self, now):
+        """Initialize the clock."""
+        self.now = now
+
+    def __call__(self):
+        """Return the current time."""
+        return self.now
+
+
+def _run_wakeups(wheel):
+    """Run the pending wakeup of a wheel."""
+    if wheel._wakeup is not None:
+        wheel._wakeup.cancel()
+        wheel._async_wakeup()
+
+
+async def test_timers_run_in_order(hass):
+    """Test due timers run in one batch ordered by time."""
+    clock = MockClock(1000.0)
+    wheel = TimerWheel(hass.loop, clock)
+    calls = []
+
+    for delay in (5, 0.5, 5000, 2 * 10 ** 6, 5, 70):
+        wheel.async_schedule(1000 + delay, lambda delay=delay: calls.append(delay))
+    assert wheel.pending == 6
+    assert [len(level.slots) for level in wheel._levels] == [2, 1, 1, 1]
+
+    clock.now = 1005.0
+    _run_wakeups(wheel)
+    assert calls == [0.5, 5, 5]
+    assert wheel.pending == 3
+
+    clock.now = 1000 + 10 ** 5
+    _run_wakeups(wheel)
+    assert calls == [0.5, 5, 5, 70, 5000]
+
+    clock.now = 1000 + 2 * 10 ** 6
+    _run_wakeups(wheel)
+    assert calls == [0.5, 5, 5, 70, 5000, 2 * 10 ** 6]
+    assert wheel.pending == 0
+    assert wheel._wakeup is None
+
+
+async def test_cancel_timers(hass):
+    """Test cancelling timers, also from a callback of the same batch."""
+    clock = MockClock(1000.0)
+    wheel = TimerWheel(hass.loop, clock)
+    calls = []
+
+    later = wheel.async_schedule(1002, lambda: calls.append("later"))
+    wheel.async_schedule(1001, later.cancel)
+    removed = wheel.async_schedule(1001.5, lambda: calls.append("removed"))
+    removed.cancel()
+    removed.cancel()
+    assert removed.cancelled
+    assert wheel.pending == 2
+
+    clock.now = 1002
+    _run_wakeups(wheel)
+    assert calls == []
+    assert wheel.pending == 0
+
+    # The loop timer is cancelled when no timers are left
+    timer = wheel.async_schedule(1010, lambda: None)
+    handle = wheel._wakeup
+    timer.cancel()
+    assert handle.cancelled()
+    assert wheel._wakeup is None
+
+
+async def test_wakeup_for_earlier_timer(hass):
+    """Test the wheel wakes up for the earliest timer only."""
+    clock = MockClock(1000.0)
+    wheel = TimerWheel(hass.loop, clock)
+
+    wheel.async_schedule(1010, lambda: None)
+    handle = wheel._wakeup
+    wheel.async_schedule(1020, lambda: None)
+    assert wheel._wakeup is handle
+
+    # An earlier timer replaces the loop timer
+    for delay in range(9, 0, -1):
+        wheel.async_schedule(1000 + delay, lambda: None)
+    assert handle.cancelled()
+    assert wheel._wakeup_when == 1001
+    assert [
+        scheduled
+        for scheduled in hass.loop._scheduled
+        if scheduled._callback == wheel._async_wakeup and not scheduled.cancelled()
+    ] == [wheel._wakeup]
+
+
+async def test_timer_exception(hass):
+    """Test an exception in a timer callback does not stop the batch."""
+    clock = MockClock(1000.0)
+    wheel = TimerWheel(hass.loop, clock)
+    calls = []
+
+    def fail():
+        raise ValueError
+
+    wheel.async_schedule(1001, fail)
+    wheel.async_schedule(1002, lambda: calls.append("after"))
+
+    clock.now = 1002
+    with patch.object(hass.loop, "call_exception_handler") as mock_handler:
+        _run_wakeups(wheel)
+    assert calls == ["after"]
+    assert isinstance(mock_handler.call_args[0][0]["exception"], ValueError)
+
+
+async def test_wakeup_within_slot(hass):
+    """Test the timers of a slot that are not due yet wait in the slot."""
+    clock = MockClock(1000.0)
+    wheel = TimerWheel(hass.loop, clock)
+    calls = []
+
+    timers = {
+        when: wheel.async_schedule(when, lambda when=when: calls.append(when))
+        for when in (1000.2, 1000.7, 1001.1, 1001.3)
+    }
+
+    clock.now = 1000.5
+    _run_wakeups(wheel)
+    assert calls == [1000.2]
+    assert wheel._wakeup_when == 1000.7
+
+    clock.now = 1000.7
+    _run_wakeups(wheel)
+    assert calls == [1000.2, 1000.7]
+    assert wheel._wakeup_when == 1001.1
+
+    # The earliest timer of the next slot is cancelled
+    timers[1001.1].cancel()
+    assert wheel._next_when() == 1001.3
+    clock.now = 1001.3
+    _run_wakeups(wheel)
+    assert calls == [1000.2, 1000.7, 1001.3]
+    assert wheel.pending == 0
@@ -310,3 +310,169 @@ async def test_stop_refresh_on_ha_stop(hass, crd):
     async_fire_time_changed(hass, utcnow() + update_interval)
     await hass.async_block_till_done()
     assert crd.data == 1
+
+
+def get_shared_crds(hass, count, fetch):
+    """Make coordinators that share their fetches."""
+    return [
+        update_coordinator.DataUpdateCoordinator[int](
+            hass,
+            _LOGGER,
+            name=f"test {index}",
+            update_method=fetch,
+            update_interval=DEFAULT_UPDATE_INTERVAL,
+            fetch_key="endpoint",
+        )
+        for index in range(count)
+    ]
+
+
+async def test_shared_fetch_in_flight(hass):
+    """Test coordinators with the same fetch key share a fetch in flight."""
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return calls
+
+    crd1, crd2 = get_shared_crds(hass, 2, fetch)
+    refreshes = asyncio.gather(crd1.async_refresh(), crd2.async_refresh())
+    await asyncio.sleep(0)
+    release.set()
+    await refreshes
+
+    assert calls == 1
+    assert crd1.data == crd2.data == 1
+    assert crd1.fetch_stats["fetched"] == 1
+    assert crd2.fetch_stats["shared"] == 1
+    assert crd2.fetch_stats["last_latency"] is not None
+
+    # Errors are shared but not cached
+    async def fail():
+        raise update_coordinator.UpdateFailed("Boom")
+
+    crd1.update_method = fail
+    await asyncio.gather(crd1.async_refresh(), crd2.async_refresh())
+    assert not crd1.last_update_success
+    assert not crd2.last_update_success
+
+    # Requested refreshes fetch even if the result is younger than the TTL
+    crd1.update_method = fetch
+    await crd1.async_refresh()
+    await crd2.async_refresh()
+    assert calls == 3
+    assert crd1.data == 2
+    assert crd2.data == 3
+
+
+async def test_shared_fetch_schedule(hass):
+    """Test scheduled refreshes are aligned and use the cached result."""
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    start = utcnow().replace(microsecond=0)
+    with patch("homeassistant.helpers.update_coordinator.utcnow", return_value=start):
+        crd1, crd2 = get_shared_crds(hass, 2, fetch)
+        crd1.async_add_listener(Mock())
+
+    # Added later, refreshes at the same time
+    with patch(
+        "homeassistant.helpers.update_coordinator.utcnow",
+        return_value=start + timedelta(seconds=3),
+    ), patch("homeassistant.helpers.event.async_track_point_in_utc_time") as mock_track:
+        crd2.async_add_listener(Mock())
+    assert mock_track.call_args[0][2] == start + DEFAULT_UPDATE_INTERVAL
+    crd2._schedule_refresh()
+
+    async_fire_time_changed(hass, start + DEFAULT_UPDATE_INTERVAL)
+    await hass.async_block_till_done()
+    assert calls == 1
+    assert crd1.data == crd2.data == 1
+    assert crd1.fetch_counts["fetched"] + crd2.fetch_counts["fetched"] == 1
+
+    # A result younger than the TTL is used by scheduled refreshes
+    await crd1.async_refresh()
+    assert calls == 2
+    await crd2._handle_refresh_interval(utcnow())
+    assert crd2.data == 2
+    assert crd2.fetch_counts["cached"] == 1
+
+
+async def test_shared_fetch_released(hass):
+    """Test the shared fetch is dropped when no coordinator uses it."""
+
+    async def fetch():
+        return 1
+
+    crd1 = get_shared_crds(hass, 1, fetch)[0]
+    crd2 = update_coordinator.DataUpdateCoordinator[int](
+        hass,
+        _LOGGER,
+        name="test short ttl",
+        update_method=fetch,
+        update_interval=DEFAULT_UPDATE_INTERVAL,
+        fetch_key="endpoint",
+        fetch_ttl=timedelta(seconds=1),
+    )
+    shared_fetches = hass.data.setdefault(update_coordinator.DATA_SHARED_FETCHES, {})
+
+    # A refresh without listeners only uses it while fetching
+    await crd1.async_refresh()
+    assert shared_fetches == {}
+
+    remove_listener1 = crd1.async_add_listener(Mock())
+    remove_listener2 = crd2.async_add_listener(Mock())
+    shared_fetch = shared_fetches["endpoint"]
+    assert shared_fetch.ttl == 1
+
+    # The TTL of the remaining coordinators applies, capped by their interval
+    remove_listener2()
+    assert shared_fetch.ttl == (DEFAULT_UPDATE_INTERVAL / 2).total_seconds()
+
+    await crd1.async_refresh()
+    remove_listener1()
+    assert shared_fetches == {}
+
+    crd2.async_add_listener(Mock())
+    assert shared_fetches["endpoint"] is not shared_fetch
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+    assert shared_fetches == {}
+
+
+async def test_shared_fetch_interval_shorter_than_ttl(hass):
+    """Test each scheduled refresh fetches when the interval is below the TTL."""
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    update_interval = timedelta(seconds=5)
+    assert update_interval < update_coordinator.FETCH_DEFAULT_TTL
+    crd = update_coordinator.DataUpdateCoordinator[int](
+        hass,
+        _LOGGER,
+        name="test short interval",
+        update_method=fetch,
+        update_interval=update_interval,
+        fetch_key="endpoint",
+    )
+    crd.async_add_listener(Mock())
+
+    with patch("homeassistant.helpers.update_coordinator.monotonic") as mock_monotonic:
+        for tick in range(1, 5):
+            mock_monotonic.return_value = tick * update_interval.total_seconds()
+            await crd._handle_refresh_interval(utcnow())
+
+    assert calls == 4
+    assert crd.fetch_counts["fetched"] == 4
+    assert crd.fetch_counts["cached"] == 0
@@ -3,6 +3,7 @@
 import asyncio
 from datetime import datetime, timedelta
 import functools
+import json
 import logging
 import os
 from tempfile import TemporaryDirectory
@@ -34,10 +35,12 @@ from homeassistant.const import (
 )
 import homeassistant.core as ha
 from homeassistant.exceptions import (
+    HomeAssistantError,
     InvalidEntityFormatError,
     InvalidStateError,
     ServiceNotFound,
 )
+from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
@@ -360,6 +363,17 @@ def test_state_as_dict():
     assert state.as_dict() is state.as_dict()
 
 
+def test_state_as_json():
+    """Test a State as JSON."""
+    state = ha.State("happy.happy", "on", {"pig": "dog", "list": [1, 2]})
+    assert state.as_json() == json.dumps(state.as_dict(), cls=JSONEncoder)
+    assert state.as_json() is state.as_json()
+
+    state = ha.State("happy.happy", "on", {"bad": object()})
+    with pytest.raises(TypeError):
+        state.as_json()
+
+
 async def test_eventbus_add_remove_listener(hass):
     """Test remove_listener method."""
     old_count = len(hass.bus.async_listeners())
@@ -408,6 +422,79 @@ async def test_eventbus_filtered_listener(hass):
     unsub()
 
 
+async def test_eventbus_keyed_listener(hass):
+    """Test listeners routed by entity_id."""
+    calls = []
+    old_count = hass.bus.async_listeners().get("test", 0)
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    unsub = hass.bus.async_listen_keyed(
+        "test", ["light.kitchen", "light.bed"], listener
+    )
+    assert hass.bus.async_listeners()["test"] == old_count + 1
+
+    hass.bus.async_fire("test", {"entity_id": "light.other"})
+    hass.bus.async_fire("test", {"entity_id": ["light.kitchen"]})
+    hass.bus.async_fire("test")
+    await hass.async_block_till_done()
+    assert len(calls) == 0
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    hass.bus.async_fire("test", {"entity_id": "light.bed"})
+    await hass.async_block_till_done()
+    assert [event.data["entity_id"] for event in calls] == [
+        "light.kitchen",
+        "light.bed",
+    ]
+
+    unsub()
+    assert hass.bus.async_listeners().get("test", 0) == old_count
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+    with pytest.raises(HomeAssistantError):
+        hass.bus.async_listen_keyed(MATCH_ALL, "light.kitchen", listener)
+
+
+async def test_eventbus_merged_listeners_follow_subscriptions(hass):
+    """Test cached listener tuples are rebuilt when subscriptions change."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    hass.bus.async_fire("test")
+    await hass.async_block_till_done()
+
+    unsub_all = hass.bus.async_listen(MATCH_ALL, listener)
+    hass.bus.async_fire("test")
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+    unsub = hass.bus.async_listen("test", listener)
+    hass.bus.async_fire("test")
+    await hass.async_block_till_done()
+    assert len(calls) == 3
+
+    unsub_all()
+    hass.bus.async_fire("test")
+    await hass.async_block_till_done()
+    assert len(calls) == 4
+
+    unsub()
+    hass.bus.async_fire("test")
+    await hass.async_block_till_done()
+    assert len(calls) == 4
+
+
 async def test_eventbus_unsubscribe_listener(hass):
     """Test unsubscribe listener from returned function."""
     calls = []
@@ -690,6 +777,126 @@ async def test_statemachine_force_update(hass):
     assert len(events) == 1
 
 
+async def test_statemachine_set_many(hass):
+    """Test setting multiple states in one batch."""
+    hass.states.async_set("light.bowl", "on", {"brightness": 100})
+    await hass.async_block_till_done()
+
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    batches = []
+
+    @ha.callback
+    def batch_listener(batch):
+        """Mock batch listener."""
+        batches.append(batch)
+
+    hass.bus.async_listen_batch(EVENT_STATE_CHANGED, batch_listener)
+
+    hass.states.async_set_many(
+        [
+            ("light.bowl", "on", {"brightness": 100}),
+            ("light.Kitchen", "off", None),
+            ("switch.ac", "on", {"friendly_name": "AC"}),
+        ]
+    )
+    await hass.async_block_till_done()
+
+    # Unchanged light.bowl does not produce an event
+    assert [event.data["entity_id"] for event in events] == [
+        "light.kitchen",
+        "switch.ac",
+    ]
+    assert len(batches) == 1
+    assert batches[0] == events
+
+    kitchen = hass.states.get("light.kitchen")
+    ac_state = hass.states.get("switch.ac")
+    assert kitchen.state == "off"
+    assert ac_state.attributes == {"friendly_name": "AC"}
+    assert kitchen.last_updated == ac_state.last_updated
+    assert kitchen.context is ac_state.context
+    assert events[0].time_fired == kitchen.last_updated
+
+    # Single state changes are delivered as a batch of one
+    hass.states.async_set("light.kitchen", "on")
+    await hass.async_block_till_done()
+    assert len(batches) == 2
+    assert len(batches[1]) == 1
+    assert batches[1][0].data["new_state"].state == "on"
+
+    # Nothing changed, nothing fired
+    hass.states.async_set_many([("light.kitchen", "on", None)])
+    await hass.async_block_till_done()
+    assert len(batches) == 2
+
+
+async def test_eventbus_batch_listener(hass):
+    """Test batch listeners on the event bus."""
+    batches = []
+
+    @ha.callback
+    def batch_listener(batch):
+        """Mock batch listener."""
+        batches.append(batch)
+
+    old_count = hass.bus.async_listeners().get(MATCH_ALL, 0)
+    unsub = hass.bus.async_listen_batch(MATCH_ALL, batch_listener)
+    assert hass.bus.async_listeners()[MATCH_ALL] == old_count + 1
+
+    hass.bus.async_fire_batch("test", [{"idx": 1}, {"idx": 2}])
+    hass.bus.async_fire_batch("test", [])
+    await hass.async_block_till_done()
+    assert len(batches) == 1
+    assert [event.data["idx"] for event in batches[0]] == [1, 2]
+
+    unsub()
+    assert hass.bus.async_listeners().get(MATCH_ALL, 0) == old_count
+
+    hass.bus.async_fire("test")
+    await hass.async_block_till_done()
+    assert len(batches) == 1
+
+
+async def test_statemachine_shares_attributes(hass):
+    """Test identical attribute mappings are shared between states."""
+    hass.states.async_set("sensor.one", "1", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.two", "2", {"unit_of_measurement": "W"})
+    one = hass.states.get("sensor.one")
+    two = hass.states.get("sensor.two")
+    assert one.attributes is two.attributes
+
+    stats = hass.states.async_attribute_stats()
+    assert stats["interned"] == 1
+    assert stats["interned_bytes_saved"] > 0
+
+    # State change only keeps the mapping of the previous state
+    hass.states.async_set("sensor.one", "3", {"unit_of_measurement": "W"})
+    assert hass.states.get("sensor.one").attributes is one.attributes
+    assert hass.states.async_attribute_stats()["reused"] == 1
+
+    # Values that compare equal but have a different type are not shared
+    hass.states.async_set("sensor.three", "1", {"on": True})
+    hass.states.async_set("sensor.four", "1", {"on": 1})
+    assert hass.states.get("sensor.three").attributes["on"] is True
+    assert hass.states.get("sensor.four").attributes["on"] == 1
+    assert hass.states.get("sensor.four").attributes["on"] is not True
+
+    # Mutable values are never shared
+    hass.states.async_set("sensor.five", "1", {"options": ["a"]})
+    hass.states.async_set("sensor.six", "1", {"options": ["a"]})
+    assert (
+        hass.states.get("sensor.five").attributes
+        is not hass.states.get("sensor.six").attributes
+    )
+
+    # Mutating the passed in dict does not affect the shared mapping
+    attributes = {"unit_of_measurement": "kWh"}
+    hass.states.async_set("sensor.seven", "1", attributes)
+    hass.states.async_set("sensor.eight", "1", {"unit_of_measurement": "kWh"})
+    attributes["unit_of_measurement"] = "Wh"
+    assert hass.states.get("sensor.eight").attributes == {"unit_of_measurement": "kWh"}
+
+
 def test_service_call_repr():
     """Test ServiceCall repr."""
     call = ha.ServiceCall("homeassistant", "start")
@@ -1010,28 +1217,24 @@ async def test_bad_timezone_raises_value_error(hass):
 def test_create_timer(mock_monotonic, loop):
     """Test create timer."""
     hass = MagicMock()
-    funcs = []
-    orig_callback = ha.callback
-
-    def mock_callback(func):
-        funcs.append(func)
-        return orig_callback(func)
+    hass.bus.async_has_listeners.return_value = True
+    hass.async_run_hass_job = lambda job, *args: job.target(*args)
+    ticker = hass.ticker = ha.Ticker(hass)
+    ticks = []
+    ticker.async_listen(ticks.append)
 
     mock_monotonic.side_effect = 10.2, 10.8, 11.3
 
-    with patch.object(ha, "callback", mock_callback), patch(
+    with patch(
         "homeassistant.core.dt_util.utcnow",
         return_value=datetime(2018, 12, 31, 3, 4, 5, 333333),
     ):
         ha._async_create_timer(hass)
 
-    assert len(funcs) == 2
-    fire_time_event, stop_timer = funcs
-
+    assert ticker.active
     assert len(hass.loop.call_later.mock_calls) == 1
     delay, callback, target = hass.loop.call_later.mock_calls[0][1]
     assert abs(delay - 0.666667) < 0.001
-    assert callback is fire_time_event
     assert abs(target - 10.866667) < 0.001
 
     with patch(
@@ -1043,35 +1246,34 @@ def test_create_timer(mock_monotonic, loop):
     assert len(hass.bus.async_listen_once.mock_calls) == 1
     assert len(hass.bus.async_fire.mock_calls) == 1
     assert len(hass.loop.call_later.mock_calls) == 2
+    assert ticks == [datetime(2018, 12, 31, 3, 4, 6, 100000)]
 
-    event_type, callback = hass.bus.async_listen_once.mock_calls[0][1]
+    event_type, stop_timer = hass.bus.async_listen_once.mock_calls[0][1]
     assert event_type == EVENT_HOMEASSISTANT_STOP
-    assert callback is stop_timer
 
     delay, callback, target = hass.loop.call_later.mock_calls[1][1]
     assert abs(delay - 0.9) < 0.001
-    assert callback is fire_time_event
     assert abs(target - 12.2) < 0.001
 
     event_type, event_data = hass.bus.async_fire.mock_calls[0][1]
     assert event_type == EVENT_TIME_CHANGED
     assert event_data[ATTR_NOW] == datetime(2018, 12, 31, 3, 4, 6, 100000)
 
+    stop_timer(None)
+    assert not ticker.active
+    assert hass.loop.call_later.return_value.cancel.called
+
 
 @patch("homeassistant.core.monotonic")
 def test_timer_out_of_sync(mock_monotonic, loop):
     """Test create timer."""
     hass = MagicMock()
-    funcs = []
-    orig_callback = ha.callback
-
-    def mock_callback(func):
-        funcs.append(func)
-        return orig_callback(func)
+    hass.bus.async_has_listeners.return_value = True
+    ticker = hass.ticker = ha.Ticker(hass)
 
     mock_monotonic.side_effect = 10.2, 13.3, 13.4
 
-    with patch.object(ha, "callback", mock_callback), patch(
+    with patch(
         "homeassistant.core.dt_util.utcnow",
         return_value=datetime(2018, 12, 31, 3, 4, 5, 333333),
     ):
@@ -1100,17 +1302,58 @@ def test_timer_out_of_sync(mock_monotonic, loop):
 
         assert event_context_0 == event_context_1
 
-        assert len(funcs) == 2
-        fire_time_event, _ = funcs
-
+    assert ticker.active
     assert len(hass.loop.call_later.mock_calls) == 2
 
     delay, callback, target = hass.loop.call_later.mock_calls[1][1]
     assert abs(delay - 0.8) < 0.001
-    assert callback is fire_time_event
     assert abs(target - 14.2) < 0.001
 
 
+async def test_ticker_idle_without_listeners(hass):
+    """Test the ticker only runs while there are listeners."""
+    ticker = hass.ticker
+    ticker.async_start()
+    assert not ticker.active
+
+    ticks = []
+    unsub = ticker.async_listen(ha.callback(lambda now: ticks.append(now)))
+    assert ticker.active
+    now = dt_util.utcnow()
+    ticker.async_tick(now)
+    assert ticks == [now]
+    unsub()
+    assert not ticker.active
+
+    # Listeners for the event keep the timer running, MATCH_ALL does not
+    unsub = hass.bus.async_listen(MATCH_ALL, lambda event: None)
+    assert not ticker.active
+    unsub()
+    unsub = hass.bus.async_listen(EVENT_TIME_CHANGED, lambda event: None)
+    assert ticker.active
+    ticker.async_stop()
+    assert not ticker.active
+    ticker.async_start()
+    assert ticker.active
+    unsub()
+    assert not ticker.active
+    ticker.async_stop()
+
+
+async def test_ticker_listener_exception(hass, caplog):
+    """Test an exception in a tick listener does not stop the tick."""
+    ticks = []
+
+    def fail(now):
+        raise ValueError
+
+    hass.ticker.async_listen(ha.callback(fail))
+    hass.ticker.async_listen(ha.callback(lambda now: ticks.append(now)))
+    hass.ticker.async_tick(dt_util.utcnow())
+    assert len(ticks) == 1
+    assert "Error in tick listener" in caplog.text
+
+
 async def test_hass_start_starts_the_timer(loop):
     """Test when hass starts, it starts the timer."""
     hass = ha.HomeAssistant()